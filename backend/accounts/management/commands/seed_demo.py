@@ -3,8 +3,12 @@ from datetime import date, time, timedelta
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from django.utils import timezone
 
+from core.bulk_seed import bulk_get_or_create, bulk_set_m2m, compliance_score_signals, muted_signals
+
 User = get_user_model()
 
 
@@ -390,9 +394,9 @@ class Command(BaseCommand):
         parser.add_argument('--tenant', type=str, help='Seed only a specific tenant slug')
         parser.add_argument('--delete-demo', action='store_true', help='Delete all demo data for the specified tenant(s)')
         parser.add_argument('--force', action='store_true', help='Force seeding even for live tenants (DANGEROUS)')
+        parser.add_argument('--seed', type=int, default=0, help='Extra value mixed into the per-tenant RNG seed (default: 0)')
 
     def handle(self, *args, **options):
-        from tenants.models import TenantSettings
         target = options.get('tenant')
         if target and target in TENANTS:
             # Block live tenants unless --force is explicitly passed
@@ -410,56 +414,77 @@ class Command(BaseCommand):
             self._delete_demo(slugs)
             return
 
-        for slug in slugs:
-            cfg = TENANTS[slug]
-            self.stdout.write(f'\n=== Seeding {cfg["business_name"]} ({slug}) ===')
+        self.rng_seed = options.get('seed') or 0
+        # Hash once — PBKDF2 per demo user used to dominate a fresh seed
+        self.password_hash = make_password('admin123')
+
+        # Per-row compliance score recalculation is muted for the whole run;
+        # each tenant's score is recomputed once after its data is in place.
+        with muted_signals(*compliance_score_signals()):
+            for slug in slugs:
+                cfg = TENANTS[slug]
+                self.stdout.write(f'\n=== Seeding {cfg["business_name"]} ({slug}) ===')
+                with transaction.atomic():
+                    self._seed_one(slug, cfg)
+                if 'compliance' in cfg['enabled_modules']:
+                    from compliance.models import PeaceOfMindScore
+                    PeaceOfMindScore.recalculate(tenant=self.tenant)
 
-            # --- Create/update tenant ---
-            self.tenant = self._seed_tenant(slug, cfg)
-
-            # --- Per-tenant users (unique usernames per tenant) ---
-            owner = self._user(f'{slug}-owner', f'owner@{slug}.demo', 'Jordan', 'Riley', 'owner')
-            manager = self._user(f'{slug}-manager', f'manager@{slug}.demo', 'Alex', 'Morgan', 'manager')
-            staff1 = self._user(f'{slug}-staff1', f'staff1@{slug}.demo', 'Sam', 'Kim', 'staff')
-            staff2 = self._user(f'{slug}-staff2', f'staff2@{slug}.demo', 'Taylor', 'Chen', 'staff')
-            customer = self._user(f'{slug}-customer', f'customer@{slug}.demo', 'Jamie', 'Smith', 'customer')
+        self.stdout.write(self.style.SUCCESS('\nAll demo data seeded successfully!'))
 
-            # Create tenant-specific staff users if configured (e.g. Mind Department, NBNE)
+    def _seed_one(self, slug, cfg):
+        # --- Create/update tenant ---
+        self.tenant = self._seed_tenant(slug, cfg)
+
+        # --- Per-tenant users (unique usernames per tenant) ---
+        # Tenant-specific staff_users (e.g. Mind Department, NBNE) override the generic
+        # demo identities when the usernames collide.
+        specs = {
+            f'{slug}-owner': (f'owner@{slug}.demo', 'Jordan', 'Riley', 'owner'),
+            f'{slug}-manager': (f'manager@{slug}.demo', 'Alex', 'Morgan', 'manager'),
+            f'{slug}-staff1': (f'staff1@{slug}.demo', 'Sam', 'Kim', 'staff'),
+            f'{slug}-staff2': (f'staff2@{slug}.demo', 'Taylor', 'Chen', 'staff'),
+            f'{slug}-customer': (f'customer@{slug}.demo', 'Jamie', 'Smith', 'customer'),
+        }
+        for uname, uemail, ufirst, ulast, urole in cfg.get('staff_users', []):
+            specs[uname] = (uemail, ufirst, ulast, urole)
+        users = self._users(specs)
+        owner = users[f'{slug}-owner']
+        manager = users[f'{slug}-manager']
+        staff1 = users[f'{slug}-staff1']
+        staff2 = users[f'{slug}-staff2']
+        customer = users[f'{slug}-customer']
+        for uname, _, _, _, urole in cfg.get('staff_users', []):
+            self.stdout.write(f'  Tenant user: {uname} ({urole})')
+            if urole == 'owner':
+                owner = users[uname]
+
+        # Seed disclaimer if configured
+        if cfg.get('disclaimer'):
+            self._seed_disclaimer(cfg['disclaimer'])
+
+        modules = cfg['enabled_modules']
+        if 'bookings' in modules:
+            self._seed_bookings(cfg, customer)
+        if cfg.get('tables') or cfg.get('service_windows'):
+            self._seed_restaurant(cfg)
+        if cfg.get('class_types') or cfg.get('class_sessions'):
+            self._seed_gym(cfg)
+        if 'staff' in modules:
             if cfg.get('staff_users'):
-                for uname, uemail, ufirst, ulast, urole in cfg['staff_users']:
-                    u = self._user(uname, uemail, ufirst, ulast, urole)
-                    self.stdout.write(f'  Tenant user: {uname} ({urole})')
-                    if urole == 'owner':
-                        owner = u
-
-            # Seed disclaimer if configured
-            if cfg.get('disclaimer'):
-                self._seed_disclaimer(cfg['disclaimer'])
-
-            modules = cfg['enabled_modules']
-            if 'bookings' in modules:
-                self._seed_bookings(cfg, customer)
-            if cfg.get('tables') or cfg.get('service_windows'):
-                self._seed_restaurant(cfg)
-            if cfg.get('class_types') or cfg.get('class_sessions'):
-                self._seed_gym(cfg)
-            if 'staff' in modules:
-                if cfg.get('staff_users'):
-                    self._seed_staff_custom(cfg)
-                else:
-                    self._seed_staff(cfg, owner, manager, staff1, staff2)
-            if 'comms' in modules and cfg.get('comms_channels'):
-                self._seed_comms(slug, cfg, owner, manager, staff1, staff2)
-            if 'compliance' in modules:
-                self._seed_compliance(owner, staff1)
-            if 'documents' in modules:
-                self._seed_documents(owner, manager)
-            if 'crm' in modules and not cfg.get('skip_demo_crm'):
-                self._seed_crm(owner, manager)
-            if 'shop' in modules and cfg.get('shop_products'):
-                self._seed_shop(cfg)
-
-        self.stdout.write(self.style.SUCCESS('\nAll demo data seeded successfully!'))
+                self._seed_staff_custom(cfg, users)
+            else:
+                self._seed_staff(cfg, owner, manager, staff1, staff2)
+        if 'comms' in modules and cfg.get('comms_channels'):
+            self._seed_comms(slug, cfg, owner, manager, staff1, staff2)
+        if 'compliance' in modules:
+            self._seed_compliance(owner, staff1)
+        if 'documents' in modules:
+            self._seed_documents(owner, manager)
+        if 'crm' in modules and not cfg.get('skip_demo_crm'):
+            self._seed_crm(owner, manager)
+        if 'shop' in modules and cfg.get('shop_products'):
+            self._seed_shop(cfg)
 
     def _delete_demo(self, slugs):
         """Delete all demo data for the specified tenant slugs."""
@@ -555,45 +580,30 @@ class Command(BaseCommand):
 
             self.stdout.write(self.style.SUCCESS(f'  Done — {slug} demo data cleared'))
 
-    def _user(self, username, email, first, last, role):
-        user, created = User.objects.get_or_create(
-            username=username,
-            defaults={
+    def _users(self, specs):
+        """Create or refresh every demo user for the tenant in one SELECT + bulk insert/update."""
+        rows = []
+        for username, (email, first, last, role) in specs.items():
+            rows.append({'username': username, 'defaults': {
                 'email': email, 'first_name': first, 'last_name': last,
                 'role': role, 'is_staff': role in ('owner', 'manager'),
                 'is_superuser': role == 'owner',
-                'tenant': self.tenant,
-            }
+                'is_active': True,
+                'tenant_id': self.tenant.id,
+            }})
+
+        def prepare(user):
+            user.password = self.password_hash
+            # Mirrors User.save() — bulk_create bypasses it
+            if not user.avatar_initials and user.first_name:
+                user.avatar_initials = (user.first_name[0] + user.last_name[:1]).upper()
+
+        # Ensure demo users are always active and linked to correct tenant on re-seed
+        users, _ = bulk_get_or_create(
+            User, rows, keys=('username',), prepare=prepare,
+            update=('email', 'first_name', 'last_name', 'role', 'is_staff', 'is_superuser', 'is_active', 'tenant_id'),
         )
-        if created:
-            user.set_password('admin123')
-            user.save()
-        else:
-            # Ensure demo users are always active and linked to correct tenant on re-seed
-            changed = False
-            if not user.is_active:
-                user.is_active = True
-                changed = True
-            if user.role != role:
-                user.role = role
-                user.is_staff = role in ('owner', 'manager')
-                user.is_superuser = role == 'owner'
-                changed = True
-            if user.tenant != self.tenant:
-                user.tenant = self.tenant
-                changed = True
-            if user.first_name != first:
-                user.first_name = first
-                changed = True
-            if user.last_name != last:
-                user.last_name = last
-                changed = True
-            if user.email != email:
-                user.email = email
-                changed = True
-            if changed:
-                user.save()
-        return user
+        return {key[0]: user for key, user in users.items()}
 
     def _seed_tenant(self, slug, cfg):
         from tenants.models import TenantSettings
@@ -623,88 +633,62 @@ class Command(BaseCommand):
         import random
         import hashlib
         from bookings.models import Service, Staff as BookingStaff, Client, Booking
+        from datetime import time as dt_time
 
         # --- Services ---
-        for name, cat, dur, price, dep in cfg['services']:
-            Service.objects.get_or_create(
-                tenant=self.tenant, name=name,
-                defaults={
-                    'category': cat,
-                    'duration_minutes': dur,
-                    'price': Decimal(price),
-                    'deposit_pence': dep,
-                    'payment_type': 'deposit' if dep > 0 else ('free' if Decimal(price) == 0 else 'full'),
-                }
-            )
-        svc_count = Service.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Services: {svc_count}')
+        services, _ = bulk_get_or_create(Service, [
+            {'tenant': self.tenant, 'name': name, 'defaults': {
+                'category': cat,
+                'duration_minutes': dur,
+                'price': Decimal(price),
+                'deposit_pence': dep,
+                'payment_type': 'deposit' if dep > 0 else ('free' if Decimal(price) == 0 else 'full'),
+            }}
+            for name, cat, dur, price, dep in cfg['services']
+        ], keys=('tenant', 'name'))
+        # Same order as Service.Meta.ordering so the RNG draws match a row-by-row seed
+        all_services = sorted(
+            Service.objects.filter(tenant=self.tenant), key=lambda s: (s.sort_order, s.name),
+        )
+        self.stdout.write(f'  Services: {len(all_services)}')
 
         # --- Booking Staff ---
         staff_configs = cfg.get('booking_staff', [
             (f'staff1@{self.tenant.slug}.demo', 'Staff Member', 'staff', []),
         ])
-        all_services = list(Service.objects.filter(tenant=self.tenant))
-        svc_by_name = {s.name: s for s in all_services}
-        booking_staff = []
-        from datetime import time as dt_time
+        rows = []
+        wanted_services = {}
         for entry in staff_configs:
             s_email, s_name, s_role = entry[0], entry[1], entry[2]
             svc_names = entry[3] if len(entry) > 3 else []
-            break_start_str = entry[4] if len(entry) > 4 else None
-            break_end_str = entry[5] if len(entry) > 5 else None
             defaults = {'name': s_name, 'role': s_role}
-            if break_start_str:
-                h, m = map(int, break_start_str.split(':'))
-                defaults['break_start'] = dt_time(h, m)
-            if break_end_str:
-                h, m = map(int, break_end_str.split(':'))
-                defaults['break_end'] = dt_time(h, m)
-            bs, created = BookingStaff.objects.get_or_create(
-                tenant=self.tenant, email=s_email,
-                defaults=defaults
-            )
-            if not created:
-                changed = False
-                if bs.name != s_name:
-                    bs.name = s_name
-                    changed = True
-                if break_start_str:
-                    h, m = map(int, break_start_str.split(':'))
-                    if bs.break_start != dt_time(h, m):
-                        bs.break_start = dt_time(h, m)
-                        changed = True
-                if break_end_str:
-                    h, m = map(int, break_end_str.split(':'))
-                    if bs.break_end != dt_time(h, m):
-                        bs.break_end = dt_time(h, m)
-                        changed = True
-                if changed:
-                    bs.save()
-            if svc_names:
-                bs.services.set([svc_by_name[n] for n in svc_names if n in svc_by_name])
-            else:
-                bs.services.set(all_services)
-            booking_staff.append(bs)
+            if len(entry) > 4 and entry[4]:
+                defaults['break_start'] = dt_time(*map(int, entry[4].split(':')))
+            if len(entry) > 5 and entry[5]:
+                defaults['break_end'] = dt_time(*map(int, entry[5].split(':')))
+            rows.append({'tenant': self.tenant, 'email': s_email, 'defaults': defaults})
+            # Filtered from the ordered list so it matches staff.services.all()
+            wanted_services[s_email] = [s for s in all_services if s.name in svc_names] if svc_names else all_services
+        staff_objs, _ = bulk_get_or_create(
+            BookingStaff, rows, keys=('tenant', 'email'), update=('name', 'break_start', 'break_end'),
+        )
+        booking_staff = list(staff_objs.values())
+        bulk_set_m2m(BookingStaff.services, {
+            bs.id: [s.id for s in wanted_services[bs.email]] for bs in booking_staff
+        })
         BookingStaff.objects.filter(tenant=self.tenant, email=f'staff@{self.tenant.slug}.demo').exclude(
             id__in=[s.id for s in booking_staff]
         ).delete()
         self.stdout.write(f'  Booking staff: {len(booking_staff)}')
 
         # --- Demo Clients ---
-        demo_clients = []
-        # Always include the default customer user
-        default_client, _ = Client.objects.get_or_create(
-            tenant=self.tenant, email=customer.email,
-            defaults={'name': customer.get_full_name(), 'phone': '07700 900001'}
-        )
-        demo_clients.append(default_client)
-        # Create additional named demo clients from config
-        for c_name, c_email, c_phone in cfg.get('demo_clients', []):
-            cl, _ = Client.objects.get_or_create(
-                tenant=self.tenant, email=c_email,
-                defaults={'name': c_name, 'phone': c_phone}
-            )
-            demo_clients.append(cl)
+        # Always include the default customer user, then the named demo clients from config
+        client_rows = [{'tenant': self.tenant, 'email': customer.email,
+                        'defaults': {'name': customer.get_full_name(), 'phone': '07700 900001'}}]
+        client_rows += [{'tenant': self.tenant, 'email': c_email, 'defaults': {'name': c_name, 'phone': c_phone}}
+                        for c_name, c_email, c_phone in cfg.get('demo_clients', [])]
+        clients, _ = bulk_get_or_create(Client, client_rows, keys=('tenant', 'email'))
+        demo_clients = list(clients.values())
         self.stdout.write(f'  Clients: {len(demo_clients)}')
 
         # --- Historic + Future Bookings (14 days back, 14 days forward) ---
@@ -730,14 +714,11 @@ class Command(BaseCommand):
             return
 
         # Deterministic seed per tenant for reproducible data
-        rng = random.Random(hashlib.md5(self.tenant.slug.encode()).hexdigest())
+        seed_key = self.tenant.slug if not self.rng_seed else f'{self.tenant.slug}:{self.rng_seed}'
+        rng = random.Random(hashlib.md5(seed_key.encode()).hexdigest())
 
-        # Build staff→services mapping for realistic assignment
-        staff_svc_map = {}
-        for bs in booking_staff:
-            staff_svc_map[bs.id] = list(bs.services.all())
-            if not staff_svc_map[bs.id]:
-                staff_svc_map[bs.id] = all_services
+        # Staff→services mapping for realistic assignment, built in memory
+        staff_svc_map = {bs.id: wanted_services[bs.email] or all_services for bs in booking_staff}
 
         now = timezone.now()
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -813,37 +794,29 @@ class Command(BaseCommand):
         from datetime import time as dt_time
 
         # --- Tables ---
-        for entry in cfg.get('tables', []):
-            name, min_s, max_s, zone, combinable = entry
-            Table.objects.get_or_create(
-                tenant=self.tenant, name=name,
-                defaults={
-                    'min_seats': min_s, 'max_seats': max_s,
-                    'zone': zone, 'combinable': combinable,
-                }
-            )
-        t_count = Table.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Tables: {t_count}')
+        tables, _ = bulk_get_or_create(Table, [
+            {'tenant': self.tenant, 'name': name, 'defaults': {
+                'min_seats': min_s, 'max_seats': max_s,
+                'zone': zone, 'combinable': combinable,
+            }}
+            for name, min_s, max_s, zone, combinable in cfg.get('tables', [])
+        ], keys=('tenant', 'name'))
+        self.stdout.write(f'  Tables: {len(tables)}')
 
         # --- Service Windows ---
+        rows = []
         for entry in cfg.get('service_windows', []):
             w_name, days, open_str, close_str, last_str, turn, covers = entry
-            h_o, m_o = map(int, open_str.split(':'))
-            h_c, m_c = map(int, close_str.split(':'))
-            h_l, m_l = map(int, last_str.split(':'))
             for day in days:
-                ServiceWindow.objects.get_or_create(
-                    tenant=self.tenant, name=w_name, day_of_week=day,
-                    defaults={
-                        'open_time': dt_time(h_o, m_o),
-                        'close_time': dt_time(h_c, m_c),
-                        'last_booking_time': dt_time(h_l, m_l),
-                        'turn_time_minutes': turn,
-                        'max_covers': covers,
-                    }
-                )
-        sw_count = ServiceWindow.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Service windows: {sw_count}')
+                rows.append({'tenant': self.tenant, 'name': w_name, 'day_of_week': day, 'defaults': {
+                    'open_time': dt_time(*map(int, open_str.split(':'))),
+                    'close_time': dt_time(*map(int, close_str.split(':'))),
+                    'last_booking_time': dt_time(*map(int, last_str.split(':'))),
+                    'turn_time_minutes': turn,
+                    'max_covers': covers,
+                }})
+        windows, _ = bulk_get_or_create(ServiceWindow, rows, keys=('tenant', 'name', 'day_of_week'))
+        self.stdout.write(f'  Service windows: {len(windows)}')
 
     def _seed_gym(self, cfg):
         from bookings.models_gym import ClassType, ClassSession
@@ -851,257 +824,188 @@ class Command(BaseCommand):
         from datetime import time as dt_time
 
         # --- Class Types ---
-        ct_map = {}
-        for entry in cfg.get('class_types', []):
-            name, category, duration, difficulty, capacity, colour, price = entry
-            ct, _ = ClassType.objects.get_or_create(
-                tenant=self.tenant, name=name,
-                defaults={
-                    'category': category,
-                    'duration_minutes': duration,
-                    'difficulty': difficulty,
-                    'max_capacity': capacity,
-                    'colour': colour,
-                    'price_pence': price,
-                }
-            )
-            ct_map[name] = ct
+        class_types, _ = bulk_get_or_create(ClassType, [
+            {'tenant': self.tenant, 'name': name, 'defaults': {
+                'category': category,
+                'duration_minutes': duration,
+                'difficulty': difficulty,
+                'max_capacity': capacity,
+                'colour': colour,
+                'price_pence': price,
+            }}
+            for name, category, duration, difficulty, capacity, colour, price in cfg.get('class_types', [])
+        ], keys=('tenant', 'name'))
+        ct_map = {ct.name: ct for ct in class_types.values()}
         self.stdout.write(f'  Class types: {len(ct_map)}')
 
         # --- Class Sessions (timetable) ---
         staff_by_email = {s.email: s for s in BookingStaff.objects.filter(tenant=self.tenant)}
-        session_count = 0
-        for entry in cfg.get('class_sessions', []):
-            ct_name, instr_email, day, start_str, end_str, room = entry
+        rows = []
+        for ct_name, instr_email, day, start_str, end_str, room in cfg.get('class_sessions', []):
             ct = ct_map.get(ct_name)
             if not ct:
                 continue
-            instructor = staff_by_email.get(instr_email)
-            h_s, m_s = map(int, start_str.split(':'))
-            h_e, m_e = map(int, end_str.split(':'))
-            ClassSession.objects.get_or_create(
-                tenant=self.tenant, class_type=ct, day_of_week=day,
-                start_time=dt_time(h_s, m_s),
-                defaults={
-                    'end_time': dt_time(h_e, m_e),
-                    'instructor': instructor,
+            rows.append({
+                'tenant': self.tenant, 'class_type': ct, 'day_of_week': day,
+                'start_time': dt_time(*map(int, start_str.split(':'))),
+                'defaults': {
+                    'end_time': dt_time(*map(int, end_str.split(':'))),
+                    'instructor': staff_by_email.get(instr_email),
                     'room': room,
-                }
-            )
-            session_count += 1
-        self.stdout.write(f'  Class sessions: {session_count}')
+                },
+            })
+        bulk_get_or_create(ClassSession, rows, keys=('tenant', 'class_type', 'day_of_week', 'start_time'))
+        self.stdout.write(f'  Class sessions: {len(rows)}')
 
     def _seed_staff(self, cfg, owner, manager, staff1, staff2):
-        from staff.models import StaffProfile, Shift, LeaveRequest, TrainingRecord, WorkingHours, ProjectCode, TimesheetEntry
+        from staff.models import StaffProfile
 
-        location = cfg['business_name']
-        profiles = {}
+        profile_rows = []
         for user, name in [(owner, 'Jordan Riley'), (manager, 'Alex Morgan'), (staff1, 'Sam Kim'), (staff2, 'Taylor Chen')]:
-            p, _ = StaffProfile.objects.get_or_create(
-                user=user, defaults={'tenant': self.tenant, 'display_name': name, 'phone': user.email}
-            )
-            if not p.tenant:
-                p.tenant = self.tenant
-                p.save(update_fields=['tenant'])
-            profiles[user.username] = p
-
-        today = date.today()
-        for p in profiles.values():
-            for day_offset in range(5):
-                d = today + timedelta(days=day_offset)
-                Shift.objects.get_or_create(
-                    staff=p, date=d, start_time=time(9, 0),
-                    defaults={'end_time': time(17, 0), 'location': location, 'is_published': True}
-                )
+            profile_rows.append({'user': user, 'defaults': {
+                'tenant_id': self.tenant.id, 'display_name': name, 'phone': user.email,
+            }})
+        objs, _ = bulk_get_or_create(StaffProfile, profile_rows, keys=('user',))
+        # Profiles created without a tenant by older seeds get claimed here
+        orphans = [p for p in objs.values() if not p.tenant_id]
+        for p in orphans:
+            p.tenant_id = self.tenant.id
+        if orphans:
+            StaffProfile.objects.bulk_update(orphans, ['tenant_id'])
+        by_user = {p.user_id: p for p in objs.values()}
+        profiles = {u.username: by_user[u.id] for u in (owner, manager, staff1, staff2)}
 
         staff1_key = f'{self.tenant.slug}-staff1'
-        staff2_key = f'{self.tenant.slug}-staff2'
-        manager_key = f'{self.tenant.slug}-manager'
-        if staff1_key in profiles:
-            LeaveRequest.objects.get_or_create(
-                staff=profiles[staff1_key], start_date=today + timedelta(days=10),
-                defaults={'end_date': today + timedelta(days=12), 'leave_type': 'ANNUAL', 'reason': 'Holiday', 'status': 'PENDING'}
-            )
-            TrainingRecord.objects.get_or_create(
-                staff=profiles[staff1_key], title='Fire Safety',
-                defaults={'provider': 'SafetyFirst Ltd', 'completed_date': today - timedelta(days=60), 'expiry_date': today + timedelta(days=300)}
-            )
-        if staff2_key in profiles:
-            LeaveRequest.objects.get_or_create(
-                staff=profiles[staff2_key], start_date=today + timedelta(days=20),
-                defaults={'end_date': today + timedelta(days=21), 'leave_type': 'SICK', 'reason': 'Medical appointment', 'status': 'APPROVED',
-                          'reviewed_by': profiles.get(manager_key)}
-            )
-            TrainingRecord.objects.get_or_create(
-                staff=profiles[staff2_key], title='COSHH Awareness',
-                defaults={'provider': 'HSE Online', 'completed_date': today - timedelta(days=400), 'expiry_date': today - timedelta(days=35)}
-            )
-
-        # --- Working Hours (Mon-Fri 9-17 for all, Sat 10-14 for staff) ---
-        for p in profiles.values():
-            for day in range(5):  # Mon-Fri
-                WorkingHours.objects.update_or_create(
-                    staff=p, day_of_week=day,
-                    defaults={'start_time': time(9, 0), 'end_time': time(17, 0), 'break_minutes': 30, 'is_active': True}
-                )
-        # Staff1 also works Saturday mornings
-        if staff1_key in profiles:
-            WorkingHours.objects.update_or_create(
-                staff=profiles[staff1_key], day_of_week=5,
-                defaults={'start_time': time(10, 0), 'end_time': time(14, 0), 'break_minutes': 0, 'is_active': True}
-            )
-        wh_count = WorkingHours.objects.filter(staff__tenant=self.tenant).count()
-        self.stdout.write(f'  Working hours: {wh_count}')
-
-        # --- Project Codes ---
-        pc1, _ = ProjectCode.objects.get_or_create(
-            tenant=self.tenant, code='GEN',
-            defaults={'name': 'General Operations', 'is_billable': False}
-        )
-        pc2, _ = ProjectCode.objects.get_or_create(
-            tenant=self.tenant, code='CLIENT-A',
-            defaults={'name': 'Client A Project', 'client_name': 'Client A Ltd', 'is_billable': True, 'hourly_rate': Decimal('45.00')}
+        self._seed_rota(
+            cfg, profiles,
+            staff_keys=[staff1_key, f'{self.tenant.slug}-staff2'],
+            manager_key=f'{self.tenant.slug}-manager',
+            saturday_key=staff1_key,
         )
-        pc_count = ProjectCode.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Project codes: {pc_count}')
-
-        # --- Timesheets (last 7 working days for all staff) ---
-        ts_count_before = TimesheetEntry.objects.filter(staff__tenant=self.tenant).count()
-        if ts_count_before == 0:
-            for p in profiles.values():
-                for day_offset in range(-7, 0):
-                    d = today + timedelta(days=day_offset)
-                    if d.weekday() >= 5:
-                        continue  # skip weekends
-                    pc = pc2 if day_offset % 3 == 0 else pc1
-                    # Slight variance for realism
-                    actual_start = time(9, 0) if day_offset % 4 != 0 else time(9, 15)
-                    actual_end = time(17, 0) if day_offset % 5 != 0 else time(16, 45)
-                    status = 'WORKED' if day_offset % 7 != -1 else 'LATE'
-                    TimesheetEntry.objects.get_or_create(
-                        staff=p, date=d,
-                        defaults={
-                            'scheduled_start': time(9, 0), 'scheduled_end': time(17, 0),
-                            'scheduled_break_minutes': 30,
-                            'actual_start': actual_start, 'actual_end': actual_end,
-                            'actual_break_minutes': 30,
-                            'status': status,
-                            'project_code': pc,
-                        }
-                    )
-        ts_count = TimesheetEntry.objects.filter(staff__tenant=self.tenant).count()
-        self.stdout.write(f'  Timesheet entries: {ts_count}')
-
-        sp_count = StaffProfile.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Staff profiles: {sp_count}')
+        self.stdout.write(f'  Staff profiles: {len(profiles)}')
 
-    def _seed_staff_custom(self, cfg):
+    def _seed_staff_custom(self, cfg, users):
         """Seed staff profiles for tenants with custom staff_users config."""
-        from staff.models import StaffProfile, WorkingHours, Shift, LeaveRequest, TrainingRecord, ProjectCode, TimesheetEntry
+        from staff.models import StaffProfile
 
-        profiles = {}
+        profile_rows = []
         for uname, uemail, ufirst, ulast, urole in cfg['staff_users']:
-            try:
-                user = User.objects.get(username=uname)
-            except User.DoesNotExist:
+            user = users.get(uname)
+            if user is None:
                 self.stdout.write(self.style.WARNING(f'  User {uname} not found — skipping StaffProfile'))
                 continue
-            p, created = StaffProfile.objects.get_or_create(
-                user=user,
-                defaults={'tenant': self.tenant, 'display_name': f'{ufirst} {ulast}', 'phone': cfg.get('phone', '')}
-            )
-            # Always ensure correct tenant and display name
-            changed = False
-            if p.tenant != self.tenant:
-                p.tenant = self.tenant
-                changed = True
-            if p.display_name != f'{ufirst} {ulast}':
-                p.display_name = f'{ufirst} {ulast}'
-                changed = True
-            if not p.is_active:
-                p.is_active = True
-                changed = True
-            if changed:
-                p.save()
-            for day in range(5):
-                WorkingHours.objects.update_or_create(
-                    staff=p, day_of_week=day,
-                    defaults={'start_time': time(9, 0), 'end_time': time(17, 0), 'break_minutes': 30, 'is_active': True}
-                )
-            profiles[uname] = p
-            self.stdout.write(f'  StaffProfile: {ufirst} {ulast} ({"created" if created else "exists"})')
+            profile_rows.append({'user': user, 'defaults': {
+                'tenant_id': self.tenant.id, 'display_name': f'{ufirst} {ulast}',
+                'phone': cfg.get('phone', ''), 'is_active': True,
+            }})
+        # Always ensure correct tenant and display name
+        objs, created = bulk_get_or_create(
+            StaffProfile, profile_rows, keys=('user',), update=('tenant_id', 'display_name', 'is_active'),
+        )
+        created_ids = {p.user_id for p in created}
+        by_user = {p.user_id: p for p in objs.values()}
+        profiles = {}
+        for uname, _, ufirst, ulast, _ in cfg['staff_users']:
+            user = users.get(uname)
+            if user is None:
+                continue
+            profiles[uname] = by_user[user.id]
+            self.stdout.write(f'  StaffProfile: {ufirst} {ulast} ({"created" if user.id in created_ids else "exists"})')
 
-        # --- Shifts (next 5 days for all staff) ---
-        location = cfg['business_name']
-        today = date.today()
-        for p in profiles.values():
-            for day_offset in range(5):
-                d = today + timedelta(days=day_offset)
-                Shift.objects.get_or_create(
-                    staff=p, date=d, start_time=time(9, 0),
-                    defaults={'end_time': time(17, 0), 'location': location, 'is_published': True}
-                )
-
-        # --- Leave & Training for staff1 and staff2 ---
         staff_keys = [u for u, _, _, _, r in cfg['staff_users'] if r == 'staff']
         manager_keys = [u for u, _, _, _, r in cfg['staff_users'] if r == 'manager']
+        self._seed_rota(cfg, profiles, staff_keys=staff_keys[:2],
+                        manager_key=manager_keys[0] if manager_keys else None)
+        self.stdout.write(f'  Custom staff profiles: {len(profiles)}')
+
+    def _seed_rota(self, cfg, profiles, staff_keys, manager_key=None, saturday_key=None):
+        """Working hours, shifts, leave, training, project codes and timesheets for `profiles`."""
+        from staff.models import Shift, LeaveRequest, TrainingRecord, WorkingHours, ProjectCode, TimesheetEntry
+
+        today = date.today()
+        location = cfg['business_name']
+
+        # --- Working Hours (Mon-Fri 9-17 for all, Sat 10-14 for `saturday_key`) ---
+        rows = [
+            {'staff': p, 'day_of_week': day, 'defaults': {
+                'start_time': time(9, 0), 'end_time': time(17, 0), 'break_minutes': 30, 'is_active': True,
+            }}
+            for p in profiles.values() for day in range(5)
+        ]
+        if saturday_key in profiles:
+            rows.append({'staff': profiles[saturday_key], 'day_of_week': 5, 'defaults': {
+                'start_time': time(10, 0), 'end_time': time(14, 0), 'break_minutes': 0, 'is_active': True,
+            }})
+        hours, _ = bulk_get_or_create(
+            WorkingHours, rows, keys=('staff', 'day_of_week'),
+            update=('start_time', 'end_time', 'break_minutes', 'is_active'),
+        )
+        self.stdout.write(f'  Working hours: {len(hours)}')
+
+        # --- Shifts (next 5 days for all staff) ---
+        bulk_get_or_create(Shift, [
+            {'staff': p, 'date': today + timedelta(days=day_offset), 'start_time': time(9, 0),
+             'defaults': {'end_time': time(17, 0), 'location': location, 'is_published': True}}
+            for p in profiles.values() for day_offset in range(5)
+        ], keys=('staff', 'date', 'start_time'))
+
+        # --- Leave & Training for the first two staff members ---
+        leave_rows, training_rows = [], []
         if len(staff_keys) >= 1 and staff_keys[0] in profiles:
-            LeaveRequest.objects.get_or_create(
-                staff=profiles[staff_keys[0]], start_date=today + timedelta(days=10),
-                defaults={'end_date': today + timedelta(days=12), 'leave_type': 'ANNUAL', 'reason': 'Holiday', 'status': 'PENDING'}
-            )
-            TrainingRecord.objects.get_or_create(
-                staff=profiles[staff_keys[0]], title='Fire Safety',
-                defaults={'provider': 'SafetyFirst Ltd', 'completed_date': today - timedelta(days=60), 'expiry_date': today + timedelta(days=300)}
-            )
+            p = profiles[staff_keys[0]]
+            leave_rows.append({'staff': p, 'start_date': today + timedelta(days=10), 'defaults': {
+                'end_date': today + timedelta(days=12), 'leave_type': 'ANNUAL', 'reason': 'Holiday', 'status': 'PENDING',
+            }})
+            training_rows.append({'staff': p, 'title': 'Fire Safety', 'defaults': {
+                'provider': 'SafetyFirst Ltd', 'completed_date': today - timedelta(days=60),
+                'expiry_date': today + timedelta(days=300),
+            }})
         if len(staff_keys) >= 2 and staff_keys[1] in profiles:
-            reviewer = profiles.get(manager_keys[0]) if manager_keys else None
-            LeaveRequest.objects.get_or_create(
-                staff=profiles[staff_keys[1]], start_date=today + timedelta(days=20),
-                defaults={'end_date': today + timedelta(days=21), 'leave_type': 'SICK', 'reason': 'Medical appointment', 'status': 'APPROVED',
-                          'reviewed_by': reviewer}
-            )
-            TrainingRecord.objects.get_or_create(
-                staff=profiles[staff_keys[1]], title='COSHH Awareness',
-                defaults={'provider': 'HSE Online', 'completed_date': today - timedelta(days=400), 'expiry_date': today - timedelta(days=35)}
-            )
+            p = profiles[staff_keys[1]]
+            leave_rows.append({'staff': p, 'start_date': today + timedelta(days=20), 'defaults': {
+                'end_date': today + timedelta(days=21), 'leave_type': 'SICK', 'reason': 'Medical appointment',
+                'status': 'APPROVED', 'reviewed_by': profiles.get(manager_key),
+            }})
+            training_rows.append({'staff': p, 'title': 'COSHH Awareness', 'defaults': {
+                'provider': 'HSE Online', 'completed_date': today - timedelta(days=400),
+                'expiry_date': today - timedelta(days=35),
+            }})
+        bulk_get_or_create(LeaveRequest, leave_rows, keys=('staff', 'start_date'))
+        bulk_get_or_create(TrainingRecord, training_rows, keys=('staff', 'title'))
 
         # --- Project Codes ---
-        pc1, _ = ProjectCode.objects.get_or_create(
-            tenant=self.tenant, code='GEN',
-            defaults={'name': 'General Operations', 'is_billable': False}
-        )
-        pc2, _ = ProjectCode.objects.get_or_create(
-            tenant=self.tenant, code='CLIENT-A',
-            defaults={'name': 'Client A Project', 'client_name': 'Client A Ltd', 'is_billable': True, 'hourly_rate': Decimal('45.00')}
-        )
+        codes, _ = bulk_get_or_create(ProjectCode, [
+            {'tenant': self.tenant, 'code': 'GEN',
+             'defaults': {'name': 'General Operations', 'is_billable': False}},
+            {'tenant': self.tenant, 'code': 'CLIENT-A',
+             'defaults': {'name': 'Client A Project', 'client_name': 'Client A Ltd', 'is_billable': True,
+                          'hourly_rate': Decimal('45.00')}},
+        ], keys=('tenant', 'code'))
+        pc1, pc2 = codes[(self.tenant.id, 'GEN')], codes[(self.tenant.id, 'CLIENT-A')]
+        self.stdout.write(f'  Project codes: {len(codes)}')
 
         # --- Timesheets (last 7 working days for all staff) ---
-        ts_count_before = TimesheetEntry.objects.filter(staff__tenant=self.tenant).count()
-        if ts_count_before == 0:
+        if not TimesheetEntry.objects.filter(staff__tenant=self.tenant).exists():
+            entries = []
             for p in profiles.values():
                 for day_offset in range(-7, 0):
                     d = today + timedelta(days=day_offset)
                     if d.weekday() >= 5:
-                        continue
-                    pc = pc2 if day_offset % 3 == 0 else pc1
-                    actual_start = time(9, 0) if day_offset % 4 != 0 else time(9, 15)
-                    actual_end = time(17, 0) if day_offset % 5 != 0 else time(16, 45)
-                    status = 'WORKED' if day_offset % 7 != -1 else 'LATE'
-                    TimesheetEntry.objects.get_or_create(
+                        continue  # skip weekends
+                    # Slight variance for realism
+                    entries.append(TimesheetEntry(
                         staff=p, date=d,
-                        defaults={
-                            'scheduled_start': time(9, 0), 'scheduled_end': time(17, 0),
-                            'scheduled_break_minutes': 30,
-                            'actual_start': actual_start, 'actual_end': actual_end,
-                            'actual_break_minutes': 30,
-                            'status': status,
-                            'project_code': pc,
-                        }
-                    )
-
-        sp_count = StaffProfile.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Custom staff profiles: {sp_count}')
+                        scheduled_start=time(9, 0), scheduled_end=time(17, 0),
+                        scheduled_break_minutes=30,
+                        actual_start=time(9, 0) if day_offset % 4 != 0 else time(9, 15),
+                        actual_end=time(17, 0) if day_offset % 5 != 0 else time(16, 45),
+                        actual_break_minutes=30,
+                        status='WORKED' if day_offset % 7 != -1 else 'LATE',
+                        project_code=pc2 if day_offset % 3 == 0 else pc1,
+                    ))
+            TimesheetEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        ts_count = TimesheetEntry.objects.filter(staff__tenant=self.tenant).count()
+        self.stdout.write(f'  Timesheet entries: {ts_count}')
 
     def _seed_disclaimer(self, dcfg):
         """Seed a disclaimer using the IntakeWellbeingDisclaimer model."""
@@ -1123,98 +1027,80 @@ class Command(BaseCommand):
             self.stdout.write('  Comms module not available — skipping')
             return
 
-        channels = []
-        for ch_name, ch_type in cfg['comms_channels']:
-            ch, _ = Channel.objects.get_or_create(tenant=self.tenant, name=ch_name, defaults={'channel_type': ch_type})
-            if slug != 'nbne':
-                for u in [owner, manager, staff1, staff2]:
-                    ChannelMember.objects.get_or_create(channel=ch, user=u)
-            channels.append(ch)
+        objs, _ = bulk_get_or_create(Channel, [
+            {'tenant': self.tenant, 'name': ch_name, 'defaults': {'channel_type': ch_type}}
+            for ch_name, ch_type in cfg['comms_channels']
+        ], keys=('tenant', 'name'))
+        channels = list(objs.values())
+        if slug != 'nbne':
+            bulk_get_or_create(ChannelMember, [
+                {'channel': ch, 'user': u} for ch in channels for u in [owner, manager, staff1, staff2]
+            ], keys=('channel', 'user'))
 
         if slug != 'nbne' and channels and not Message.objects.filter(channel=channels[0]).exists():
-            Message.objects.create(channel=channels[0], sender=owner, body='Welcome to the team chat!')
-            Message.objects.create(channel=channels[0], sender=staff1, body='Thanks! Excited to be here.')
-            Message.objects.create(channel=channels[0], sender=manager, body='Remember to check the rota for next week.')
-        ch_count = Channel.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Channels: {ch_count}')
+            Message.objects.bulk_create([
+                Message(channel=channels[0], sender=owner, body='Welcome to the team chat!'),
+                Message(channel=channels[0], sender=staff1, body='Thanks! Excited to be here.'),
+                Message(channel=channels[0], sender=manager, body='Remember to check the rota for next week.'),
+            ])
+        self.stdout.write(f'  Channels: {len(channels)}')
 
     def _seed_compliance(self, owner, staff1):
-        from compliance.models import (
-            IncidentReport, RAMSDocument, ComplianceCategory, ComplianceItem, PeaceOfMindScore,
-        )
+        from compliance.models import IncidentReport, RAMSDocument, ComplianceCategory, ComplianceItem
 
         # --- Seed UK baseline compliance items per tenant ---
         from compliance.management.commands.seed_compliance import UK_BASELINE
 
-        # Disconnect signals during bulk seed to avoid N recalculations
-        from django.db.models.signals import post_save, post_delete
-        from compliance.signals import recalculate_score_on_save, recalculate_score_on_delete
-        post_save.disconnect(recalculate_score_on_save)
-        post_delete.disconnect(recalculate_score_on_delete)
+        categories, _ = bulk_get_or_create(ComplianceCategory, [
+            {'tenant': self.tenant, 'name': cat_data['category'], 'defaults': {'max_score': 10}}
+            for cat_data in UK_BASELINE
+        ], keys=('tenant', 'name'))
 
         today = date.today()
-        item_count = 0
         # Vary due dates for realistic demo: some overdue, some due soon, some compliant
         due_offsets = [-15, -5, 10, 25, 45, 90, 120, 180, 200, 250, 300, 330, 14, 60, 7, 21, 35, 150, 270, 365]
         idx = 0
+        rows = []
         for cat_data in UK_BASELINE:
-            cat, _ = ComplianceCategory.objects.get_or_create(
-                tenant=self.tenant, name=cat_data['category'],
-                defaults={'max_score': 10}
-            )
+            cat = categories[(self.tenant.id, cat_data['category'])]
             for item_data in cat_data['items']:
-                offset = due_offsets[idx % len(due_offsets)]
+                due = today + timedelta(days=due_offsets[idx % len(due_offsets)])
                 idx += 1
-                due = today + timedelta(days=offset)
-                obj, created = ComplianceItem.objects.get_or_create(
-                    title=item_data['title'], category=cat,
-                    defaults={
-                        'description': item_data['description'],
-                        'item_type': item_data['item_type'],
-                        'frequency_type': item_data['frequency_type'],
-                        'evidence_required': item_data['evidence_required'],
-                        'regulatory_ref': item_data['regulatory_ref'],
-                        'legal_reference': item_data['legal_reference'],
-                        'plain_english_why': item_data.get('plain_english_why', ''),
-                        'primary_action': item_data.get('primary_action', ''),
-                        'next_due_date': due,
-                        'due_date': due,
-                    }
-                )
-                if not created:
-                    obj.plain_english_why = item_data.get('plain_english_why', '')
-                    obj.primary_action = item_data.get('primary_action', '')
-                    obj.description = item_data['description']
-                    obj.legal_reference = item_data['legal_reference']
-                    obj.save(update_fields=['plain_english_why', 'primary_action', 'description', 'legal_reference'])
-                else:
-                    item_count += 1
-        self.stdout.write(f'  Compliance items: {item_count} new, {ComplianceItem.objects.filter(category__tenant=self.tenant).count()} total')
-
-        # Reconnect signals
-        post_save.connect(recalculate_score_on_save)
-        post_delete.connect(recalculate_score_on_delete)
-
-        # Recalculate score for this tenant
-        PeaceOfMindScore.recalculate(tenant=self.tenant)
+                rows.append({'title': item_data['title'], 'category': cat, 'defaults': {
+                    'description': item_data['description'],
+                    'item_type': item_data['item_type'],
+                    'frequency_type': item_data['frequency_type'],
+                    'evidence_required': item_data['evidence_required'],
+                    'regulatory_ref': item_data['regulatory_ref'],
+                    'legal_reference': item_data['legal_reference'],
+                    'plain_english_why': item_data.get('plain_english_why', ''),
+                    'primary_action': item_data.get('primary_action', ''),
+                    'next_due_date': due,
+                    'due_date': due,
+                }})
+
+        def derive_status(item):
+            item.status = item.compute_status()  # ComplianceItem.save() is bypassed by bulk_create
+
+        _, created = bulk_get_or_create(
+            ComplianceItem, rows, keys=('title', 'category'), prepare=derive_status,
+            update=('plain_english_why', 'primary_action', 'description', 'legal_reference'),
+        )
+        self.stdout.write(f'  Compliance items: {len(created)} new, {len(rows)} total')
 
         # --- Seed incidents ---
-        IncidentReport.objects.get_or_create(
-            tenant=self.tenant, title='Wet floor slip hazard',
-            defaults={
+        bulk_get_or_create(IncidentReport, [
+            {'tenant': self.tenant, 'title': 'Wet floor slip hazard', 'defaults': {
                 'description': 'Water pooling near wash stations during busy period.',
                 'severity': 'MEDIUM', 'status': 'INVESTIGATING', 'location': 'Wash Area',
                 'incident_date': timezone.now() - timedelta(days=3), 'reported_by': staff1,
-            }
-        )
-        IncidentReport.objects.get_or_create(
-            tenant=self.tenant, title='Chemical storage unlabelled',
-            defaults={
+            }},
+            {'tenant': self.tenant, 'title': 'Chemical storage unlabelled', 'defaults': {
                 'description': 'Several COSHH substances found without proper labels.',
                 'severity': 'HIGH', 'status': 'OPEN', 'location': 'Store Room',
                 'incident_date': timezone.now() - timedelta(days=1), 'reported_by': staff1,
-            }
-        )
+            }},
+        ], keys=('tenant', 'title'))
         RAMSDocument.objects.get_or_create(
             tenant=self.tenant, title='General Risk Assessment',
             defaults={
@@ -1231,10 +1117,11 @@ class Command(BaseCommand):
         from django.core.files.base import ContentFile
         from documents.models import Document, DocumentTag
 
-        for tag_name in ['Policy', 'HSE', 'Training', 'HR']:
-            DocumentTag.objects.get_or_create(tenant=self.tenant, name=tag_name)
-        tag_count = DocumentTag.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Document tags: {tag_count}')
+        tags, _ = bulk_get_or_create(DocumentTag, [
+            {'tenant': self.tenant, 'name': tag_name} for tag_name in ['Policy', 'HSE', 'Training', 'HR']
+        ], keys=('tenant', 'name'))
+        tag_by_name = {t.name: t for t in tags.values()}
+        self.stdout.write(f'  Document tags: {len(tag_by_name)}')
 
         # --- Sample documents with real files ---
         sample_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'documents', 'sample_docs')
@@ -1262,21 +1149,24 @@ class Command(BaseCommand):
             },
         ]
 
+        docs, _ = bulk_get_or_create(Document, [
+            {'tenant': self.tenant, 'title': sd['title'], 'defaults': {
+                'category': sd['category'],
+                'description': sd['description'],
+                'regulatory_ref': sd.get('regulatory_ref', ''),
+                'access_level': sd.get('access_level', 'staff'),
+                'uploaded_by': owner,
+                'is_placeholder': False,
+            }}
+            for sd in SAMPLE_DOCS
+        ], keys=('tenant', 'title'))
+
+        wanted_tags = {}
         for sd in SAMPLE_DOCS:
-            doc, created = Document.objects.get_or_create(
-                tenant=self.tenant, title=sd['title'],
-                defaults={
-                    'category': sd['category'],
-                    'description': sd['description'],
-                    'regulatory_ref': sd.get('regulatory_ref', ''),
-                    'access_level': sd.get('access_level', 'staff'),
-                    'uploaded_by': owner,
-                    'is_placeholder': False,
-                }
-            )
+            doc = docs[(self.tenant.id, sd['title'])]
             # Attach file if missing
             sample_path = os.path.join(sample_dir, sd['sample_file'])
-            if (created or not doc.file) and os.path.isfile(sample_path):
+            if not doc.file and os.path.isfile(sample_path):
                 with open(sample_path, 'r', encoding='utf-8') as f:
                     content = f.read().replace('[Business Name]', biz).replace('[Owner/Manager Name]', owner.get_full_name() or biz)
                 fname = sd['sample_file'].replace('.txt', f'_{self.tenant.slug}.txt')
@@ -1287,14 +1177,10 @@ class Command(BaseCommand):
                 doc.is_placeholder = False
                 doc.save()
                 self.stdout.write(f'    Attached sample: {fname}')
-            # Assign tags
-            for tag_name in sd.get('tags', []):
-                tag = DocumentTag.objects.filter(tenant=self.tenant, name=tag_name).first()
-                if tag:
-                    doc.tags.add(tag)
-
-        doc_count = Document.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Documents: {doc_count}')
+            wanted_tags[doc.id] = [tag_by_name[t].id for t in sd.get('tags', []) if t in tag_by_name]
+        # Assign tags (additive, like doc.tags.add)
+        bulk_set_m2m(Document.tags, wanted_tags, add_only=True)
+        self.stdout.write(f'  Documents: {len(docs)}')
 
     def _seed_crm(self, owner, manager):
         from crm.models import Lead, LeadNote, LeadHistory
@@ -1310,29 +1196,34 @@ class Command(BaseCommand):
             {'name': 'Charlotte Hughes', 'email': 'charlotte.h@example.com', 'phone': '07700 900222', 'source': 'referral', 'status': 'CONTACTED', 'value_pence': 20000, 'marketing_consent': True, 'notes': 'Wedding party booking enquiry. High value.', 'follow_up_date': today, 'last_contact_date': today - timedelta(days=5)},
             {'name': 'Harry Clarke', 'email': 'harry.c@example.com', 'phone': '', 'source': 'social', 'status': 'CONTACTED', 'value_pence': 4000, 'marketing_consent': False, 'notes': 'Messaged on Facebook.', 'follow_up_date': today - timedelta(days=8), 'last_contact_date': today - timedelta(days=15)},
         ]
-        for ld in leads_data:
-            lead, created = Lead.objects.get_or_create(
-                tenant=self.tenant, email=ld['email'],
-                defaults={
-                    'name': ld['name'], 'phone': ld.get('phone', ''), 'source': ld['source'],
-                    'status': ld['status'], 'value_pence': ld['value_pence'],
-                    'marketing_consent': ld.get('marketing_consent', False),
-                    'notes': ld.get('notes', ''),
-                    'follow_up_date': ld.get('follow_up_date'),
-                    'last_contact_date': ld.get('last_contact_date'),
-                }
-            )
-            if created:
-                LeadHistory.objects.get_or_create(lead=lead, action='Lead created', defaults={'detail': f'Source: {ld["source"]}'})
-                if ld['status'] == 'CONTACTED':
-                    LeadHistory.objects.get_or_create(lead=lead, action='Contacted', defaults={'detail': 'Initial contact made'})
-                if ld['status'] == 'QUALIFIED':
-                    LeadHistory.objects.get_or_create(lead=lead, action='Qualified', defaults={'detail': 'Moved to qualified'})
-                if ld['status'] == 'CONVERTED':
-                    LeadHistory.objects.get_or_create(lead=lead, action='Converted to client', defaults={'detail': ''})
-                if ld.get('notes'):
-                    LeadNote.objects.get_or_create(lead=lead, text=ld['notes'], defaults={'created_by': 'System'})
-
+        leads, created = bulk_get_or_create(Lead, [
+            {'tenant': self.tenant, 'email': ld['email'], 'defaults': {
+                'name': ld['name'], 'phone': ld.get('phone', ''), 'source': ld['source'],
+                'status': ld['status'], 'value_pence': ld['value_pence'],
+                'marketing_consent': ld.get('marketing_consent', False),
+                'notes': ld.get('notes', ''),
+                'follow_up_date': ld.get('follow_up_date'),
+                'last_contact_date': ld.get('last_contact_date'),
+            }}
+            for ld in leads_data
+        ], keys=('tenant', 'email'))
+
+        # History and notes only for leads created by this run
+        status_history = {
+            'CONTACTED': ('Contacted', 'Initial contact made'),
+            'QUALIFIED': ('Qualified', 'Moved to qualified'),
+            'CONVERTED': ('Converted to client', ''),
+        }
+        history, notes = [], []
+        for lead in created:
+            history.append(LeadHistory(lead=lead, action='Lead created', detail=f'Source: {lead.source}'))
+            if lead.status in status_history:
+                action, detail = status_history[lead.status]
+                history.append(LeadHistory(lead=lead, action=action, detail=detail))
+            if lead.notes:
+                notes.append(LeadNote(lead=lead, text=lead.notes, created_by='System'))
+        LeadHistory.objects.bulk_create(history)
+        LeadNote.objects.bulk_create(notes)
         lead_count = Lead.objects.filter(tenant=self.tenant).count()
         self.stdout.write(f'  Leads: {lead_count}')
 
@@ -1344,18 +1235,15 @@ class Command(BaseCommand):
             self.stdout.write('  Shop module not available — skipping')
             return
 
-        for entry in cfg.get('shop_products', []):
-            name, category, price, description, stock = entry
-            p, created = Product.objects.get_or_create(
-                tenant=self.tenant, name=name,
-                defaults={
-                    'category': category,
-                    'price': Decimal(price),
-                    'description': description,
-                    'stock_quantity': stock,
-                    'track_stock': stock > 0,
-                    'active': True,
-                }
-            )
-        prod_count = Product.objects.filter(tenant=self.tenant).count()
-        self.stdout.write(f'  Shop products: {prod_count}')
+        products, _ = bulk_get_or_create(Product, [
+            {'tenant': self.tenant, 'name': name, 'defaults': {
+                'category': category,
+                'price': Decimal(price),
+                'description': description,
+                'stock_quantity': stock,
+                'track_stock': stock > 0,
+                'active': True,
+            }}
+            for name, category, price, description, stock in cfg.get('shop_products', [])
+        ], keys=('tenant', 'name'))
+        self.stdout.write(f'  Shop products: {len(products)}')
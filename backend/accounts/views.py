@@ -297,7 +297,7 @@ def data_erase(request):
         StaffProfile.objects.filter(tenant=tenant, user=user).update(
             display_name='[erased]', phone='',
             emergency_contact_name='', emergency_contact_phone='',
-            notes='',
+            notes='', updated_at=timezone.now(),
         )
     except Exception:
         pass
@@ -4,7 +4,10 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from .models import Service, Staff, Client, Booking, Session, StaffBlock, ServiceOptimisationLog
-from .serializers import ServiceSerializer, StaffSerializer, ClientSerializer, BookingSerializer, SessionSerializer
+from .pagination import BookingKeysetPagination
+from .serializers import (
+    ServiceSerializer, StaffSerializer, ClientSerializer, BookingSerializer, BookingListSerializer, SessionSerializer,
+)
 from .utils import generate_time_slots, get_available_dates
 
 
@@ -234,11 +237,39 @@ class ClientViewSet(viewsets.ModelViewSet):
 
 
 class BookingViewSet(viewsets.ModelViewSet):
+    """
+    Bookings for the current tenant.
+
+    `GET /bookings/` keeps returning the full array for existing clients.
+    List mode — `?view=list`, or any `cursor`/`page_size` param — returns
+    trimmed rows (BookingListSerializer) in keyset pages on (start_time, id);
+    see bookings.pagination.
+    """
     serializer_class = BookingSerializer
 
     def get_queryset(self):
         tenant = getattr(self.request, 'tenant', None)
-        return Booking.objects.filter(tenant=tenant) if tenant else Booking.objects.none()
+        if not tenant:
+            return Booking.objects.none()
+        # Every serializer field on client/service/staff comes from this one join
+        return Booking.objects.filter(tenant=tenant).select_related('client', 'service', 'staff')
+
+    def _list_mode(self):
+        params = self.request.query_params
+        return self.action == 'list' and (
+            params.get('view') == 'list' or 'cursor' in params or 'page_size' in params
+        )
+
+    def get_serializer_class(self):
+        if self._list_mode():
+            return BookingListSerializer
+        return super().get_serializer_class()
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = BookingKeysetPagination() if self._list_mode() else None
+        return self._paginator
     
     def get_permissions(self):
         if self.action in ('create', 'slots', 'available_dates'):
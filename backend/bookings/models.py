@@ -280,6 +280,8 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=['start_time', 'staff']),
             models.Index(fields=['status']),
+            # Keyset pagination of the tenant's booking list (bookings.pagination)
+            models.Index(fields=['tenant', 'start_time', 'id'], name='bookings_tenant_start_idx'),
         ]
 
     def __str__(self):
@@ -0,0 +1,84 @@
+"""
+Keyset pagination for booking lists.
+
+Pages are walked by (start_time, id) rather than OFFSET: the cursor carries
+the last row's start_time and id, and the next page is
+`WHERE (start_time, id) > cursor ORDER BY start_time, id LIMIT n`, so every
+page costs the same however deep the client scrolls, and rows inserted
+while paging never shift later pages.
+
+Query params:
+    page_size  rows per page (default 50, max 200)
+    cursor     opaque token from the previous page's `next`
+    direction  'asc' (default, oldest first) or 'desc' (newest first)
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class BookingKeysetPagination(BasePagination):
+    page_size = 50
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self._page_size(request)
+        self.descending = request.query_params.get('direction') == 'desc'
+
+        order = ('-start_time', '-id') if self.descending else ('start_time', 'id')
+        queryset = queryset.order_by(*order)
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            start_time, pk = self.decode_cursor(cursor)
+            if self.descending:
+                after = Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=pk)
+            else:
+                after = Q(start_time__gt=start_time) | Q(start_time=start_time, id__gt=pk)
+            queryset = queryset.filter(after)
+
+        # One extra row tells us whether there is a next page without a COUNT
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'next': self.get_next_link(),
+            'page_size': self.page_size,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, 'cursor', self.encode_cursor(last.start_time, last.id))
+
+    def _page_size(self, request):
+        try:
+            size = int(request.query_params.get('page_size', self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def encode_cursor(start_time, pk):
+        raw = f'{start_time.isoformat()}|{pk}'.encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            start_time, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+            return datetime.fromisoformat(start_time), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
@@ -158,6 +158,23 @@ class BookingSerializer(serializers.ModelSerializer):
         return data
 
 
+class BookingListSerializer(BookingSerializer):
+    """
+    Trimmed booking row for list views (?view=list): what the admin bookings
+    table and calendar render, without the client history and risk
+    recommendation fields. Expects client/service/staff to be select_related.
+    """
+
+    class Meta(BookingSerializer.Meta):
+        fields = ['id', 'client', 'client_name', 'client_email', 'client_phone',
+                  'service', 'service_name', 'service_price', 'staff', 'staff_name',
+                  'start_time', 'end_time', 'status', 'notes',
+                  'payment_status', 'payment_amount', 'risk_level',
+                  'customer_name', 'customer_email', 'customer_phone',
+                  'slot_date', 'slot_start', 'slot_end',
+                  'price_pence', 'deposit_pence', 'assigned_staff']
+
+
 class SessionSerializer(serializers.ModelSerializer):
     service_name = serializers.CharField(source='service.name', read_only=True)
     staff_name = serializers.CharField(source='staff.name', read_only=True)
@@ -0,0 +1,249 @@
+"""
+Service Intelligence — nightly metrics + pricing recommendations
+
+Set-based rewrite of the per-service loop in update_service_intelligence:
+
+- One grouped conditional aggregate over Booking (last 90 days) keyed by
+  service gives counts, revenue, average risk, peak-hour volume, the 30-day
+  demand count and average client reliability for every service at once.
+- One grouped query counts repeat clients (3+ bookings) per service.
+- Recommendations are derived in Python from those rows, then written with
+  one bulk_update on Service and one bulk_create on ServiceOptimisationLog.
+
+Query count is fixed per call: the same handful of queries covers every
+service of the selected tenants (all tenants by default), however many
+tenants or services there are. run_sharded() spreads tenants across a
+process pool for the nightly job — one call per shard.
+"""
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+PEAK_START_HOUR = 10
+PEAK_END_HOUR = 14
+
+METRIC_FIELDS = [
+    'total_bookings', 'total_revenue', 'avg_booking_value', 'no_show_rate', 'avg_risk_score',
+    'peak_utilisation_rate', 'off_peak_utilisation_rate', 'demand_index',
+    'recommended_base_price', 'recommended_deposit_percent', 'recommended_payment_type',
+    'recommendation_reason', 'recommendation_confidence', 'recommendation_snapshot',
+    'last_optimised_at', 'updated_at',
+]
+
+
+def _booking_metrics(service_ids, now):
+    """{service_id: aggregate row} for bookings in the last 90 days."""
+    from .models import Booking
+
+    ninety_days_ago = now - timedelta(days=90)
+    thirty_days_ago = now - timedelta(days=30)
+    completed = Q(status='completed')
+    rows = (
+        Booking.objects.filter(service_id__in=service_ids, start_time__gte=ninety_days_ago)
+        .values('service_id')
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=completed),
+            no_shows=Count('id', filter=Q(status='no_show')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+            revenue=Sum('service__price', filter=completed),
+            avg_risk=Avg('risk_score'),
+            peak=Count('id', filter=Q(start_time__hour__gte=PEAK_START_HOUR, start_time__hour__lt=PEAK_END_HOUR)),
+            recent_30=Count('id', filter=Q(start_time__gte=thirty_days_ago)),
+            avg_reliability=Avg('client__reliability_score'),
+        )
+    )
+    metrics = {r['service_id']: r for r in rows}
+
+    repeat = (
+        Booking.objects.filter(service_id__in=service_ids, start_time__gte=ninety_days_ago)
+        .values('service_id', 'client_id')
+        .annotate(cnt=Count('id'))
+        .filter(cnt__gte=3)
+    )
+    repeat_clients = Counter(r['service_id'] for r in repeat)
+    for service_id, row in metrics.items():
+        row['repeat_clients'] = repeat_clients.get(service_id, 0)
+    return metrics
+
+
+def _recommend(svc, m, now):
+    """Apply metrics `m` to `svc` in memory. Returns a log entry dict or None."""
+    total = m.get('total', 0)
+    completed = m.get('completed', 0)
+    no_shows = m.get('no_shows', 0)
+    ns_rate = round(no_shows / total * 100, 1) if total > 0 else 0
+    revenue = m.get('revenue') or Decimal('0')
+    avg_value = revenue / completed if completed > 0 else Decimal('0')
+    avg_risk = m.get('avg_risk') or 0
+
+    # --- Utilisation (peak = 10-14, off-peak = rest) ---
+    peak_bookings = m.get('peak', 0)
+    off_peak_bookings = total - peak_bookings
+    # Estimate capacity: 4 peak hours * 90 days / duration
+    slots_per_hour = 60 / max(svc.duration_minutes, 15)
+    peak_capacity = max(1, 4 * slots_per_hour * 90)
+    off_peak_capacity = max(1, 6 * slots_per_hour * 90)
+    peak_util = min(100, round(peak_bookings / peak_capacity * 100, 1))
+    off_peak_util = min(100, round(off_peak_bookings / off_peak_capacity * 100, 1))
+
+    # --- Demand index (30-day) ---
+    demand = min(100, round(m.get('recent_30', 0) * 3.3, 1))  # normalise ~30 bookings/month = 100
+
+    # --- Pricing Recommendation Engine (Phase 3) ---
+    rec_price = None
+    rec_deposit = None
+    rec_payment = ''
+    confidence = 0
+    reasons = []
+    if total >= 3:  # need minimum data
+        # High utilisation + reliable clients → price increase
+        if peak_util > 80:
+            avg_reliability = m.get('avg_reliability') or 0
+            if avg_reliability > 70:
+                rec_price = svc.price + Decimal(str(round(float(svc.price) * 0.08, 2)))
+                reasons.append(f'Peak utilisation {peak_util:.0f}% with avg reliability {avg_reliability:.0f}% — suggest +8% price increase')
+                confidence = max(confidence, 75)
+            else:
+                rec_price = svc.price + Decimal(str(round(float(svc.price) * 0.05, 2)))
+                reasons.append(f'Peak utilisation {peak_util:.0f}% — suggest +5% price increase')
+                confidence = max(confidence, 60)
+
+        # Low utilisation → off-peak discount
+        if off_peak_util < 40 and svc.off_peak_discount_allowed:
+            reasons.append(f'Off-peak utilisation only {off_peak_util:.0f}% — suggest off-peak discount window')
+            confidence = max(confidence, 55)
+
+        # High no-show rate → deposit/full payment
+        if ns_rate > 15:
+            rec_deposit = 100
+            rec_payment = 'full'
+            reasons.append(f'No-show rate {ns_rate:.1f}% — recommend full prepayment')
+            confidence = max(confidence, 80)
+        elif ns_rate > 8:
+            rec_deposit = 50
+            rec_payment = 'deposit'
+            reasons.append(f'No-show rate {ns_rate:.1f}% — recommend 50% deposit')
+            confidence = max(confidence, 65)
+
+        # Loyalty detection
+        repeat_clients = m.get('repeat_clients', 0)
+        if repeat_clients >= 2 and total >= 5:
+            reasons.append(f'{repeat_clients} loyal repeat clients — consider loyalty incentive')
+            confidence = max(confidence, 50)
+    rec_reason = ' | '.join(reasons)
+
+    svc.total_bookings = total
+    svc.total_revenue = revenue
+    svc.avg_booking_value = avg_value
+    svc.no_show_rate = ns_rate
+    svc.avg_risk_score = round(avg_risk, 1)
+    svc.peak_utilisation_rate = peak_util
+    svc.off_peak_utilisation_rate = off_peak_util
+    svc.demand_index = demand
+    svc.recommended_base_price = rec_price
+    svc.recommended_deposit_percent = rec_deposit
+    svc.recommended_payment_type = rec_payment
+    svc.recommendation_reason = rec_reason
+    svc.recommendation_confidence = confidence
+    svc.recommendation_snapshot = {
+        'total_bookings': total,
+        'completed': completed,
+        'no_shows': no_shows,
+        'cancelled': m.get('cancelled', 0),
+        'revenue': float(revenue),
+        'avg_risk': round(avg_risk, 1),
+        'peak_util': peak_util,
+        'off_peak_util': off_peak_util,
+        'demand_index': demand,
+        'ns_rate': ns_rate,
+    }
+    svc.last_optimised_at = now
+    svc.updated_at = now  # bulk_update skips auto_now
+
+    if not rec_reason:
+        return None
+    return {
+        'recommended_price': float(rec_price) if rec_price else None,
+        'recommended_deposit': rec_deposit,
+        'recommended_payment': rec_payment,
+        'confidence': confidence,
+    }
+
+
+def update_service_intelligence(tenant_ids=None, now=None):
+    """
+    Recalculate metrics and recommendations for every service (optionally only
+    those of `tenant_ids`). Returns the number of services updated.
+    """
+    from django.db import transaction
+    from .models import Service, ServiceOptimisationLog
+
+    now = now or timezone.now()
+    services = Service.objects.all()
+    if tenant_ids is not None:
+        services = services.filter(tenant_id__in=tenant_ids)
+    services = list(services.only('id', 'tenant_id', 'duration_minutes', 'price', 'off_peak_discount_allowed'))
+    if not services:
+        return 0
+
+    metrics = _booking_metrics([s.id for s in services], now)
+    logs = []
+    for svc in services:
+        recommendation = _recommend(svc, metrics.get(svc.id, {}), now)
+        if recommendation is not None:
+            # Log if recommendation changed
+            logs.append(ServiceOptimisationLog(
+                service=svc,
+                reason=svc.recommendation_reason,
+                ai_recommended=True,
+                owner_override=False,
+                input_metrics=svc.recommendation_snapshot,
+                output_recommendation=recommendation,
+            ))
+
+    with transaction.atomic():
+        Service.objects.bulk_update(services, METRIC_FIELDS, batch_size=500)
+        ServiceOptimisationLog.objects.bulk_create(logs, batch_size=500)
+    return len(services)
+
+
+def _run_shard(tenant_ids, now):
+    from django.db import connections
+    try:
+        return update_service_intelligence(tenant_ids, now=now)
+    finally:
+        connections.close_all()
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def run_sharded(workers, tenant_ids=None, now=None):
+    """
+    Split tenants round-robin into `workers` shards and process each shard in
+    its own process (own DB connection). Returns total services updated.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from django.db import connections
+    from .models import Service
+
+    now = now or timezone.now()
+    if tenant_ids is None:
+        tenant_ids = list(Service.objects.order_by('tenant_id').values_list('tenant_id', flat=True).distinct())
+    shards = [tenant_ids[i::workers] for i in range(workers)]
+    shards = [s for s in shards if s]
+    if len(shards) <= 1:
+        return update_service_intelligence(tenant_ids, now=now)
+
+    # Forked children must not share the parent's open connection
+    connections.close_all()
+    ctx = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx, initializer=_init_worker) as pool:
+        return sum(pool.map(_run_shard, shards, [now] * len(shards)))
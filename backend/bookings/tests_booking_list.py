@@ -0,0 +1,92 @@
+"""
+Booking list endpoint — joined queryset, trimmed list mode and keyset pages.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Booking, Client, Service, Staff
+
+
+class BookingListTest(TestCase):
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='list', business_name='List')
+        self.other = TenantSettings.objects.create(slug='list-other', business_name='Other')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='list')
+        self.start = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.n = 0
+
+    def _book(self, tenant=None, hours=0):
+        tenant = tenant or self.tenant
+        self.n += 1
+        client = Client.objects.create(tenant=tenant, name=f'Client {self.n}', email=f'c{self.n}@list.test', phone='0700')
+        service = Service.objects.create(tenant=tenant, name=f'Service {self.n}', duration_minutes=30, price=Decimal('20.00'))
+        staff = Staff.objects.create(tenant=tenant, name=f'Staff {self.n}', email=f's{self.n}@list.test')
+        start = self.start + timedelta(hours=hours)
+        return Booking.objects.create(
+            tenant=tenant, client=client, service=service, staff=staff,
+            start_time=start, end_time=start + timedelta(minutes=30), status='confirmed',
+        )
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), len(ctx.captured_queries)
+
+    def test_full_list_query_count_is_constant(self):
+        self._book()
+        _, small = self._get('/api/bookings/')
+        for i in range(5):
+            self._book(hours=i)
+        data, large = self._get('/api/bookings/')
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 6)
+        self.assertIn('client_reliability_score', data[0])
+        self.assertEqual(small, large)
+
+    def test_list_mode_fields(self):
+        booking = self._book()
+        data, _ = self._get('/api/bookings/?view=list')
+        row = data['results'][0]
+        self.assertNotIn('client_reliability_score', row)
+        self.assertNotIn('recommended_payment_type', row)
+        self.assertEqual(row['customer_name'], booking.client.name)
+        self.assertEqual(row['staff_name'], booking.staff.name)
+        self.assertEqual(row['price_pence'], 2000)
+        self.assertEqual(row['status'], 'CONFIRMED')
+        self.assertIsNone(data['next'])
+
+    def test_keyset_pages_cover_every_booking_once(self):
+        # Three bookings share each start time, so pages must break ties on id
+        expected = []
+        for hour in range(4):
+            for _ in range(3):
+                expected.append(self._book(hours=hour).id)
+        self._book(tenant=self.other)
+
+        seen, url, queries = [], '/api/bookings/?page_size=5', set()
+        while url:
+            data, count = self._get(url)
+            seen += [row['id'] for row in data['results']]
+            queries.add(count)
+            url = data['next']
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(queries), 1)
+
+        seen, url = [], '/api/bookings/?page_size=4&direction=desc'
+        while url:
+            data, _ = self._get(url)
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(seen, expected[::-1])
+
+    def test_invalid_cursor(self):
+        self._book()
+        self.assertEqual(self.api.get('/api/bookings/?cursor=not-a-cursor').status_code, 404)
@@ -0,0 +1,160 @@
+"""
+Query budgets for the hot booking endpoints.
+
+Each endpoint is called against a fixture big enough that any per-row,
+per-slot or per-day query would blow both the budget and the N+1 detector
+(core.query_budget). Budgets include tenant resolution in middleware.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.query_budget import QueryBudgetExceeded, query_budget
+
+from .models import Booking, Client, Service, Staff, StaffBlock
+
+
+class QueryBudgetFrameworkTest(TestCase):
+
+    def test_budget_and_n_plus_one_report(self):
+        from tenants.models import TenantSettings
+        for i in range(6):
+            TenantSettings.objects.create(slug=f'qb{i}', business_name=f'QB {i}')
+
+        with query_budget(1):
+            TenantSettings.objects.count()
+
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(20, label='loop'):
+                for t in TenantSettings.objects.all():
+                    TenantSettings.objects.filter(pk=t.pk).exists()
+        message = str(ctx.exception)
+        self.assertIn('[loop]', message)
+        self.assertIn('likely N+1', message)
+        self.assertIn('bookings/tests_query_budgets.py:', message)
+
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(0):
+                TenantSettings.objects.count()
+
+    def test_decorator(self):
+        from tenants.models import TenantSettings
+
+        @query_budget(1)
+        def two_queries():
+            TenantSettings.objects.count()
+            TenantSettings.objects.exists()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            two_queries()
+
+
+class BookingEndpointBudgetTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='budget', business_name='Budget')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='budget')
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@budget.test', active=True)
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30,
+                                              price=Decimal('25.00'), active=True)
+        self.clients = [
+            Client.objects.create(tenant=self.tenant, name=f'Client {i}', email=f'c{i}@budget.test', phone='0700',
+                                  reliability_score=40 + i * 5)
+            for i in range(12)
+        ]
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        statuses = ['confirmed', 'completed', 'no_show', 'pending', 'cancelled']
+        for i in range(60):
+            start = now + timedelta(days=i % 20 - 10, hours=i % 6)
+            Booking.objects.create(
+                tenant=self.tenant, client=self.clients[i % 12], service=self.service, staff=self.staff,
+                start_time=start, end_time=start + timedelta(minutes=30), status=statuses[i % 5],
+                risk_level=['LOW', 'HIGH', 'CRITICAL'][i % 3], payment_status='paid' if i % 2 else 'pending',
+            )
+        StaffBlock.objects.create(staff=self.staff, date=date.today() + timedelta(days=3),
+                                  start_time=time(12), end_time=time(13))
+
+    def _get(self, url, budget, label):
+        with query_budget(budget, label=label):
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:300])
+        return response.json()
+
+    def test_available_dates(self):
+        data = self._get(f'/api/bookings/available_dates/?staff_id={self.staff.id}&service_id={self.service.id}',
+                         6, 'available_dates')
+        self.assertEqual(len(data['available_dates']), 30)
+
+    def test_dashboard_summary(self):
+        data = self._get('/api/dashboard-summary/', 22, 'dashboard_summary')
+        self.assertEqual(len(data['client_quadrant']), 12)
+
+    def test_reports_overview(self):
+        data = self._get('/api/reports/overview/', 12, 'reports_overview')
+        self.assertGreater(data['kpi']['total_bookings'], 0)
+
+
+class RestaurantAndGymBudgetTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        from .models_gym import ClassSession, ClassType
+        from .models_restaurant import ServiceWindow, Table
+        self.tenant = TenantSettings.objects.create(slug='venue', business_name='Venue')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='venue')
+        self.day = date.today() + timedelta(days=1)
+        staff = Staff.objects.create(tenant=self.tenant, name='Host', email='host@venue.test', active=True)
+        service = Service.objects.create(tenant=self.tenant, name='Spin', duration_minutes=45,
+                                         price=Decimal('0.00'), active=True)
+        client = Client.objects.create(tenant=self.tenant, name='Guest', email='guest@venue.test', phone='0700')
+
+        for i in range(6):
+            Table.objects.create(tenant=self.tenant, name=f'T{i}', max_seats=4)
+        ServiceWindow.objects.create(tenant=self.tenant, name='Lunch', day_of_week=self.day.weekday(),
+                                     open_time=time(12), close_time=time(15), last_booking_time=time(14),
+                                     turn_time_minutes=90, max_covers=20)
+        ServiceWindow.objects.create(tenant=self.tenant, name='Dinner', day_of_week=self.day.weekday(),
+                                     open_time=time(18), close_time=time(22), last_booking_time=time(21),
+                                     turn_time_minutes=120, max_covers=30)
+        for hour in (12, 13, 18, 19, 19, 20):
+            start = timezone.make_aware(datetime.combine(self.day, time(hour)))
+            Booking.objects.create(tenant=self.tenant, client=client, service=service, staff=staff,
+                                   start_time=start, end_time=start + timedelta(minutes=90),
+                                   status='confirmed', party_size=3)
+
+        spin = ClassType.objects.create(tenant=self.tenant, name='Spin', max_capacity=10)
+        yoga = ClassType.objects.create(tenant=self.tenant, name='Yoga', max_capacity=8)
+        monday = self.day - timedelta(days=self.day.weekday())
+        for dow in range(7):
+            for hour, class_type in ((7, spin), (12, yoga), (18, spin)):
+                ClassSession.objects.create(tenant=self.tenant, class_type=class_type, instructor=staff,
+                                            day_of_week=dow, start_time=time(hour), end_time=time(hour, 45))
+        for n in range(3):
+            start = timezone.make_aware(datetime.combine(monday + timedelta(days=2), time(18)))
+            Booking.objects.create(tenant=self.tenant, client=client, service=service, staff=staff,
+                                   start_time=start, end_time=start + timedelta(minutes=45), status='confirmed')
+
+    def _get(self, url, budget, label):
+        with query_budget(budget, label=label):
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:300])
+        return response.json()
+
+    def test_restaurant_availability(self):
+        data = self._get(f'/api/restaurant-availability/?date={self.day.isoformat()}&party_size=2',
+                         7, 'restaurant_availability')
+        lunch, dinner = data['windows']
+        noon = lunch['slots'][0]
+        self.assertEqual((noon['start_time'], noon['tables_available'], noon['covers_remaining']), ('12:00', 4, 14))
+        seven = next(s for s in dinner['slots'] if s['start_time'] == '19:00')
+        self.assertEqual((seven['tables_available'], seven['covers_remaining']), (2, 18))
+
+    def test_gym_timetable(self):
+        data = self._get(f'/api/gym-timetable/?date={self.day.isoformat()}', 4, 'gym_timetable')
+        self.assertEqual(len(data['sessions']), 21)
+        wednesday_spin = next(s for s in data['sessions'] if s['day_of_week'] == 2 and s['start_time'] == '18:00')
+        self.assertEqual((wednesday_spin['booked'], wednesday_spin['spots_remaining']), (3, 7))
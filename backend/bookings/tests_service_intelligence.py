@@ -0,0 +1,83 @@
+"""
+Service Intelligence — set-based nightly metrics
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Booking, Client, Service, ServiceOptimisationLog, Staff
+from .service_intelligence import run_sharded, update_service_intelligence
+
+
+class UpdateServiceIntelligenceTest(TestCase):
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='intel', business_name='Intel')
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@intel.test')
+        self.clients = [
+            Client.objects.create(tenant=self.tenant, name=f'Client {i}', email=f'c{i}@intel.test', phone='0700')
+            for i in range(2)
+        ]
+        self.service = self._service('Cut', '40.00')
+
+    def _service(self, name, price):
+        return Service.objects.create(tenant=self.tenant, name=name, duration_minutes=60, price=Decimal(price))
+
+    def _book(self, service, status, days_ago, client=0):
+        start = timezone.now().replace(hour=15, minute=0) - timedelta(days=days_ago)
+        return Booking.objects.create(
+            tenant=self.tenant, service=service, staff=self.staff, client=self.clients[client],
+            start_time=start, end_time=start + timedelta(hours=1), status=status,
+        )
+
+    def test_metrics_and_recommendation(self):
+        for days in (1, 2, 3, 40):
+            self._book(self.service, 'completed', days)
+        self._book(self.service, 'no_show', 5, client=1)
+        self._book(self.service, 'completed', 120)  # outside the 90-day window
+
+        self.assertEqual(update_service_intelligence(), 1)
+        svc = Service.objects.get(pk=self.service.pk)
+        self.assertEqual(svc.total_bookings, 5)
+        self.assertEqual(svc.total_revenue, Decimal('160.00'))
+        self.assertEqual(svc.avg_booking_value, Decimal('40.00'))
+        self.assertEqual(svc.no_show_rate, 20.0)
+        self.assertEqual(svc.demand_index, round(4 * 3.3, 1))
+        self.assertEqual(svc.recommended_payment_type, 'full')
+        self.assertEqual(svc.recommendation_snapshot['completed'], 4)
+        log = ServiceOptimisationLog.objects.get(service=svc)
+        self.assertEqual(log.output_recommendation['recommended_deposit'], 100)
+
+    def test_query_count_independent_of_service_count(self):
+        for i in range(5):
+            svc = self._service(f'Service {i}', '10.00')
+            for days in range(4):
+                self._book(svc, 'no_show' if days == 0 else 'completed', days)
+        # services, metrics, repeat clients, then bulk_update + bulk_create in a savepoint
+        with self.assertNumQueries(7):
+            self.assertEqual(update_service_intelligence(), 6)
+
+    def test_service_without_bookings_is_reset(self):
+        Service.objects.filter(pk=self.service.pk).update(total_bookings=9, no_show_rate=50)
+        update_service_intelligence(tenant_ids=[self.tenant.id])
+        svc = Service.objects.get(pk=self.service.pk)
+        self.assertEqual((svc.total_bookings, svc.no_show_rate), (0, 0))
+        self.assertEqual(svc.recommendation_reason, '')
+
+    def test_run_sharded_single_shard_runs_in_process(self):
+        from tenants.models import TenantSettings
+        other = TenantSettings.objects.create(slug='intel-2', business_name='Intel 2')
+        Service.objects.create(tenant=other, name='Colour', duration_minutes=90, price=Decimal('60.00'))
+        self._book(self.service, 'completed', 1)
+
+        # One worker: every tenant in one in-process call
+        self.assertEqual(run_sharded(1), 2)
+        self.assertEqual(Service.objects.get(pk=self.service.pk).total_bookings, 1)
+        # More workers than tenants collapses to one shard — still no process pool
+        later = timezone.now() + timedelta(hours=1)
+        self.assertEqual(run_sharded(4, tenant_ids=[other.id], now=later), 1)
+        stamps = dict(Service.objects.values_list('tenant__slug', 'last_optimised_at'))
+        self.assertEqual(stamps['intel-2'], later)
+        self.assertLess(stamps['intel'], later)
@@ -1,40 +1,25 @@
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from django.utils import timezone
 from .models import Booking, Staff, Service, StaffBlock
 
 
-def generate_time_slots(staff_id, service_id, date, business_hours_start=9, business_hours_end=17):
-    """
-    Generate available time slots for a given staff member, service, and date.
-    Excludes slots that overlap with existing bookings or staff blocks.
-    """
-    try:
-        staff = Staff.objects.get(id=staff_id, active=True)
-        service = Service.objects.get(id=service_id, active=True)
-    except (Staff.DoesNotExist, Service.DoesNotExist):
-        return []
-    
-    # Parse date
-    target_date = datetime.strptime(date, '%Y-%m-%d').date()
-    
-    # Get existing bookings for this staff on this date
+def _day_bounds(target_date):
     start_of_day = timezone.make_aware(datetime.combine(target_date, datetime.min.time()))
     end_of_day = timezone.make_aware(datetime.combine(target_date, datetime.max.time()))
-    
-    existing_bookings = Booking.objects.filter(
-        staff=staff,
-        start_time__gte=start_of_day,
-        start_time__lt=end_of_day,
-        status__in=['pending', 'confirmed']
-    ).order_by('start_time')
-    
-    # Get staff blocks for this date
-    staff_blocks = StaffBlock.objects.filter(staff=staff, date=target_date)
-    
+    return start_of_day, end_of_day
+
+
+def _day_slots(staff, service, target_date, existing_bookings, staff_blocks,
+               business_hours_start=9, business_hours_end=17):
+    """
+    Free slots for one day, given that day's pending/confirmed bookings for the
+    staff member and their StaffBlocks — pure Python, no queries.
+    """
     # If any block is all_day, no slots available
-    if staff_blocks.filter(all_day=True).exists():
+    if any(block.all_day for block in staff_blocks):
         return []
-    
+
     # Generate potential slots
     slots = []
     current_time = timezone.make_aware(
@@ -85,6 +70,43 @@ def generate_time_slots(staff_id, service_id, date, business_hours_start=9, busi
     return slots
 
 
+def _load_staff_and_service(staff_id, service_id):
+    try:
+        return Staff.objects.get(id=staff_id, active=True), Service.objects.get(id=service_id, active=True)
+    except (Staff.DoesNotExist, Service.DoesNotExist):
+        return None, None
+
+
+def _active_bookings(staff, range_start, range_end):
+    return list(Booking.objects.filter(
+        staff=staff,
+        start_time__gte=range_start,
+        start_time__lt=range_end,
+        status__in=['pending', 'confirmed']
+    ).order_by('start_time'))
+
+
+def generate_time_slots(staff_id, service_id, date, business_hours_start=9, business_hours_end=17):
+    """
+    Generate available time slots for a given staff member, service, and date.
+    Excludes slots that overlap with existing bookings or staff blocks.
+    """
+    staff, service = _load_staff_and_service(staff_id, service_id)
+    if staff is None:
+        return []
+    
+    # Parse date
+    target_date = datetime.strptime(date, '%Y-%m-%d').date()
+    
+    # Existing bookings and staff blocks for this staff on this date
+    start_of_day, end_of_day = _day_bounds(target_date)
+    existing_bookings = _active_bookings(staff, start_of_day, end_of_day)
+    staff_blocks = list(StaffBlock.objects.filter(staff=staff, date=target_date))
+    
+    return _day_slots(staff, service, target_date, existing_bookings, staff_blocks,
+                      business_hours_start, business_hours_end)
+
+
 def get_available_dates(staff_id, service_id, days_ahead=30):
     """
     Get list of dates with available slots for the next N days.
@@ -99,12 +121,29 @@ def get_available_dates(staff_id, service_id, days_ahead=30):
     """
     available_dates = []
     today = datetime.now().date()
-    
+    if days_ahead <= 0:
+        return available_dates
+
+    staff, service = _load_staff_and_service(staff_id, service_id)
+    if staff is None:
+        return available_dates
+
+    # Bookings and blocks for the whole window up front, then sliced per day
+    # with the same bounds generate_time_slots uses
+    last_date = today + timedelta(days=days_ahead - 1)
+    bookings = _active_bookings(staff, _day_bounds(today)[0], _day_bounds(last_date)[1])
+    starts = [b.start_time for b in bookings]
+    blocks_by_date = {}
+    for block in StaffBlock.objects.filter(staff=staff, date__gte=today, date__lte=last_date):
+        blocks_by_date.setdefault(block.date, []).append(block)
+
     for day_offset in range(days_ahead):
         check_date = today + timedelta(days=day_offset)
         date_str = check_date.strftime('%Y-%m-%d')
         
-        slots = generate_time_slots(staff_id, service_id, date_str)
+        start_of_day, end_of_day = _day_bounds(check_date)
+        day_bookings = bookings[bisect_left(starts, start_of_day):bisect_left(starts, end_of_day)]
+        slots = _day_slots(staff, service, check_date, day_bookings, blocks_by_date.get(check_date, []))
         if slots:
             available_dates.append({
                 'date': date_str,
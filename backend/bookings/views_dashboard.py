@@ -3,10 +3,11 @@ Phase 7 — Dashboard Intelligence API (Visual Dashboard v2)
 GET /api/dashboard-summary/
 POST /api/backfill-sbe/
 """
-from datetime import timedelta
+from datetime import timedelta, timezone as dt_timezone
 from decimal import Decimal
 from django.utils import timezone
 from django.db.models import Sum, Count, Q, F, Avg
+from django.db.models.functions import ExtractHour, ExtractWeekDay
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -38,7 +39,7 @@ def _revenue_breakdown(today_start, week_end):
         start_time__gte=today_start,
         start_time__lt=week_end,
         status__in=['confirmed', 'completed', 'pending']
-    ).select_related('service')
+    ).select_related('service', 'client')
 
     total = Decimal('0')
     secured = Decimal('0')
@@ -87,14 +88,13 @@ def _revenue_breakdown(today_start, week_end):
 def _client_quadrant():
     """Build client quadrant data: reliability vs booking frequency."""
     ninety_days_ago = timezone.now() - timedelta(days=90)
-    clients = Client.objects.all()
+    clients = Client.objects.annotate(freq=Count('bookings', filter=Q(
+        bookings__start_time__gte=ninety_days_ago,
+        bookings__status__in=['confirmed', 'completed'],
+    )))
     points = []
     for c in clients:
-        freq = Booking.objects.filter(
-            client=c,
-            start_time__gte=ninety_days_ago,
-            status__in=['confirmed', 'completed']
-        ).count()
+        freq = c.freq
         rel = c.reliability_score or 0
 
         if rel >= 60 and freq >= 2:
@@ -131,10 +131,9 @@ def _demand_calendar():
             start_time__gte=thirty_days_ago,
             status__in=['confirmed', 'completed', 'no_show']
         )
-        .extra(select={
-            'hour': 'EXTRACT(hour FROM start_time)',
-            'dow': 'EXTRACT(dow FROM start_time)',
-        })
+        # ExtractWeekDay is 1=Sunday..7=Saturday; the grid keeps Postgres dow (0=Sunday)
+        .annotate(hour=ExtractHour('start_time', tzinfo=dt_timezone.utc),
+                  dow=ExtractWeekDay('start_time', tzinfo=dt_timezone.utc) - 1)
         .values('hour', 'dow')
         .annotate(
             total=Count('id'),
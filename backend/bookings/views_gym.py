@@ -6,7 +6,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from core.content_version import conditional_content
 from django.db.models import Count, Q
+from django.db.models.functions import TruncDate, TruncTime
 
 from .models_gym import ClassType, ClassSession
 from .models import Booking
@@ -88,13 +90,19 @@ def gym_timetable(request):
         tenant=tenant, active=True
     ).select_related('class_type', 'instructor')
 
-    # Get bookings for this week to compute spots remaining
-    week_bookings = Booking.objects.filter(
-        tenant=tenant,
-        start_time__date__gte=monday,
-        start_time__date__lte=sunday,
-        status__in=['confirmed', 'pending'],
-    )
+    # Booking counts for this week in one grouped query, keyed the way sessions
+    # are matched: booking date, start time and class_type service name
+    week_counts = {
+        (row['day'], row['at'], row['service__name']): row['n']
+        for row in Booking.objects.filter(
+            tenant=tenant,
+            start_time__date__gte=monday,
+            start_time__date__lte=sunday,
+            status__in=['confirmed', 'pending'],
+        ).annotate(
+            day=TruncDate('start_time'), at=TruncTime('start_time'),
+        ).values('day', 'at', 'service__name').annotate(n=Count('id')).order_by()
+    }
 
     result = []
     for session in sessions:
@@ -102,12 +110,7 @@ def gym_timetable(request):
         session_date = monday + timedelta(days=session.day_of_week)
 
         # Count bookings for this specific session on this date
-        # Match by class_type service name and time
-        booked_count = week_bookings.filter(
-            start_time__date=session_date,
-            start_time__time=session.start_time,
-            service__name=session.class_type.name,
-        ).count()
+        booked_count = week_counts.get((session_date, session.start_time, session.class_type.name), 0)
 
         capacity = session.capacity
         spots_remaining = max(0, capacity - booked_count)
@@ -149,6 +152,7 @@ def gym_timetable(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
 def gym_class_types(request):
     """
     GET /api/bookings/gym-class-types/
@@ -73,27 +73,34 @@ def reports_overview(request):
     """GET /api/reports/overview/ — KPI summary + revenue time series + risk distribution + service breakdown"""
     qs, date_from, date_to = _base_qs(request)
 
-    total = qs.count()
-    completed = qs.filter(status__in=['completed', 'confirmed']).count()
-    no_shows = qs.filter(status='no_show').count()
-    cancelled = qs.filter(status='cancelled').count()
+    # Counts and sums in one pass
+    booked = Q(status__in=['completed', 'confirmed'])
+    at_risk = Q(risk_level__in=['HIGH', 'CRITICAL'], status__in=['confirmed', 'pending'])
+    kpi = qs.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=booked),
+        no_shows=Count('id', filter=Q(status='no_show')),
+        cancelled=Count('id', filter=Q(status='cancelled')),
+        revenue=Sum('service__price', filter=booked),
+        revenue_at_risk=Sum('revenue_at_risk', filter=at_risk),
+        deposits=Sum('payment_amount', filter=Q(payment_status='paid')),
+        avg_risk=Avg('risk_score'),
+    )
+    total = kpi['total']
+    completed = kpi['completed']
+    no_shows = kpi['no_shows']
+    cancelled = kpi['cancelled']
     ns_rate = round(no_shows / total * 100, 1) if total > 0 else 0
 
-    revenue = float(qs.filter(status__in=['completed', 'confirmed']).aggregate(
-        t=Sum('service__price'))['t'] or 0)
-    revenue_at_risk = float(qs.filter(
-        risk_level__in=['HIGH', 'CRITICAL'],
-        status__in=['confirmed', 'pending']
-    ).aggregate(t=Sum('revenue_at_risk'))['t'] or 0)
-
-    deposits = float(qs.filter(payment_status='paid').aggregate(
-        t=Sum('payment_amount'))['t'] or 0)
+    revenue = float(kpi['revenue'] or 0)
+    revenue_at_risk = float(kpi['revenue_at_risk'] or 0)
+    deposits = float(kpi['deposits'] or 0)
 
     # Average reliability + risk
     client_ids = list(qs.values_list('client_id', flat=True).distinct())
     clients = Client.objects.filter(id__in=client_ids)
     avg_reliability = float(clients.aggregate(a=Avg('reliability_score'))['a'] or 0)
-    avg_risk = float(qs.exclude(risk_score__isnull=True).aggregate(a=Avg('risk_score'))['a'] or 0)
+    avg_risk = float(kpi['avg_risk'] or 0)
 
     # Repeat client %
     client_booking_counts = qs.values('client_id').annotate(cnt=Count('id'))
@@ -6,7 +6,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Sum
+from django.utils import timezone
 
 from .models_restaurant import Table, ServiceWindow
 from .models import Booking
@@ -94,12 +94,16 @@ def restaurant_availability(request):
     if not suitable_tables.exists():
         return Response({'windows': [], 'message': 'No tables available for this party size'})
 
-    # Get existing bookings for this date (use start_time__date since Booking has no date field)
-    existing_bookings = Booking.objects.filter(
-        tenant=tenant,
-        start_time__date=target_date,
-        status__in=['confirmed', 'pending'],
-    )
+    # Existing bookings for this date (use start_time__date since Booking has no date field),
+    # loaded once as local start/end times; each slot's overlap check runs in Python
+    existing_bookings = [
+        (timezone.localtime(start).time(), timezone.localtime(end).time(), party or 0)
+        for start, end, party in Booking.objects.filter(
+            tenant=tenant,
+            start_time__date=target_date,
+            status__in=['confirmed', 'pending'],
+        ).values_list('start_time', 'end_time', 'party_size')
+    ]
 
     total_tables = suitable_tables.count()
     result_windows = []
@@ -118,22 +122,19 @@ def restaurant_availability(request):
             slot_end_dt = slot_start_dt + timedelta(minutes=turn_minutes)
             slot_end_time = slot_end_dt.time()
 
-            # Count overlapping bookings: a booking overlaps if it starts before slot ends
+            # Overlapping bookings: a booking overlaps if it starts before slot ends
             # and ends after slot starts
-            overlapping_bookings = existing_bookings.filter(
-                start_time__date=target_date,
-                start_time__time__lt=slot_end_time,
-                end_time__time__gt=current_time,
-            )
+            overlapping = [
+                party for start, end, party in existing_bookings
+                if start < slot_end_time and end > current_time
+            ]
 
             # Count booked tables (each booking uses one table)
-            booked_count = overlapping_bookings.count()
+            booked_count = len(overlapping)
             available_tables = max(0, total_tables - booked_count)
 
             # Check total covers in this window
-            total_covers_booked = overlapping_bookings.aggregate(
-                total=Sum('party_size')
-            )['total'] or 0
+            total_covers_booked = sum(overlapping)
             covers_remaining = window.max_covers - total_covers_booked
 
             has_capacity = available_tables > 0 and covers_remaining >= party_size
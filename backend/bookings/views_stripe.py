@@ -219,6 +219,9 @@ def stripe_webhook(request):
     except (ValueError, stripe.error.SignatureVerificationError):
         return HttpResponse(status=400)
     
+    if event['type'] in ('checkout.session.completed', 'checkout.session.expired'):
+        _handle_shop_session(event['type'], event['data']['object'])
+
     if event['type'] == 'checkout.session.completed':
         session = event['data']['object']
         booking_id = session.get('metadata', {}).get('booking_id')
@@ -291,3 +294,19 @@ def stripe_webhook(request):
                 pass
     
     return HttpResponse(status=200)
+
+
+def _handle_shop_session(event_type, session):
+    """Shop checkouts: payment turns the stock hold into a sale; expiry gives the stock back."""
+    shop_order_id = session.get('metadata', {}).get('shop_order_id')
+    if not shop_order_id:
+        return
+    from shop import stock
+    from shop.models import Order as ShopOrder
+    order = ShopOrder.objects.filter(id=shop_order_id, stripe_session_id=session.get('id', '')).first()
+    if order is None:
+        return
+    if event_type == 'checkout.session.completed':
+        stock.confirm(order, session.get('payment_intent') or '')
+    else:
+        stock.release(order)
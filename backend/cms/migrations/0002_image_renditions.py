@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_renditions',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies (core.images)', null=True),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='hero_image_renditions',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies (core.images)', null=True),
+        ),
+        migrations.AddField(
+            model_name='pageimage',
+            name='image_renditions',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies (core.images)', null=True),
+        ),
+    ]
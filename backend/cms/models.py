@@ -10,6 +10,7 @@ class Page(models.Model):
     slug = models.SlugField(max_length=200, help_text='URL-friendly identifier, e.g. "about" or "home"')
     content = models.TextField(blank=True, default='', help_text='Rich HTML content for the page body')
     hero_image = models.ImageField(upload_to='cms/heroes/%Y/%m/', null=True, blank=True)
+    hero_image_renditions = models.JSONField(null=True, blank=True, editable=False, help_text='Resized copies (core.images)')
     hero_headline = models.CharField(max_length=300, blank=True, default='')
     hero_subheadline = models.CharField(max_length=500, blank=True, default='')
     meta_title = models.CharField(max_length=200, blank=True, default='', help_text='SEO title (falls back to title)')
@@ -37,6 +38,7 @@ class PageImage(models.Model):
     """Image attached to a CMS page (for galleries, inline images, etc.)."""
     page = models.ForeignKey(Page, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='cms/pages/%Y/%m/')
+    image_renditions = models.JSONField(null=True, blank=True, editable=False, help_text='Resized copies (core.images)')
     alt_text = models.CharField(max_length=300, blank=True, default='')
     caption = models.CharField(max_length=500, blank=True, default='')
     sort_order = models.IntegerField(default=0)
@@ -62,6 +64,7 @@ class BlogPost(models.Model):
     excerpt = models.TextField(max_length=500, blank=True, default='', help_text='Short summary shown in listings')
     content = models.TextField(blank=True, default='', help_text='Rich HTML content')
     featured_image = models.ImageField(upload_to='cms/blog/%Y/%m/', null=True, blank=True)
+    featured_image_renditions = models.JSONField(null=True, blank=True, editable=False, help_text='Resized copies (core.images)')
     featured_image_alt = models.CharField(max_length=300, blank=True, default='')
     author_name = models.CharField(max_length=200, blank=True, default='')
     category = models.CharField(max_length=100, blank=True, default='')
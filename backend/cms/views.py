@@ -2,6 +2,8 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
+from core.images import srcset
+from core.content_version import conditional_content
 from rest_framework import status, serializers
 from django.db import IntegrityError
 from django.utils import timezone
@@ -10,12 +12,21 @@ from .models import Page, PageImage, BlogPost
 
 # ── Serializers ──────────────────────────────────────────────
 
+def _srcset(serializer, field_file, renditions):
+    request = serializer.context.get('request')
+    return srcset(field_file, renditions, request.build_absolute_uri if request else None)
+
+
 class PageImageSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PageImage
-        fields = ['id', 'url', 'alt_text', 'caption', 'sort_order']
+        fields = ['id', 'url', 'srcset', 'alt_text', 'caption', 'sort_order']
+
+    def get_srcset(self, obj):
+        return _srcset(self, obj.image, obj.image_renditions)
 
     def get_url(self, obj):
         if obj.image:
@@ -29,10 +40,11 @@ class PageImageSerializer(serializers.ModelSerializer):
 class PageSerializer(serializers.ModelSerializer):
     images = PageImageSerializer(many=True, read_only=True)
     hero_image_url = serializers.SerializerMethodField()
+    hero_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Page
-        fields = ['id', 'title', 'slug', 'content', 'hero_image_url',
+        fields = ['id', 'title', 'slug', 'content', 'hero_image_url', 'hero_image_srcset',
                   'hero_headline', 'hero_subheadline',
                   'meta_title', 'meta_description',
                   'is_published', 'sort_order', 'show_in_nav',
@@ -46,14 +58,18 @@ class PageSerializer(serializers.ModelSerializer):
             return obj.hero_image.url
         return None
 
+    def get_hero_image_srcset(self, obj):
+        return _srcset(self, obj.hero_image, obj.hero_image_renditions)
+
 
 class BlogPostSerializer(serializers.ModelSerializer):
     featured_image_url = serializers.SerializerMethodField()
+    featured_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogPost
         fields = ['id', 'title', 'slug', 'excerpt', 'content',
-                  'featured_image_url', 'featured_image_alt',
+                  'featured_image_url', 'featured_image_srcset', 'featured_image_alt',
                   'author_name', 'category', 'tags',
                   'status', 'meta_title', 'meta_description',
                   'published_at', 'created_at', 'updated_at']
@@ -66,6 +82,9 @@ class BlogPostSerializer(serializers.ModelSerializer):
             return obj.featured_image.url
         return None
 
+    def get_featured_image_srcset(self, obj):
+        return _srcset(self, obj.featured_image, obj.featured_image_renditions)
+
 
 # ── CMS Page Views ───────────────────────────────────────────
 
@@ -82,6 +101,7 @@ def page_list(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
 def public_pages(request):
     """Public: list published pages for navigation."""
     tenant = getattr(request, 'tenant', None)
@@ -93,6 +113,7 @@ def public_pages(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
 def public_page_detail(request, slug):
     """Public: get a single published page by slug."""
     tenant = getattr(request, 'tenant', None)
@@ -214,6 +235,7 @@ def blog_list(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
 def public_blog_list(request):
     """Public: list published blog posts."""
     tenant = getattr(request, 'tenant', None)
@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from compliance.models import PeaceOfMindScore, ScoreAuditLog
+from compliance.models import PeaceOfMindScore
 
 
 class Command(BaseCommand):
@@ -16,13 +16,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         trigger = options['trigger']
-        result = PeaceOfMindScore.recalculate()
-
-        # Update the audit log trigger type for the most recent entry
-        latest_log = ScoreAuditLog.objects.order_by('-calculated_at').first()
-        if latest_log:
-            latest_log.trigger = trigger
-            latest_log.save(update_fields=['trigger'])
+        result = PeaceOfMindScore.recalculate(trigger=trigger)
 
         self.stdout.write(self.style.SUCCESS(
             f'Peace of Mind Score: {result.score}% '
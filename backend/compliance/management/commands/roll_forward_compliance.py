@@ -0,0 +1,74 @@
+"""
+Management command to roll compliance item statuses forward as dates pass.
+Recomputes COMPLIANT / DUE_SOON / OVERDUE in bulk and rescores affected tenants once.
+
+Usage:
+    python manage.py roll_forward_compliance                 # Run once (all tenants)
+    python manage.py roll_forward_compliance --tenant salon-x
+    python manage.py roll_forward_compliance --loop          # Run continuously (for Railway)
+"""
+import time
+import logging
+from django.core.management.base import BaseCommand
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Default: check once an hour so statuses flip shortly after midnight
+DEFAULT_INTERVAL_MINUTES = 60
+
+
+class Command(BaseCommand):
+    help = 'Bulk-update compliance item statuses from their dates and rescore affected tenants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Only roll forward items for this tenant slug')
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run continuously in a loop (for Railway background worker)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=None,
+            help='Interval in minutes between runs (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        from compliance.rollforward import roll_forward_statuses
+
+        tenant = None
+        if options.get('tenant'):
+            from tenants.models import TenantSettings
+            tenant = TenantSettings.objects.filter(slug=options['tenant']).first()
+            if not tenant:
+                self.stderr.write(f"Tenant '{options['tenant']}' not found")
+                return
+
+        loop = options['loop']
+        interval = options['interval'] or getattr(settings, 'COMPLIANCE_ROLLFORWARD_INTERVAL_MINUTES', DEFAULT_INTERVAL_MINUTES)
+
+        if loop:
+            self.stdout.write(self.style.SUCCESS(
+                f'[COMPLIANCE-ROLLFORWARD] Starting roll-forward loop (every {interval} minutes)'
+            ))
+            while True:
+                try:
+                    result = roll_forward_statuses(tenant=tenant)
+                    if result['updated']:
+                        self.stdout.write(self.style.SUCCESS(
+                            f"[COMPLIANCE-ROLLFORWARD] {result['updated']} items updated, "
+                            f"{len(result['tenants'])} tenant(s) rescored"
+                        ))
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f'[COMPLIANCE-ROLLFORWARD] Error: {e}'))
+                    logger.exception('[COMPLIANCE-ROLLFORWARD] Unhandled error in roll-forward loop')
+
+                time.sleep(interval * 60)
+        else:
+            result = roll_forward_statuses(tenant=tenant)
+            self.stdout.write(self.style.SUCCESS(
+                f"Compliance roll-forward — {result['updated']} items updated, "
+                f"{len(result['tenants'])} tenant(s) rescored"
+            ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0007_scoreauditlog_tenant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incidentphoto',
+            name='image_renditions',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies (core.images)', null=True),
+        ),
+    ]
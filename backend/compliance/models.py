@@ -32,6 +32,7 @@ class IncidentReport(models.Model):
 class IncidentPhoto(models.Model):
     incident = models.ForeignKey(IncidentReport, on_delete=models.CASCADE, related_name='photos')
     image = models.ImageField(upload_to='compliance/incidents/%Y/%m/')
+    image_renditions = models.JSONField(null=True, blank=True, editable=False, help_text='Resized copies (core.images)')
     caption = models.CharField(max_length=255, blank=True, default='')
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -480,7 +481,7 @@ class PeaceOfMindScore(models.Model):
         return 'red'
 
     @classmethod
-    def recalculate(cls, tenant=None):
+    def recalculate(cls, tenant=None, trigger='auto'):
         """
         Core scoring algorithm (tenant-scoped):
         Total possible weight = sum(all item weights)
@@ -548,13 +549,14 @@ class PeaceOfMindScore(models.Model):
 
         # Log the recalculation
         ScoreAuditLog.objects.create(
+            tenant=tenant,
             score=new_score,
             previous_score=obj.previous_score if not created else 0,
             total_items=len(items),
             compliant_count=compliant,
             due_soon_count=due_soon,
             overdue_count=overdue,
-            trigger='auto',
+            trigger=trigger,
         )
 
         # Update ComplianceCategory scores based on their items
@@ -579,6 +581,7 @@ class ScoreAuditLog(models.Model):
         ('scheduled', 'Scheduled (daily)'),
     ]
 
+    tenant = models.ForeignKey('tenants.TenantSettings', on_delete=models.CASCADE, null=True, blank=True, related_name='score_audit_logs')
     score = models.IntegerField()
     previous_score = models.IntegerField()
     total_items = models.IntegerField()
@@ -0,0 +1,85 @@
+"""
+Compliance Status Roll-Forward
+
+ComplianceItem.status is only recomputed inside save(), so it goes stale as
+dates pass. This engine rolls every item forward in bulk:
+
+- The compute_status() rules are expressed as one SQL CASE over
+  expiry_date / next_due_date / last_completed_date. The per-item
+  reminder_days window is handled by one WHEN branch per distinct
+  reminder_days value, each compared against a literal cutoff date.
+- A single UPDATE … SET status = CASE … touches only rows whose stored
+  status differs from the computed one (updated_at is bumped with it).
+- Each affected tenant's Peace of Mind Score is recalculated once, instead
+  of once per item through the post_save signal.
+
+Run nightly via `manage.py roll_forward_compliance` (or `--loop`).
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, CharField, Q, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _within_window(field, today, windows):
+    """`field` falls within its item's reminder_days window (and is not past)."""
+    match = Q()
+    for days in windows:
+        match |= Q(reminder_days=days, **{f'{field}__lte': today + timedelta(days=days)})
+    return match
+
+
+def status_expression(today, windows):
+    """SQL equivalent of ComplianceItem.compute_status() for the given day."""
+    return Case(
+        # Check expiry_date first (e.g. insurance renewal)
+        When(expiry_date__lt=today, then=Value('OVERDUE')),
+        When(_within_window('expiry_date', today, windows), then=Value('DUE_SOON')),
+        # Then check next_due_date (recurring compliance)
+        When(next_due_date__lt=today, then=Value('OVERDUE')),
+        When(_within_window('next_due_date', today, windows), then=Value('DUE_SOON')),
+        # If neither date is set, item is missing (not yet done)
+        When(
+            next_due_date__isnull=True, expiry_date__isnull=True, last_completed_date__isnull=True,
+            then=Value('OVERDUE'),
+        ),
+        default=Value('COMPLIANT'),
+        output_field=CharField(),
+    )
+
+
+def roll_forward_statuses(tenant=None, today=None, recalculate=True):
+    """
+    Bring every stored ComplianceItem.status up to date for `today`.
+
+    Returns {'updated': rows changed, 'tenants': [tenant ids rescored]}.
+    """
+    from tenants.models import TenantSettings
+    from .models import ComplianceItem, PeaceOfMindScore
+
+    today = today or timezone.now().date()
+    items = ComplianceItem.objects.all()
+    if tenant is not None:
+        items = items.filter(category__tenant=tenant)
+
+    windows = sorted(set(items.values_list('reminder_days', flat=True)))
+    if not windows:
+        return {'updated': 0, 'tenants': []}
+    status = status_expression(today, windows)
+    stale = items.exclude(status=status)
+
+    with transaction.atomic():
+        tenant_ids = sorted(set(stale.values_list('category__tenant_id', flat=True)))
+        if not tenant_ids:
+            return {'updated': 0, 'tenants': []}
+        updated = stale.update(status=status, updated_at=timezone.now())
+
+    if recalculate:
+        for t in TenantSettings.objects.filter(id__in=tenant_ids):
+            PeaceOfMindScore.recalculate(tenant=t, trigger='scheduled')
+    logger.info('[COMPLIANCE] Rolled forward %d item statuses across %d tenant(s)', updated, len(tenant_ids))
+    return {'updated': updated, 'tenants': tenant_ids}
@@ -0,0 +1,155 @@
+"""
+Compliance Summary Service
+
+Shared by dashboard_v2 and wiggum. Both used to load every item for the
+tenant and bucket them in Python, then run extra counts on top.
+
+- All bucket counts come from ONE conditional-aggregate query.
+- Item details are fetched only for the buckets the caller asks for, each
+  already in display order (priority ordering is a SQL CASE).
+- The result is cached per tenant, keyed on the latest item updated_at and
+  the item count (so edits, additions and deletions all miss), plus today's
+  date because the time-horizon buckets are date-relative.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, Count, ExpressionWrapper, IntegerField, Max, Q, Value, When
+from django.utils import timezone
+
+CACHE_PREFIX = 'compliance-summary'
+CACHE_TIMEOUT = 60 * 60
+
+HORIZON_BUCKETS = ('overdue', 'next_7', 'next_30', 'next_90')
+ORDERED_BUCKETS = ('priority', 'actions', 'sorted')
+
+
+def bucket_filters(today):
+    """Named item buckets as Q objects. Horizon buckets are by next_due_date."""
+    week_ago = today - timedelta(days=7)
+    no_document = Q(document='') | Q(document__isnull=True)
+    return {
+        # Time horizon (mutually exclusive)
+        'overdue': Q(next_due_date__lt=today),
+        'next_7': Q(next_due_date__gte=today, next_due_date__lte=today + timedelta(days=7)),
+        'next_30': Q(next_due_date__gt=today + timedelta(days=7), next_due_date__lte=today + timedelta(days=30)),
+        'next_90': Q(next_due_date__gt=today + timedelta(days=30), next_due_date__lte=today + timedelta(days=90)),
+        # Status
+        'overdue_legal': Q(status='OVERDUE', item_type='LEGAL'),
+        'overdue_bp': Q(status='OVERDUE', item_type='BEST_PRACTICE'),
+        'due_soon': Q(status='DUE_SOON'),
+        'compliant': Q(status='COMPLIANT'),
+        'missing': Q(status='OVERDUE', last_completed_date__isnull=True) & no_document,
+        'due_14_legal': Q(status='DUE_SOON', item_type='LEGAL', next_due_date__lte=today + timedelta(days=14)),
+        # Anything with a priority score, or not compliant
+        'priority': (
+            Q(item_type='LEGAL', status='OVERDUE')
+            | Q(item_type='LEGAL', next_due_date__lte=today + timedelta(days=14))
+            | Q(item_type='BEST_PRACTICE', status='OVERDUE')
+            | Q(item_type='BEST_PRACTICE', next_due_date__lte=today + timedelta(days=30))
+            | ~Q(status='COMPLIANT')
+        ),
+        # Recently sorted
+        'completed_today': Q(last_completed_date=today),
+        'completed_week': Q(last_completed_date__gte=week_ago, last_completed_date__lt=today),
+    }
+
+
+def priority_expression(today):
+    """Priority score: legal overdue 50, legal due ≤14d 30, BP overdue 20, BP due ≤30d 10."""
+    return Case(
+        When(item_type='LEGAL', status='OVERDUE', then=Value(50)),
+        When(item_type='LEGAL', next_due_date__lte=today + timedelta(days=14), then=Value(30)),
+        When(item_type='BEST_PRACTICE', status='OVERDUE', then=Value(20)),
+        When(item_type='BEST_PRACTICE', next_due_date__lte=today + timedelta(days=30), then=Value(10)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _items(tenant):
+    from .models import ComplianceItem
+    return ComplianceItem.objects.filter(category__tenant=tenant)
+
+
+def bucket_counts(tenant, today):
+    """Every bucket count plus the total in one query."""
+    filters = bucket_filters(today)
+    aggregates = {name: Count('id', filter=q) for name, q in filters.items()}
+    return _items(tenant).aggregate(total=Count('id'), **aggregates)
+
+
+def bucket_items(tenant, buckets, today):
+    """
+    {bucket: [items in display order]} with category loaded. Plain filter
+    buckets share one query (a boolean flag per bucket); the ordered views
+    'priority', 'actions' and 'sorted' are one query each.
+    """
+    filters = bucket_filters(today)
+    qs = _items(tenant).select_related('category')
+    result = {}
+
+    plain = [b for b in buckets if b in filters and b not in ORDERED_BUCKETS]
+    if plain:
+        flags = {f'in_{b}': ExpressionWrapper(filters[b], output_field=BooleanField()) for b in plain}
+        match = Q()
+        for b in plain:
+            match |= filters[b]
+        rows = list(qs.filter(match).annotate(**flags))
+        for b in plain:
+            result[b] = [item for item in rows if getattr(item, f'in_{b}')]
+
+    if 'priority' in buckets:
+        result['priority'] = list(
+            qs.filter(filters['priority'])
+            .annotate(priority_score=priority_expression(today))
+            .order_by('-priority_score', 'category', 'item_type', 'title')
+        )
+    if 'actions' in buckets:
+        # Overdue legal first, then overdue best practice, then due soon
+        rank = Case(
+            When(status='OVERDUE', item_type='LEGAL', then=Value(0)),
+            When(status='OVERDUE', item_type='BEST_PRACTICE', then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+        result['actions'] = list(
+            qs.filter(filters['overdue_legal'] | filters['overdue_bp'] | filters['due_soon'])
+            .annotate(action_rank=rank)
+            .order_by('action_rank', 'category', 'item_type', 'title')
+        )
+    if 'sorted' in buckets:
+        result['sorted'] = list(qs.filter(filters['completed_today'] | filters['completed_week']))
+    return result
+
+
+def summary_version(tenant):
+    """Cheap cache-key input: (latest updated_at, item count)."""
+    row = _items(tenant).aggregate(latest=Max('updated_at'), n=Count('id'))
+    latest = row['latest'].isoformat() if row['latest'] else '-'
+    return f"{latest}:{row['n']}"
+
+
+def compliance_summary(tenant, buckets=(), today=None):
+    """
+    {'today', 'counts': {bucket: n, 'total': n}, 'items': {bucket: [ComplianceItem]}}
+
+    `buckets` names the item lists wanted: any key of bucket_filters(), or
+    'priority' (priority-ordered, with .priority_score), 'actions' (wiggum
+    action order) or 'sorted' (completed today / this week).
+    """
+    today = today or timezone.now().date()
+    buckets = tuple(sorted(set(buckets)))
+    tenant_key = getattr(tenant, 'pk', None)
+    key = f"{CACHE_PREFIX}:{tenant_key}:{today.isoformat()}:{summary_version(tenant)}:{','.join(buckets)}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = {
+        'today': today,
+        'counts': bucket_counts(tenant, today),
+        'items': bucket_items(tenant, buckets, today) if buckets else {},
+    }
+    cache.set(key, result, CACHE_TIMEOUT)
+    return result
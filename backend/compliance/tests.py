@@ -2,6 +2,8 @@
 Phase 8: Compliance Intelligence test scenarios.
 Tests the Peace of Mind Score calculation engine.
 """
+from datetime import timedelta
+
 from django.test import TestCase
 from .models import ComplianceCategory, ComplianceItem, PeaceOfMindScore, ScoreAuditLog
 
@@ -160,3 +162,98 @@ class PeaceOfMindScoreTests(TestCase):
         self.cat_fire.refresh_from_db()
         # Fire Safety has 2 LEGAL items: 1 compliant (2), 1 overdue (0) = 2/4 = 50% of max_score 10 = 5
         self.assertEqual(self.cat_fire.current_score, 5)
+
+
+class StatusRollForwardTests(TestCase):
+    """Bulk roll-forward must agree with ComplianceItem.compute_status()."""
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='rollforward', business_name='Roll Forward')
+        self.cat = ComplianceCategory.objects.create(tenant=self.tenant, name='Fire Safety', max_score=10)
+
+    def test_matches_compute_status_and_touches_only_stale_rows(self):
+        from datetime import date, timedelta
+        from compliance.rollforward import roll_forward_statuses
+        from core.bulk_seed import compliance_score_signals, muted_signals
+
+        today = date.today()
+        offsets = [None, -40, -1, 0, 5, 14, 29, 30, 31, 90]
+        i = 0
+        with muted_signals(*compliance_score_signals()):
+            for expiry in offsets:
+                for due in offsets:
+                    for reminder in (14, 30):
+                        ComplianceItem.objects.create(
+                            title=f'Item {i}', category=self.cat, reminder_days=reminder,
+                            expiry_date=today + timedelta(days=expiry) if expiry is not None else None,
+                            next_due_date=today + timedelta(days=due) if due is not None else None,
+                            last_completed_date=today - timedelta(days=400) if i % 3 else None,
+                        )
+                        i += 1
+        # Simulate statuses gone stale
+        ComplianceItem.objects.filter(pk__in=ComplianceItem.objects.filter(status='OVERDUE').values('pk')[:20]).update(status='COMPLIANT')
+        ComplianceItem.objects.filter(status='DUE_SOON').update(status='OVERDUE')
+        expected = {item.pk: item.compute_status() for item in ComplianceItem.objects.all()}
+        stale = sum(1 for item in ComplianceItem.objects.all() if item.status != expected[item.pk])
+        self.assertGreater(stale, 0)
+
+        logs_before = ScoreAuditLog.objects.count()
+        result = roll_forward_statuses()
+        self.assertEqual(result, {'updated': stale, 'tenants': [self.tenant.id]})
+        for item in ComplianceItem.objects.all():
+            self.assertEqual(item.status, expected[item.pk], f'{item.title}: {item.expiry_date} / {item.next_due_date}')
+        # One rescore for the tenant, not one per item
+        self.assertEqual(ScoreAuditLog.objects.count(), logs_before + 1)
+        self.assertEqual(ScoreAuditLog.objects.first().trigger, 'scheduled')
+
+        self.assertEqual(roll_forward_statuses(), {'updated': 0, 'tenants': []})
+        self.assertEqual(ScoreAuditLog.objects.count(), logs_before + 1)
+
+
+class ComplianceSummaryTests(TestCase):
+    """Shared dashboard_v2 / wiggum summary: one aggregate, cached per tenant."""
+
+    def setUp(self):
+        from datetime import date, timedelta
+        from django.core.cache import cache
+        from tenants.models import TenantSettings
+        cache.clear()
+        self.today = date.today()
+        self.tenant = TenantSettings.objects.create(slug='summary', business_name='Summary')
+        self.cat = ComplianceCategory.objects.create(tenant=self.tenant, name='Fire Safety', max_score=10)
+        for title, item_type, days in [
+            ('Fire risk assessment', 'LEGAL', -3),
+            ('Alarm test', 'LEGAL', 5),
+            ('Drill', 'BEST_PRACTICE', 20),
+            ('Signage review', 'BEST_PRACTICE', 200),
+        ]:
+            ComplianceItem.objects.create(
+                title=title, category=self.cat, item_type=item_type,
+                next_due_date=self.today + timedelta(days=days), last_completed_date=self.today - timedelta(days=1),
+            )
+
+    def test_counts_and_priority_order(self):
+        from compliance.summary import compliance_summary
+        summary = compliance_summary(self.tenant, buckets=['priority', 'next_7'])
+        counts = summary['counts']
+        self.assertEqual((counts['total'], counts['overdue'], counts['next_7'], counts['next_30']), (4, 1, 1, 1))
+        self.assertEqual((counts['overdue_legal'], counts['due_14_legal'], counts['due_soon']), (1, 1, 2))
+        self.assertEqual([i.title for i in summary['items']['next_7']], ['Alarm test'])
+        self.assertEqual(
+            [(i.title, i.priority_score) for i in summary['items']['priority']],
+            [('Fire risk assessment', 50), ('Alarm test', 30), ('Drill', 10)],
+        )
+        self.assertNotIn('overdue', summary['items'])
+
+    def test_cached_until_an_item_changes(self):
+        from compliance.summary import compliance_summary
+        compliance_summary(self.tenant, buckets=['actions'])
+        with self.assertNumQueries(1):  # version lookup only
+            compliance_summary(self.tenant, buckets=['actions'])
+        item = ComplianceItem.objects.get(title='Fire risk assessment')
+        item.next_due_date = self.today + timedelta(days=365)
+        item.save()
+        summary = compliance_summary(self.tenant, buckets=['actions'])
+        self.assertEqual(summary['counts']['overdue_legal'], 0)
+        self.assertEqual([i.title for i in summary['items']['actions']], ['Drill', 'Alarm test'])
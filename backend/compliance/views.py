@@ -12,6 +12,7 @@ from django.db.models import Count, Q
 from datetime import timedelta
 import calendar as cal_mod
 
+from core.intent_matcher import IntentMatcher
 from .models import (
     ComplianceItem, ComplianceCategory, PeaceOfMindScore,
     ScoreAuditLog, IncidentReport, Equipment, AccidentReport,
@@ -482,7 +483,7 @@ def categories_list(request):
 def audit_log(request):
     """GET /api/compliance/audit-log/"""
     limit = int(request.query_params.get('limit', 20))
-    logs = ScoreAuditLog.objects.all()[:limit]
+    logs = ScoreAuditLog.objects.filter(tenant=getattr(request, 'tenant', None))[:limit]
     return Response({
         'logs': [
             {
@@ -506,11 +507,7 @@ def audit_log(request):
 def recalculate(request):
     """POST /api/compliance/recalculate/"""
     tenant = getattr(request, 'tenant', None)
-    result = PeaceOfMindScore.recalculate(tenant=tenant)
-    latest_log = ScoreAuditLog.objects.order_by('-calculated_at').first()
-    if latest_log:
-        latest_log.trigger = 'manual'
-        latest_log.save(update_fields=['trigger'])
+    result = PeaceOfMindScore.recalculate(tenant=tenant, trigger='manual')
     return Response({
         'score': result.score,
         'previous_score': result.previous_score,
@@ -526,58 +523,44 @@ def dashboard_v2(request):
     """
     GET /api/compliance/dashboard-v2/
     Enhanced dashboard with time horizon, trend, priority scoring.
+    Optional ?buckets=overdue,next_7,next_30,next_90,priority limits which item
+    lists are returned (counts are always returned). Default: all.
     """
+    from .summary import HORIZON_BUCKETS, compliance_summary
+
     tenant = getattr(request, 'tenant', None)
     score_obj = PeaceOfMindScore.objects.filter(tenant=tenant).first()
     if not score_obj:
         score_obj = PeaceOfMindScore.recalculate(tenant=tenant)
 
-    today = timezone.now().date()
+    allowed = HORIZON_BUCKETS + ('priority',)
+    requested = request.query_params.get('buckets')
+    buckets = [b for b in requested.split(',') if b in allowed] if requested else list(allowed)
 
-    # --- Time horizon buckets ---
-    items = list(ComplianceItem.objects.select_related('category').filter(category__tenant=tenant))
+    summary = compliance_summary(tenant, buckets=buckets)
+    counts = summary['counts']
 
-    horizon = {'next_7': [], 'next_30': [], 'next_90': [], 'overdue': []}
-    for item in items:
-        due = item.next_due_date
-        if not due:
-            continue
-        if due < today:
-            horizon['overdue'].append(_serialize_item(item))
-        elif due <= today + timedelta(days=7):
-            horizon['next_7'].append(_serialize_item(item))
-        elif due <= today + timedelta(days=30):
-            horizon['next_30'].append(_serialize_item(item))
-        elif due <= today + timedelta(days=90):
-            horizon['next_90'].append(_serialize_item(item))
+    # --- Time horizon buckets ---
+    time_horizon = {name: counts[name] for name in HORIZON_BUCKETS}
+    for name in HORIZON_BUCKETS:
+        if name in summary['items']:
+            time_horizon[f'{name}_items'] = [_serialize_item(i) for i in summary['items'][name]]
 
     # --- Priority scoring ---
-    priority_items = []
-    for item in items:
-        p_score = 0
-        due = item.next_due_date
-        if item.item_type == 'LEGAL' and item.status == 'OVERDUE':
-            p_score += 50
-        elif item.item_type == 'LEGAL' and due and due <= today + timedelta(days=14):
-            p_score += 30
-        elif item.item_type == 'BEST_PRACTICE' and item.status == 'OVERDUE':
-            p_score += 20
-        elif item.item_type == 'BEST_PRACTICE' and due and due <= today + timedelta(days=30):
-            p_score += 10
-
-        if p_score > 0 or item.status != 'COMPLIANT':
-            level = 'high' if p_score >= 30 else ('medium' if p_score >= 10 else 'low')
+    priority_items = None
+    if 'priority' in summary['items']:
+        priority_items = []
+        for item in summary['items']['priority']:
+            p_score = item.priority_score
             serialized = _serialize_item(item)
             serialized['priority_score'] = p_score
-            serialized['priority_level'] = level
+            serialized['priority_level'] = 'high' if p_score >= 30 else ('medium' if p_score >= 10 else 'low')
             priority_items.append(serialized)
 
-    priority_items.sort(key=lambda x: -x['priority_score'])
-
-    # --- Trend data (last 30 days from audit log) ---
+    # --- Trend data (last 30 days from this tenant's audit log) ---
     thirty_days_ago = timezone.now() - timedelta(days=30)
     logs = ScoreAuditLog.objects.filter(
-        calculated_at__gte=thirty_days_ago
+        tenant=tenant, calculated_at__gte=thirty_days_ago
     ).order_by('calculated_at')
     trend = [{
         'date': log.calculated_at.isoformat(),
@@ -590,23 +573,22 @@ def dashboard_v2(request):
     summary_parts = []
     if score_obj.score >= 80:
         summary_parts.append("You are fully compliant.")
-    overdue_legal = ComplianceItem.objects.filter(category__tenant=tenant, status='OVERDUE', item_type='LEGAL').count()
+    overdue_legal = counts['overdue_legal']
     if overdue_legal > 0:
         summary_parts.append(f"{overdue_legal} legal item{'s' if overdue_legal != 1 else ''} overdue — immediate action required.")
-    due_14 = ComplianceItem.objects.filter(
-        category__tenant=tenant, status='DUE_SOON', item_type='LEGAL',
-        next_due_date__lte=today + timedelta(days=14)
-    ).count()
+    due_14 = counts['due_14_legal']
     if due_14 > 0:
         summary_parts.append(f"{due_14} legal item{'s' if due_14 != 1 else ''} due within 14 days.")
     if not summary_parts:
         summary_parts.append(score_obj.interpretation)
 
     # Accident stats
-    open_accidents = AccidentReport.objects.filter(tenant=tenant).exclude(status='CLOSED').count()
-    riddor_count = AccidentReport.objects.filter(tenant=tenant, riddor_reportable=True).count()
+    accidents = AccidentReport.objects.filter(tenant=tenant).aggregate(
+        open=Count('id', filter=~Q(status='CLOSED')),
+        riddor=Count('id', filter=Q(riddor_reportable=True)),
+    )
 
-    return Response({
+    data = {
         'score': score_obj.score,
         'previous_score': score_obj.previous_score,
         'colour': score_obj.colour,
@@ -618,21 +600,14 @@ def dashboard_v2(request):
         'overdue_count': score_obj.overdue_count,
         'legal_items': score_obj.legal_items,
         'best_practice_items': score_obj.best_practice_items,
-        'time_horizon': {
-            'overdue': len(horizon['overdue']),
-            'next_7': len(horizon['next_7']),
-            'next_30': len(horizon['next_30']),
-            'next_90': len(horizon['next_90']),
-            'overdue_items': horizon['overdue'],
-            'next_7_items': horizon['next_7'],
-            'next_30_items': horizon['next_30'],
-            'next_90_items': horizon['next_90'],
-        },
+        'time_horizon': time_horizon,
         'trend': trend,
-        'priority_items': priority_items,
-        'open_accidents': open_accidents,
-        'riddor_count': riddor_count,
-    })
+        'open_accidents': accidents['open'],
+        'riddor_count': accidents['riddor'],
+    }
+    if priority_items is not None:
+        data['priority_items'] = priority_items
+    return Response(data)
 
 
 # ========== WIGGUM DASHBOARD ==========
@@ -667,26 +642,22 @@ def wiggum(request):
     Wiggum Loop dashboard — answers "Am I safe, or am I in trouble?"
     Returns: status_level, status_message, action_items[], sorted_items[], score
     """
-    tenant = getattr(request, 'tenant', None)
-    today = timezone.now().date()
+    from .summary import compliance_summary
 
-    items = list(ComplianceItem.objects.select_related('category').filter(category__tenant=tenant))
+    tenant = getattr(request, 'tenant', None)
+    summary = compliance_summary(tenant, buckets=['actions', 'sorted'])
+    today = summary['today']
+    counts = summary['counts']
     open_incidents = IncidentReport.objects.filter(tenant=tenant).exclude(status__in=['RESOLVED', 'CLOSED']).count()
     open_accidents = AccidentReport.objects.filter(tenant=tenant).exclude(status='CLOSED').count()
 
-    # Categorise items
-    overdue_legal = [i for i in items if i.status == 'OVERDUE' and i.item_type == 'LEGAL']
-    overdue_bp = [i for i in items if i.status == 'OVERDUE' and i.item_type == 'BEST_PRACTICE']
-    due_soon = [i for i in items if i.status == 'DUE_SOON']
-    compliant = [i for i in items if i.status == 'COMPLIANT']
-    missing = [i for i in items if not i.last_completed_date and not i.document and i.status == 'OVERDUE']
-
     # Determine status level
-    needs_attention_count = len(overdue_bp) + len(due_soon)
+    overdue_legal = counts['overdue_legal']
+    needs_attention_count = counts['overdue_bp'] + counts['due_soon']
     if overdue_legal or open_incidents > 0:
         status_level = 'red'
         if overdue_legal:
-            status_message = f"You have legal risk. {len(overdue_legal)} legal item{'s' if len(overdue_legal) != 1 else ''} overdue. Fix today."
+            status_message = f"You have legal risk. {overdue_legal} legal item{'s' if overdue_legal != 1 else ''} overdue. Fix today."
         else:
             status_message = f"You have {open_incidents} open incident{'s' if open_incidents != 1 else ''}. Resolve now."
     elif needs_attention_count > 0:
@@ -698,7 +669,7 @@ def wiggum(request):
 
     # Build action table — ordered: overdue legal first, then overdue BP, then due soon
     action_items = []
-    for item in overdue_legal + overdue_bp + due_soon:
+    for item in summary['items']['actions']:
         days_info = ''
         effective_date = item.expiry_date or item.next_due_date
         if effective_date:
@@ -725,16 +696,15 @@ def wiggum(request):
             'legal_reference': item.legal_reference,
         })
 
-    # Sorted view — recently completed items
-    week_ago = today - timedelta(days=7)
-    completed_today = [i for i in items if i.last_completed_date and i.last_completed_date == today]
-    completed_this_week = [i for i in items if i.last_completed_date and week_ago <= i.last_completed_date < today]
-
+    # Sorted view — recently completed items (today first, then earlier this week)
+    recent = summary['items']['sorted']
     sorted_items = []
-    for item in completed_today:
-        sorted_items.append({'id': item.id, 'title': item.title, 'when': 'today', 'category': item.category.name})
-    for item in completed_this_week:
-        sorted_items.append({'id': item.id, 'title': item.title, 'when': str(item.last_completed_date), 'category': item.category.name})
+    for item in recent:
+        if item.last_completed_date == today:
+            sorted_items.append({'id': item.id, 'title': item.title, 'when': 'today', 'category': item.category.name})
+    for item in recent:
+        if item.last_completed_date != today:
+            sorted_items.append({'id': item.id, 'title': item.title, 'when': str(item.last_completed_date), 'category': item.category.name})
 
     # Score
     score_obj = PeaceOfMindScore.objects.filter(tenant=tenant).first()
@@ -749,12 +719,12 @@ def wiggum(request):
         'action_items': action_items,
         'sorted_items': sorted_items,
         'counts': {
-            'total': len(items),
-            'compliant': len(compliant),
-            'overdue_legal': len(overdue_legal),
-            'overdue_bp': len(overdue_bp),
-            'due_soon': len(due_soon),
-            'missing': len(missing),
+            'total': counts['total'],
+            'compliant': counts['compliant'],
+            'overdue_legal': overdue_legal,
+            'overdue_bp': counts['overdue_bp'],
+            'due_soon': counts['due_soon'],
+            'missing': counts['missing'],
             'open_incidents': open_incidents,
             'open_accidents': open_accidents,
         },
@@ -772,6 +742,17 @@ def daysUntil_py(date_val, today):
 
 # ========== NATURAL LANGUAGE PARSE ==========
 
+# Action keywords for parse_command, checked in order
+PARSE_ACTION_RULES = [
+    ('complete', ['upload', 'uploaded', 'renew', 'renewed']),
+    ('create_accident', ['log accident', 'accident', 'injury', 'hurt', 'cut', 'fell', 'slip']),
+    ('create_incident', ['log incident', 'incident', 'near miss', 'near-miss', 'report']),
+    ('complete', ['book', 'schedule', 'arrange']),
+    ('complete', ['mark done', 'mark complete', 'completed', 'done', 'finished']),
+]
+PARSE_ACTION_MATCHER = IntentMatcher(PARSE_ACTION_RULES)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def parse_command(request):
@@ -808,18 +789,9 @@ def parse_command(request):
             best_score = matching_words
             best_match = item
 
-    # Detect action type from text
-    action_type = 'complete'
-    if any(w in text for w in ['upload', 'uploaded', 'renew', 'renewed']):
-        action_type = 'complete'
-    elif any(w in text for w in ['log accident', 'accident', 'injury', 'hurt', 'cut', 'fell', 'slip']):
-        action_type = 'create_accident'
-    elif any(w in text for w in ['log incident', 'incident', 'near miss', 'near-miss', 'report']):
-        action_type = 'create_incident'
-    elif any(w in text for w in ['book', 'schedule', 'arrange']):
-        action_type = 'complete'
-    elif any(w in text for w in ['mark done', 'mark complete', 'completed', 'done', 'finished']):
-        action_type = 'complete'
+    # Detect action type from text (first matching rule wins)
+    best = PARSE_ACTION_MATCHER.first(text)
+    action_type = best['intent'] if best else 'complete'
 
     if action_type == 'create_accident':
         return Response({
@@ -1065,9 +1037,7 @@ def rams_ai_review(request, rams_id):
 
     # Try OpenAI review
     try:
-        import openai
-        from django.conf import settings as django_settings
-        client = openai.OpenAI(api_key=getattr(django_settings, 'OPENAI_API_KEY', ''))
+        from core import llm_gateway
 
         prompt = (
             "You are a UK health & safety consultant reviewing a Risk Assessment & Method Statement (RAMS). "
@@ -1088,15 +1058,13 @@ def rams_ai_review(request, rams_id):
             "Write suggested_content as if you are completing the section for the user based on the job description provided."
         )
 
-        response = client.chat.completions.create(
+        review_data = llm_gateway.complete(
+            [{'role': 'user', 'content': prompt}],
+            purpose='rams_review',
             model='gpt-4o-mini',
-            messages=[{'role': 'user', 'content': prompt}],
             response_format={'type': 'json_object'},
             temperature=0.3,
-        )
-
-        import json
-        review_data = json.loads(response.choices[0].message.content)
+        ).json()
         review_data['reviewed_at'] = timezone.now().isoformat()
         rams.ai_review = review_data
         rams.save()
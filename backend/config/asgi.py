@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production serves this app (start.sh: gunicorn with uvicorn workers).
+Streaming endpoints (core/sse.py — /api/assistant/chat/stream/, the order
+streams) run their generator on a dedicated thread under ASGI, so a long
+stream never holds the shared sync worker.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
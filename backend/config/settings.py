@@ -92,6 +92,7 @@ if ORDERS_MODULE_ENABLED:
     INSTALLED_APPS.append('orders')
 
 MIDDLEWARE = [
+    "core.middleware_perf.PerfProfilingMiddleware",  # no-op unless PERF_PROFILING
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "core.middleware_contact_cors.ContactCorsMiddleware",
@@ -265,6 +266,53 @@ REMINDER_INTERVAL_MINUTES = config('REMINDER_INTERVAL_MINUTES', default=10, cast
 import os as _os
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='') or _os.environ.get('OPENAI_API_KEY', '')
 OPENAI_MODEL = config('OPENAI_MODEL', default='gpt-4o-mini')
+# LLM gateway (core/llm_gateway.py): 'openai' or 'local' (offline deterministic stand-in)
+LLM_BACKEND = config('LLM_BACKEND', default='openai')
+LLM_CACHE_TIMEOUT = config('LLM_CACHE_TIMEOUT', default=3600, cast=int)  # 0 disables the response cache
+LLM_LOCAL_LATENCY_MS = config('LLM_LOCAL_LATENCY_MS', default=0, cast=int)
+LLM_LOCAL_MS_PER_TOKEN = config('LLM_LOCAL_MS_PER_TOKEN', default=0, cast=float)
+AI_TOOL_WORKERS = config('AI_TOOL_WORKERS', default=4, cast=int)  # read-only assistant tools run in parallel (1 = serial)
+
+# Request profiling (core.middleware_perf) — per-endpoint latency/query stats at /api/_perf/
+PERF_PROFILING = config('PERF_PROFILING', default=False, cast=bool)
+PERF_WINDOW = config('PERF_WINDOW', default=500, cast=int)  # requests kept per endpoint
+PERF_CAPTURE_SITES = config('PERF_CAPTURE_SITES', default=False, cast=bool)  # call sites for duplicate queries
+
+# Public content endpoints (core.content_version) — ETag/304 plus shared-cache lifetime
+PUBLIC_CACHE_S_MAXAGE = config('PUBLIC_CACHE_S_MAXAGE', default=60, cast=int)
+PUBLIC_CACHE_STALE_WHILE_REVALIDATE = config('PUBLIC_CACHE_STALE_WHILE_REVALIDATE', default=300, cast=int)
+# Rendered JSON of the public menu/product list (core.response_cache), keyed by content version
+PUBLIC_RENDER_CACHE_TIMEOUT = config('PUBLIC_RENDER_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+PUBLIC_RENDER_WAIT_MS = config('PUBLIC_RENDER_WAIT_MS', default=2000, cast=int)  # wait for another worker's rebuild
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    # Shared by every worker so a content change is rendered once (createcachetable in bootstrap)
+    'public_render': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'public_render_cache',
+        'OPTIONS': {'MAX_ENTRIES': config('PUBLIC_RENDER_CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    },
+}
+
+# Server-sent event fan-out (core.broker) — order streams for the kitchen display/customers
+EVENT_BROKER_BACKEND = config('EVENT_BROKER_BACKEND', default='auto')  # auto | memory | postgres
+EVENT_BROKER_BUFFER = config('EVENT_BROKER_BUFFER', default=500, cast=int)  # events kept per tenant for replay
+EVENT_BROKER_QUEUE = config('EVENT_BROKER_QUEUE', default=1000, cast=int)  # per-stream backlog before resync
+EVENT_STREAM_SECONDS = config('EVENT_STREAM_SECONDS', default=300, cast=float)  # then the client reconnects
+EVENT_STREAM_KEEPALIVE = config('EVENT_STREAM_KEEPALIVE', default=15, cast=float)
+EVENT_STREAM_RETRY_MS = config('EVENT_STREAM_RETRY_MS', default=2000, cast=int)
+
+# Order queue depth counter (orders.OrderQueueSettings) — recounted from the orders this often
+ORDER_QUEUE_RECONCILE_SECONDS = config('ORDER_QUEUE_RECONCILE_SECONDS', default=300, cast=int)
+
+# Shop checkout stock holds (shop.stock) — Stripe session lifetime, 30 min–24 h
+SHOP_RESERVATION_MINUTES = config('SHOP_RESERVATION_MINUTES', default=30, cast=int)
+
+# Responsive image derivatives (core.images) — written by `generate_image_derivatives --loop`
+IMAGE_DERIVATIVE_WIDTHS = config('IMAGE_DERIVATIVE_WIDTHS', default='320,640,1024,1600', cast=Csv(int))
+IMAGE_DERIVATIVE_QUALITY = config('IMAGE_DERIVATIVE_QUALITY', default=80, cast=int)
+IMAGE_DERIVATIVE_INTERVAL = config('IMAGE_DERIVATIVE_INTERVAL', default=30, cast=int)  # seconds between worker passes
 
 # Stripe payments
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
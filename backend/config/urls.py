@@ -21,7 +21,8 @@ from core.command_router import execute_command, command_suggestions
 from core.views_contact import contact_form
 from core.views_beta import beta_signup
 from core.views_feedback import feedback_submit
-from core.views_ai_assistant import ai_chat
+from core.views_ai_assistant import ai_chat, ai_chat_stream
+from core.views_perf import perf_stats
 
 
 def api_index(request):
@@ -87,12 +88,15 @@ urlpatterns = [
     path('api/command/suggestions/', command_suggestions, name='command-suggestions'),
     # AI assistant chat panel
     path('api/assistant/chat/', ai_chat, name='ai-chat'),
+    path('api/assistant/chat/stream/', ai_chat_stream, name='ai-chat-stream'),
     # Public contact form (no auth required)
     path('api/contact/', contact_form, name='contact-form'),
     # Public beta signup form (no auth required)
     path('api/beta-signup/', beta_signup, name='beta-signup'),
     # Authenticated feedback from admin panel
     path('api/feedback/', feedback_submit, name='feedback-submit'),
+    # Profiling read-out (staff only; populated when PERF_PROFILING is on)
+    path('api/_perf/', perf_stats, name='perf-stats'),
     # Core catch-all (health check etc.)
     path('', include('core.urls')),
 ]
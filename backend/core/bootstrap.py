@@ -0,0 +1,277 @@
+"""
+Deploy Bootstrap Pipeline
+
+Runs the start-up management commands (migrate, collectstatic, demo seeds,
+derived-data refreshes) inside ONE Django process instead of booting Django
+once per command in start.sh.
+
+- Phases form a dependency graph; phases whose dependencies are done run
+  concurrently on a small thread pool (one DB connection per thread).
+- Seed phases record a fingerprint (hash of the command source, arguments,
+  applied migrations, for date-relative seeds today's date, and for seeds
+  that loop over every tenant the tenant ids) in the Config table. An
+  unchanged fingerprint means the phase is skipped on redeploy.
+- Derived-data phases (CRM sync, demand index, SBE backfill, compliance
+  status roll-forward) always run.
+- Per-phase timings are returned and printed by `manage.py bootstrap`.
+
+Only a failure in a `fatal` phase (migrate) aborts the pipeline; every other
+failure is reported and its dependents still run, matching the old start.sh.
+"""
+import hashlib
+import inspect
+import io
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from importlib import import_module
+
+from django.core.management import call_command, get_commands
+from django.db import connection, connections
+from django.utils import timezone
+
+CONFIG_PREFIX = 'bootstrap.'
+
+DEMO_TENANTS = ('salon-x', 'restaurant-x', 'health-club-x')
+LIVE_TENANTS = ('nbne', 'mind-department')
+
+
+class Phase:
+    """One node of the bootstrap graph: a management command plus its inputs."""
+
+    def __init__(self, name, command, args=(), deps=(), always=False, daily=False,
+                 all_tenants=False, fatal=False, uses_db=True, sources=()):
+        self.name = name
+        self.command = command
+        self.args = tuple(args)
+        self.deps = tuple(deps)
+        self.always = always        # never skipped (derived data, migrations)
+        self.daily = daily          # seed uses date-relative data → refresh once a day
+        self.all_tenants = all_tenants  # seeds every tenant → rerun when a tenant is added
+        self.fatal = fatal          # failure aborts the whole pipeline
+        self.uses_db = uses_db
+        self.sources = tuple(sources)  # extra commands whose source feeds the fingerprint
+
+    def __repr__(self):
+        return f'<Phase {self.name}>'
+
+    def run(self, stdout):
+        call_command(self.command, *self.args, stdout=stdout, stderr=stdout)
+
+
+def default_phases(reseed=None):
+    """
+    The start.sh sequence as a graph. `reseed` replaces that tenant's seed with a
+    forced delete + reseed (SEED_TENANT in start.sh).
+    """
+    tenant_phases = []
+    phases = [
+        Phase('migrate', 'migrate', ['--noinput'], always=True, fatal=True),
+        Phase('collectstatic', 'collectstatic', ['--noinput'], always=True, uses_db=False),
+        Phase('createcachetable', 'createcachetable', deps=['migrate'], always=True),
+    ]
+    for slug in DEMO_TENANTS:
+        if slug == reseed:
+            continue
+        name = f'seed_demo:{slug}'
+        phases.append(Phase(name, 'seed_demo', ['--tenant', slug], deps=['migrate'], daily=True,
+                            sources=['seed_compliance']))
+        tenant_phases.append(name)
+    if reseed:
+        phases.append(Phase(f'clear_demo:{reseed}', 'seed_demo', ['--tenant', reseed, '--delete-demo'],
+                            deps=['migrate'], always=True))
+        phases.append(Phase(f'seed_demo:{reseed}', 'seed_demo', ['--tenant', reseed],
+                            deps=[f'clear_demo:{reseed}'], always=True))
+        tenant_phases.append(f'seed_demo:{reseed}')
+    phases.append(Phase('seed_pizza_shack', 'seed_pizza_shack', deps=['migrate'], daily=True))
+    tenant_phases.append('seed_pizza_shack')
+    for slug in LIVE_TENANTS:
+        phases.append(Phase(f'ensure_tenant:{slug}', 'ensure_tenant', [slug], deps=['migrate'],
+                            sources=['seed_demo']))
+        tenant_phases.append(f'ensure_tenant:{slug}')
+    demo_seeds = [p for p in tenant_phases if p.startswith('seed_demo:')]
+    phases += [
+        Phase('setup_production', 'setup_production', deps=['migrate']),
+        Phase('seed_compliance', 'seed_compliance', deps=tenant_phases, all_tenants=True),
+        Phase('seed_document_vault', 'seed_document_vault', deps=tenant_phases, all_tenants=True),
+        Phase('roll_forward_compliance', 'roll_forward_compliance', deps=['seed_compliance'], always=True),
+        Phase('sync_crm_leads', 'sync_crm_leads', deps=demo_seeds, always=True),
+        Phase('update_demand_index', 'update_demand_index', deps=demo_seeds, always=True),
+        Phase('backfill_sbe_scores', 'backfill_sbe_scores', deps=demo_seeds, always=True),
+    ]
+    return phases
+
+
+# ---------------------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------------------
+
+def _command_source(command):
+    app = get_commands().get(command)
+    if not isinstance(app, str):
+        return ''
+    try:
+        return inspect.getsource(import_module(f'{app}.management.commands.{command}'))
+    except (ImportError, OSError, TypeError):
+        return ''
+
+
+def migration_state():
+    """Hash of applied migrations — a schema change invalidates every seed."""
+    from django.db.migrations.recorder import MigrationRecorder
+    applied = sorted(MigrationRecorder(connection).applied_migrations())
+    return hashlib.sha256(repr(applied).encode()).hexdigest()
+
+
+def tenant_state():
+    """Hash of tenant ids — a new tenant invalidates seeds that cover every tenant."""
+    from tenants.models import TenantSettings
+    ids = list(TenantSettings.objects.order_by('pk').values_list('pk', flat=True))
+    return hashlib.sha256(repr(ids).encode()).hexdigest()
+
+
+def fingerprint(phase, schema):
+    h = hashlib.sha256()
+    for command in (phase.command, *phase.sources):
+        h.update(_command_source(command).encode())
+    h.update(repr(phase.args).encode())
+    h.update(schema.encode())
+    if phase.daily:
+        h.update(date.today().isoformat().encode())
+    if phase.all_tenants:
+        h.update(tenant_state().encode())
+    return h.hexdigest()
+
+
+def _load_record(phase):
+    from core.models import Config
+    row = Config.objects.filter(key=CONFIG_PREFIX + phase.name).values_list('value', flat=True).first()
+    if not row:
+        return {}
+    try:
+        return json.loads(row)
+    except ValueError:
+        return {}
+
+
+def _save_record(phase, fp, seconds):
+    from core.models import Config
+    Config.objects.update_or_create(
+        key=CONFIG_PREFIX + phase.name,
+        defaults={
+            'category': 'system',
+            'value': json.dumps({
+                'fingerprint': fp,
+                'seconds': round(seconds, 3),
+                'at': timezone.now().isoformat(),
+            }),
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class BootstrapError(Exception):
+    pass
+
+
+def _validate(phases):
+    names = {p.name for p in phases}
+    for p in phases:
+        missing = [d for d in p.deps if d not in names]
+        if missing:
+            raise BootstrapError(f'{p.name}: unknown dependencies {missing}')
+    # Kahn's algorithm — a cycle leaves nodes unvisited
+    indegree = {p.name: len(p.deps) for p in phases}
+    children = {p.name: [] for p in phases}
+    for p in phases:
+        for d in p.deps:
+            children[d].append(p.name)
+    ready = [n for n, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        n = ready.pop()
+        seen += 1
+        for c in children[n]:
+            indegree[c] -= 1
+            if indegree[c] == 0:
+                ready.append(c)
+    if seen != len(phases):
+        raise BootstrapError('Dependency cycle in bootstrap phases')
+
+
+def _execute(phase, force, log):
+    """Run (or skip) one phase in the current thread. Returns a result dict."""
+    result = {'phase': phase.name, 'status': 'ok', 'seconds': 0.0, 'output': ''}
+    started = time.monotonic()
+    try:
+        fp = None
+        if phase.uses_db and not phase.always:
+            fp = fingerprint(phase, migration_state())
+            if not force and _load_record(phase).get('fingerprint') == fp:
+                result['status'] = 'skipped'
+                return result
+        out = io.StringIO()
+        try:
+            phase.run(out)
+        finally:
+            result['output'] = out.getvalue()
+        result['seconds'] = time.monotonic() - started
+        if fp is not None:
+            _save_record(phase, fp, result['seconds'])
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f'{type(e).__name__}: {e}'
+        result['seconds'] = time.monotonic() - started
+    log(result)
+    return result
+
+
+def _execute_in_worker(phase, force, log):
+    try:
+        return _execute(phase, force, log)
+    finally:
+        connections.close_all()  # thread-local — only closes this worker's connections
+
+
+def run_bootstrap(phases=None, jobs=4, force=False, log=lambda result: None):
+    """
+    Run every phase respecting dependencies. Returns (results, wall_seconds).
+    `results` is in completion order. Raises BootstrapError if a fatal phase fails.
+    """
+    phases = list(phases if phases is not None else default_phases())
+    _validate(phases)
+    # SQLite serialises writers — overlapping DB phases would only hit "database is locked"
+    one_db_writer = connection.vendor == 'sqlite'
+
+    pending = {p.name: p for p in phases}
+    done = set()
+    results = []
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while pending or running:
+            for name in [n for n, p in pending.items() if all(d in done for d in p.deps)]:
+                phase = pending[name]
+                if one_db_writer and phase.uses_db and any(p.uses_db for p in running.values()):
+                    continue
+                del pending[name]
+                running[pool.submit(_execute_in_worker, phase, force, log)] = phase
+            if not running:
+                raise BootstrapError('No runnable phases — dependency graph is stuck')
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                phase = running.pop(future)
+                result = future.result()
+                results.append(result)
+                done.add(phase.name)
+                if result['status'] == 'failed' and phase.fatal:
+                    for f in running:
+                        f.cancel()
+                    raise BootstrapError(f"{phase.name} failed: {result.get('error')}")
+
+    return results, time.monotonic() - started
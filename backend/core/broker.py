@@ -0,0 +1,262 @@
+"""
+Per-tenant event fan-out for server-sent event streams.
+
+    broker.publish('orders', tenant.pk, 'order', {...})          # after a change
+    sse_response(request, broker.event_stream('orders', tenant.pk, snapshot, last_event_id))
+
+publish() delivers once the surrounding transaction commits (immediately
+outside one), so subscribers never see a change that rolls back. Every
+(channel, tenant) keeps its last EVENT_BROKER_BUFFER events; a stream that
+reconnects with Last-Event-ID gets what it missed from that buffer, or a
+fresh snapshot when the id has aged out (or is unknown). Event ids are
+opaque — only their order in the buffer matters.
+
+Backends (EVENT_BROKER_BACKEND):
+- memory: fan-out within this process only. One worker, runserver, tests.
+- postgres: publish() sends pg_notify; each process runs one LISTEN thread
+  that feeds its local fan-out. Postgres delivers notifications to every
+  listener in commit order, so all workers hold the same buffer in the same
+  order and a client can reconnect to any of them. If the listener loses its
+  connection, local streams are told to resync when it comes back.
+- auto (default): postgres when the default database is PostgreSQL.
+
+A subscriber that falls EVENT_BROKER_QUEUE events behind is dropped to a
+resync rather than buffering without bound.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = 'nbne_events'
+PG_PAYLOAD_LIMIT = 7900   # NOTIFY payloads must stay under 8000 bytes
+RESYNC = 'resync'
+
+
+class Subscription:
+    def __init__(self, key, maxsize):
+        self.key = key
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+
+class Broker:
+    """In-process fan-out plus per-key replay buffer."""
+
+    def __init__(self, buffer_size, queue_size):
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}   # key → set(Subscription)
+        self._recent = {}        # key → deque[(event, data, id)]
+
+    def deliver(self, key, event_id, event, data):
+        item = (event, data, event_id)
+        with self._lock:
+            if event != RESYNC:
+                self._recent.setdefault(key, deque(maxlen=self.buffer_size)).append(item)
+            subscribers = list(self._subscribers.get(key, ()))
+        for sub in subscribers:
+            try:
+                sub.queue.put_nowait(item)
+            except queue.Full:
+                sub.overflowed = True
+
+    def resync_all(self):
+        with self._lock:
+            keys = list(self._subscribers)
+        for key in keys:
+            self.deliver(key, None, RESYNC, {})
+
+    def subscribe(self, key):
+        sub = Subscription(key, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.key)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.key]
+
+    def recent(self, key):
+        with self._lock:
+            return list(self._recent.get(key, ()))
+
+
+_broker = Broker(
+    getattr(settings, 'EVENT_BROKER_BUFFER', 500),
+    getattr(settings, 'EVENT_BROKER_QUEUE', 1000),
+)
+
+
+def _key(channel, tenant_id):
+    return f'{channel}:{tenant_id}'
+
+
+def backend():
+    name = getattr(settings, 'EVENT_BROKER_BACKEND', 'auto')
+    if name == 'auto':
+        return 'postgres' if connections['default'].vendor == 'postgresql' else 'memory'
+    return name
+
+
+def publish(channel, tenant_id, event, data):
+    """Send `event` to every stream on (channel, tenant) once the current transaction commits."""
+    key = _key(channel, tenant_id)
+    event_id = uuid.uuid4().hex[:16]
+    if backend() == 'postgres':
+        payload = json.dumps({'k': key, 'id': event_id, 'e': event, 'd': data}, default=str)
+        if len(payload.encode()) > PG_PAYLOAD_LIMIT:
+            payload = json.dumps({'k': key, 'id': None, 'e': RESYNC, 'd': {}})
+        transaction.on_commit(lambda: _notify(payload))
+    else:
+        data = json.loads(json.dumps(data, default=str))   # same shape the postgres path delivers
+        transaction.on_commit(lambda: _broker.deliver(key, event_id, event, data))
+
+
+def _notify(payload):
+    with connections['default'].cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [PG_CHANNEL, payload])
+
+
+# ── Postgres listener (one thread per process, started by the first stream) ──
+
+_listener_lock = threading.Lock()
+_listener_started = False
+
+
+def _ensure_listener():
+    global _listener_started
+    if backend() != 'postgres':
+        return
+    with _listener_lock:
+        if _listener_started:
+            return
+        _listener_started = True
+    threading.Thread(target=_listen_forever, name='event-broker-listen', daemon=True).start()
+
+
+def _listen_forever():
+    import select
+    wrapper = connections['default']
+    while True:
+        conn = None
+        try:
+            conn = wrapper.get_new_connection(wrapper.get_connection_params())
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {PG_CHANNEL}')
+            _broker.resync_all()  # anything sent while we weren't listening is lost
+            while True:
+                if not select.select([conn], [], [], 30)[0]:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    message = json.loads(conn.notifies.pop(0).payload)
+                    _broker.deliver(message['k'], message['id'], message['e'], message['d'])
+        except Exception:
+            logger.exception('[BROKER] LISTEN connection lost, reconnecting')
+            time.sleep(1)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+def reset():
+    """Drop every buffer and subscriber in this process (tests)."""
+    global _broker
+    _broker = Broker(_broker.buffer_size, _broker.queue_size)
+
+
+# ── Streams ──
+
+def _close_connections():
+    """Close this thread's open DB connections, leaving any inside a transaction alone."""
+    for conn in connections.all(initialized_only=True):
+        if not conn.in_atomic_block:
+            conn.close()
+
+
+def event_stream(channel, tenant_id, snapshot, last_event_id=None, transform=None):
+    """
+    Generator for core.sse.sse_response. Yields a 'snapshot' event — snapshot()
+    — or, when last_event_id is still buffered, just the events after it; then
+    each published event as it arrives, keep-alive comments while idle, and
+    ends after EVENT_STREAM_SECONDS so the client reconnects (EventSource does
+    so by itself, sending Last-Event-ID). transform(event, data) may rewrite
+    an event's data or return None to skip it. A resync — subscriber overflow
+    or a listener reconnect — sends a new snapshot.
+
+    The thread's database connections are closed after every snapshot: under
+    ASGI the stream runs on its own thread (core.sse), and an idle stream
+    would otherwise hold a Postgres connection for EVENT_STREAM_SECONDS.
+    """
+    key = _key(channel, tenant_id)
+    sub = _broker.subscribe(key)
+    _ensure_listener()
+    deadline = time.monotonic() + settings.EVENT_STREAM_SECONDS
+    keepalive = settings.EVENT_STREAM_KEEPALIVE
+
+    def resync():
+        recent = _broker.recent(key)
+        seen.update(item[2] for item in recent)
+        data = snapshot()
+        _close_connections()
+        return 'snapshot', data, recent[-1][2] if recent else None
+
+    try:
+        yield f'retry: {settings.EVENT_STREAM_RETRY_MS}\n\n'
+        seen = set()   # ids already reflected in what we've sent; the queue may repeat them
+        recent = _broker.recent(key)
+        ids = [item[2] for item in recent]
+        if last_event_id and last_event_id in ids:
+            seen.update(ids)
+            for event, data, event_id in recent[ids.index(last_event_id) + 1:]:
+                data = transform(event, data) if transform else data
+                if data is not None:
+                    yield event, data, event_id
+        else:
+            yield resync()
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event, data, event_id = sub.queue.get(timeout=min(keepalive, remaining))
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if sub.overflowed or event == RESYNC:
+                sub.overflowed = False
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                yield resync()
+                continue
+            if event_id in seen:
+                continue
+            data = transform(event, data) if transform else data
+            if data is not None:
+                yield event, data, event_id
+    finally:
+        _broker.unsubscribe(sub)
+
+
+def last_event_id(request):
+    """Last-Event-ID header (EventSource reconnects) or ?last_event_id= (first connect)."""
+    return request.META.get('HTTP_LAST_EVENT_ID') or request.GET.get('last_event_id') or None
@@ -0,0 +1,157 @@
+"""
+Bulk seeding helpers
+
+Turns get_or_create/update_or_create loops into a fixed number of queries
+per model, so demo and baseline seeds cost O(models) round trips instead of
+O(rows):
+
+- bulk_get_or_create(): one SELECT for the keys that already exist, one
+  bulk_create for the rest, one bulk_update for changed existing rows.
+- muted_signals(): disconnect per-row receivers (e.g. the compliance score
+  recalculation) for the duration of a seed; the caller recomputes derived
+  values once at the end.
+
+Note: bulk_create skips Model.save() and signals — callers must fill any
+fields a custom save() would have derived. The one signal effect
+bulk_get_or_create() restores itself is the content version bump
+(core.content_version) for rows of public content models, so a reseed
+doesn't leave ETags and cached catalogue JSON serving the old rows.
+"""
+from contextlib import contextmanager
+
+from django.db import models
+from django.db.models import Q
+
+from core import content_version
+
+
+def _plain(value):
+    return value.pk if isinstance(value, models.Model) else value
+
+
+def _key_of_row(row, keys):
+    return tuple(_plain(row[k]) for k in keys)
+
+
+def _key_of_obj(obj, attnames):
+    return tuple(getattr(obj, a) for a in attnames)
+
+
+def bulk_get_or_create(model, rows, keys, update=(), prepare=None, batch_size=500):
+    """
+    Bulk equivalent of calling model.objects.get_or_create() for every row.
+
+    Each row is a dict holding the lookup fields named in `keys` plus an
+    optional `defaults` dict used only when the row is created. Fields listed
+    in `update` are also copied from `defaults` onto existing rows (only rows
+    whose value actually differs are written).
+
+    `prepare(obj)` is called on each new instance before insert — use it for
+    anything the model's save() would normally derive.
+
+    Returns (objects, created) where `objects` maps each key tuple (FK values
+    as primary keys) to its saved instance in input order, and `created` lists
+    the newly inserted instances.
+    """
+    rows = list(rows)
+    if not rows:
+        return {}, []
+    attnames = [model._meta.get_field(k).attname for k in keys]
+
+    lookup = {f'{keys[0]}__in': {_plain(r[keys[0]]) for r in rows}}
+    existing = {_key_of_obj(o, attnames): o for o in model.objects.filter(**lookup)}
+
+    objects = {}
+    to_create = []
+    to_update = []
+    for row in rows:
+        key = _key_of_row(row, keys)
+        if key in objects:
+            continue
+        defaults = row.get('defaults') or {}
+        obj = existing.get(key)
+        if obj is None:
+            fields = {k: row[k] for k in keys}
+            fields.update(defaults)
+            obj = model(**fields)
+            if prepare:
+                prepare(obj)
+            to_create.append(obj)
+        else:
+            changed = False
+            for field in update:
+                if field in defaults and getattr(obj, field) != defaults[field]:
+                    setattr(obj, field, defaults[field])
+                    changed = True
+            if changed:
+                to_update.append(obj)
+        objects[key] = obj
+
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        model.objects.bulk_update(to_update, list(update), batch_size=batch_size)
+    content_version.bump_for(model, to_create + to_update)
+    return objects, to_create
+
+
+def bulk_set_m2m(relation, wanted, add_only=False):
+    """
+    Bulk equivalent of `obj.<m2m>.set(ids)` for many objects at once.
+
+    `relation` is the forward ManyToMany descriptor (e.g. Staff.services) and
+    `wanted` maps source pk → iterable of target pks. With add_only=True extra
+    existing links are kept (like `.add()`). Three queries at most.
+    """
+    through = relation.through
+    field = relation.field
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    wanted = {pk: set(ids) for pk, ids in wanted.items()}
+    if not wanted:
+        return
+    existing = set(through.objects.filter(**{f'{source}__in': wanted}).values_list(f'{source}_id', f'{target}_id'))
+    desired = {(s, t) for s, ids in wanted.items() for t in ids}
+    if not add_only:
+        stale = existing - desired
+        if stale:
+            match = Q()
+            for s, t in stale:
+                match |= Q(**{f'{source}_id': s, f'{target}_id': t})
+            through.objects.filter(match).delete()
+    missing = desired - existing
+    if missing:
+        through.objects.bulk_create([through(**{f'{source}_id': s, f'{target}_id': t}) for s, t in missing])
+
+
+@contextmanager
+def muted_signals(*receivers):
+    """
+    Temporarily disconnect receivers. Each entry is (signal, receiver, sender);
+    `sender` must be the model class the receiver was connected for — a bare
+    disconnect(receiver) silently does nothing for sender-specific receivers.
+
+    Signals are process-global: other threads saving the same model while the
+    block runs also skip the receiver, so seeders recompute derived values at
+    the end rather than relying on per-row signals.
+    """
+    disconnected = []
+    try:
+        for signal, receiver, sender in receivers:
+            if signal.disconnect(receiver, sender=sender):
+                disconnected.append((signal, receiver, sender))
+        yield
+    finally:
+        for signal, receiver, sender in disconnected:
+            signal.connect(receiver, sender=sender)
+
+
+def compliance_score_signals():
+    """The per-item Peace of Mind recalculation receivers, for muted_signals()."""
+    from django.db.models.signals import post_delete, post_save
+    from compliance.models import ComplianceItem
+    from compliance.signals import recalculate_score_on_delete, recalculate_score_on_save
+    return (
+        (post_save, recalculate_score_on_save, ComplianceItem),
+        (post_delete, recalculate_score_on_delete, ComplianceItem),
+    )
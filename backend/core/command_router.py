@@ -16,24 +16,21 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from core.intent_matcher import IntentMatcher
+
 
 # ─── Staff name resolver ───
 
 def _resolve_staff(tenant, text_lower):
-    """Find a staff member whose first name or display_name appears in the text."""
+    """
+    Find the staff member whose display name, full name or first name appears in the text.
+    Returns (StaffProfile or None, [names]) — names lists the candidates when ambiguous.
+    """
     try:
-        from staff.models import StaffProfile
-        profiles = StaffProfile.objects.filter(tenant=tenant, is_active=True).select_related('user')
-        for p in profiles:
-            first = p.user.first_name.strip().lower()
-            display = p.display_name.strip().lower()
-            if display and display in text_lower:
-                return p
-            if first and len(first) >= 2 and first in text_lower:
-                return p
+        from staff.name_index import resolve_staff
+        return resolve_staff(tenant, text_lower)
     except Exception:
-        pass
-    return None
+        return None, []
 
 
 # ─── Value extractor ───
@@ -63,7 +60,9 @@ def _extract_name_after(text, marker):
 
 def _cmd_mark_sick(tenant, text_lower, text):
     """Mark staff member as sick today."""
-    staff = _resolve_staff(tenant, text_lower)
+    staff, ambiguous = _resolve_staff(tenant, text_lower)
+    if ambiguous:
+        return {'success': False, 'message': f'Which staff member? {", ".join(ambiguous)} all match — use their full name.'}
     if not staff:
         return {'success': False, 'message': 'Could not find staff member. Try: "Jordan is sick today"'}
 
@@ -225,6 +224,8 @@ COMMAND_MAP = [
     (['compliance status', 'compliance overview', 'show compliance', 'h&s', 'health and safety'], _cmd_compliance_status),
 ]
 
+COMMAND_MATCHER = IntentMatcher((handler, keywords) for keywords, handler in COMMAND_MAP)
+
 # Suggestions shown in the dropdown
 SUGGESTIONS = [
     {'text': 'Jordan is sick today', 'category': 'Staff'},
@@ -259,11 +260,10 @@ def execute_command(request):
     text_lower = text.lower()
 
     # Match command
-    for keywords, handler in COMMAND_MAP:
-        for kw in keywords:
-            if kw in text_lower:
-                result = handler(tenant, text_lower, text)
-                return Response(result)
+    best = COMMAND_MATCHER.first(text_lower)
+    if best:
+        handler = best['intent']
+        return Response(handler(tenant, text_lower, text))
 
     # No match
     return Response({
@@ -0,0 +1,166 @@
+"""
+Per-tenant content versions and conditional GET for public endpoints.
+
+The public read-heavy endpoints (menu, CMS pages and blog, shop products,
+gym class types, branding) render the same payload for every visitor until
+the tenant edits something. Each tenant has a TenantContentVersion row;
+saving or deleting any model those endpoints render (CONTENT_MODELS) bumps
+it — signals wired by connect_signals() from CoreConfig.ready().
+
+@conditional_content, placed under @api_view:
+- derives a strong ETag from tenant, content version, the full request URL
+  and the negotiated media type, and Last-Modified from the version's
+  timestamp (one primary-key query);
+- answers a matching If-None-Match (or If-Modified-Since) with 304 before
+  the view runs, so nothing is queried or serialized;
+- sets Cache-Control: browsers always revalidate (max-age=0); shared caches
+  (Vercel, CDN) may keep the response for PUBLIC_CACHE_S_MAXAGE seconds and
+  serve it stale for PUBLIC_CACHE_STALE_WHILE_REVALIDATE while refetching.
+  That only applies when the tenant came from the X-Tenant-Slug header or
+  ?tenant= (Vary covers the header) — a tenant inferred from the logged-in
+  user or the first-tenant fallback makes the response private.
+
+Queryset .update() and bulk_create() don't send signals: call bump(tenant)
+after using them on a content model (core.bulk_seed.bulk_get_or_create does,
+via bump_for()).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+# (app label, model, attribute path from an instance to its tenant id)
+CONTENT_MODELS = [
+    ('tenants', 'TenantSettings', 'pk'),
+    ('cms', 'Page', 'tenant_id'),
+    ('cms', 'PageImage', 'page.tenant_id'),
+    ('cms', 'BlogPost', 'tenant_id'),
+    ('shop', 'Product', 'tenant_id'),
+    ('shop', 'ProductImage', 'product.tenant_id'),
+    ('orders', 'MenuCategory', 'tenant_id'),
+    ('orders', 'MenuItem', 'tenant_id'),
+    ('bookings', 'ClassType', 'tenant_id'),
+]
+
+_tenant_paths = {}   # model class → attribute path, filled by connect_signals()
+
+
+def current(tenant):
+    """The tenant's TenantContentVersion, created at version 1 on first use."""
+    from .models import TenantContentVersion
+    row, _ = TenantContentVersion.objects.get_or_create(
+        tenant_id=tenant.pk, defaults={'updated_at': timezone.now()},
+    )
+    return row
+
+
+def bump(tenant):
+    """
+    Invalidate every ETag issued for the tenant. A tenant with no version row
+    has never had one issued, so there is nothing to bump.
+    """
+    from .models import TenantContentVersion
+    TenantContentVersion.objects.filter(tenant_id=getattr(tenant, 'pk', tenant)).update(
+        version=F('version') + 1, updated_at=timezone.now(),
+    )
+
+
+def bump_for(model, instances):
+    """bump() each tenant owning one of `instances` if `model` is a content model; no-op otherwise."""
+    path = _tenant_paths.get(model)
+    if path is None:
+        return
+    for tenant_id in {_tenant_id(obj, path) for obj in instances} - {None}:
+        bump(tenant_id)
+
+
+def _tenant_id(instance, path):
+    value = instance
+    try:
+        for attr in path.split('.'):
+            value = getattr(value, attr)
+    except ObjectDoesNotExist:
+        return None  # parent already gone in a cascade — its own delete bumps
+    return value
+
+
+def _content_changed(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return  # loaddata
+    tenant_id = _tenant_id(instance, _tenant_paths[sender])
+    if tenant_id is not None:
+        bump(tenant_id)
+
+
+def connect_signals():
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+    for app_label, model_name, path in CONTENT_MODELS:
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            continue  # module disabled
+        _tenant_paths[model] = path
+        uid = f'content-version:{app_label}.{model_name}'
+        post_save.connect(_content_changed, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_content_changed, sender=model, dispatch_uid=f'{uid}:delete')
+
+
+def request_version(request):
+    """The request tenant's TenantContentVersion (loaded once per request), or None."""
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        return None
+    if not hasattr(request, '_content_version'):
+        request._content_version = current(tenant)
+    return request._content_version
+
+
+def request_etag(request, *args, **kwargs):
+    """Unquoted strong ETag for this request's URL at the tenant's current content version."""
+    row = request_version(request)
+    if row is None:
+        return None
+    # updated_at too, so a recreated tenant/version row can't reuse an old ETag
+    key = (f'{row.tenant_id}:{row.version}:{row.updated_at.isoformat()}:'
+           f'{request.build_absolute_uri()}:{getattr(request, "accepted_media_type", "")}')
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _last_modified(request, *args, **kwargs):
+    row = request_version(request)
+    return row.updated_at if row else None
+
+
+def _tenant_from_url_or_header(request):
+    return bool(request.META.get('HTTP_X_TENANT_SLUG') or request.GET.get('tenant'))
+
+
+def conditional_content(view):
+    """Decorator for public tenant-content GET views (see module docstring)."""
+    conditioned = condition(etag_func=request_etag, last_modified_func=_last_modified)(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = conditioned(request, *args, **kwargs)
+        if response.status_code not in (200, 304) or getattr(request, 'tenant', None) is None:
+            return response
+        if getattr(response, 'serves_stale_content', False):
+            patch_cache_control(response, no_cache=True)  # outdated copy (core.response_cache) — don't share it
+        elif _tenant_from_url_or_header(request):
+            patch_cache_control(
+                response, public=True, max_age=0,
+                s_maxage=settings.PUBLIC_CACHE_S_MAXAGE,
+                stale_while_revalidate=settings.PUBLIC_CACHE_STALE_WHILE_REVALIDATE,
+            )
+        else:
+            patch_cache_control(response, private=True, max_age=0)
+        patch_vary_headers(response, ('X-Tenant-Slug', 'Accept'))
+        return response
+
+    return wrapper
@@ -5,15 +5,28 @@ Suggests cover candidates for sick/absent staff using configurable strategy:
 - 7-day rotation (default): round-robin based on last cover date
 - Tiered: ordered by seniority or predefined tier
 
+Candidates are always drawn from the absent member's own tenant. Cover
+history is read from BusinessEvent.covering_staff_id (indexed, set when a
+COVER_ACCEPTED event is saved), never by scanning event payloads.
+
 Rules:
 - Must show WHY a person is suggested
 - If declined → log COVER_DECLINED, suggest next candidate
 - Never auto-assign — owner always confirms
 """
 from datetime import timedelta
+from django.db.models import BooleanField, Case, OuterRef, Subquery, Value, When
 from django.utils import timezone
 
 
+def _colleagues(absent_staff_id):
+    """Active booking staff in the absent member's tenant, excluding them."""
+    from bookings.models import Staff as BookingStaff
+    return BookingStaff.objects.filter(
+        active=True, tenant__booking_staff__id=absent_staff_id,
+    ).exclude(id=absent_staff_id)
+
+
 def get_cover_candidates(absent_staff_id, service=None, strategy='rotation', max_candidates=3):
     """
     Return ordered list of cover candidates with reasons.
@@ -26,9 +39,7 @@ def get_cover_candidates(absent_staff_id, service=None, strategy='rotation', max
         'rank': int,
     }
     """
-    from bookings.models import Staff as BookingStaff
-
-    base_qs = BookingStaff.objects.filter(active=True).exclude(id=absent_staff_id)
+    base_qs = _colleagues(absent_staff_id)
 
     # Filter by service qualification if provided
     if service:
@@ -42,54 +53,78 @@ def get_cover_candidates(absent_staff_id, service=None, strategy='rotation', max
         return _rotation_candidates(base_qs, max_candidates)
 
 
-def _rotation_candidates(staff_qs, max_candidates):
+def with_rotation_order(staff_qs):
     """
-    7-day rotation: prefer staff who haven't covered recently.
-    Uses BusinessEvent log to determine last cover date per staff member.
+    Annotate staff with `last_cover` (latest COVER_ACCEPTED in their tenant,
+    via the indexed covering_staff_id) and `recently_covered` (within 7 days),
+    ordered for the rotation: not covered recently first, then by name.
     """
     from core.models_events import BusinessEvent
 
     seven_days_ago = timezone.now() - timedelta(days=7)
-
-    # Get recent cover events to determine who covered last
-    recent_covers = BusinessEvent.objects.filter(
+    last_cover = BusinessEvent.objects.filter(
         event_type='COVER_ACCEPTED',
-        created_at__gte=seven_days_ago,
-    ).values_list('payload', flat=True)
+        covering_staff_id=OuterRef('pk'),
+        tenant_id=OuterRef('tenant_id'),
+    ).order_by('-created_at').values('created_at')[:1]
+    return staff_qs.annotate(last_cover=Subquery(last_cover)).annotate(
+        recently_covered=Case(
+            When(last_cover__gte=seven_days_ago, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    ).order_by('recently_covered', 'name')
+
+
+def _rotation_entry(staff, rank):
+    return {
+        'staff_id': staff.id,
+        'name': staff.name,
+        'reason': (
+            'Available (covered recently — last 7 days)' if staff.recently_covered
+            else 'Next in 7-day rotation and available'
+        ),
+        'rank': rank,
+    }
 
-    # Extract staff IDs who covered recently
-    recently_covered_ids = set()
-    for payload in recent_covers:
-        if isinstance(payload, dict) and 'cover_staff_id' in payload:
-            recently_covered_ids.add(payload['cover_staff_id'])
 
-    candidates = []
-    rank = 1
-
-    # First: staff who haven't covered in 7 days
-    for staff in staff_qs.order_by('name'):
-        if staff.id not in recently_covered_ids and rank <= max_candidates:
-            candidates.append({
-                'staff_id': staff.id,
-                'name': staff.name,
-                'reason': f'Next in 7-day rotation and available',
-                'rank': rank,
-            })
-            rank += 1
-
-    # Then: staff who have covered recently (if we need more)
-    if rank <= max_candidates:
-        for staff in staff_qs.order_by('name'):
-            if staff.id in recently_covered_ids and rank <= max_candidates:
-                candidates.append({
-                    'staff_id': staff.id,
-                    'name': staff.name,
-                    'reason': f'Available (covered recently — last 7 days)',
-                    'rank': rank,
-                })
-                rank += 1
-
-    return candidates[:max_candidates]
+def _rotation_candidates(staff_qs, max_candidates):
+    """
+    7-day rotation: prefer staff who haven't covered recently.
+    One ordered query — the last cover date per staff member is an indexed
+    subquery on BusinessEvent.covering_staff_id, so cost is O(staff).
+    """
+    return [
+        _rotation_entry(staff, rank)
+        for rank, staff in enumerate(with_rotation_order(staff_qs)[:max_candidates], start=1)
+    ]
+
+
+def rotation_candidates_for(absent_staff, max_candidates=3):
+    """
+    get_cover_candidates(strategy='rotation') for several absent booking staff
+    at once: {absent staff id: candidates}, from a single query.
+    """
+    from bookings.models import Staff as BookingStaff
+
+    absent_staff = {s.id: s for s in absent_staff}
+    if not absent_staff:
+        return {}
+    by_tenant = {}
+    staff_qs = BookingStaff.objects.filter(
+        active=True, tenant_id__in={s.tenant_id for s in absent_staff.values()},
+    )
+    for staff in with_rotation_order(staff_qs):
+        by_tenant.setdefault(staff.tenant_id, []).append(staff)
+    return {
+        absent.id: [
+            _rotation_entry(staff, rank)
+            for rank, staff in enumerate(
+                [s for s in by_tenant.get(absent.tenant_id, []) if s.id != absent.id][:max_candidates], start=1,
+            )
+        ]
+        for absent in absent_staff.values()
+    }
 
 
 def _tiered_candidates(staff_qs, max_candidates):
@@ -112,11 +147,7 @@ def get_next_candidate(absent_staff_id, declined_staff_ids, service=None, strate
     """
     After a decline, get the next candidate excluding already-declined staff.
     """
-    from bookings.models import Staff as BookingStaff
-
-    base_qs = BookingStaff.objects.filter(active=True).exclude(
-        id=absent_staff_id
-    ).exclude(id__in=declined_staff_ids)
+    base_qs = _colleagues(absent_staff_id).exclude(id__in=declined_staff_ids)
 
     if service:
         base_qs = base_qs.filter(services=service)
@@ -0,0 +1,215 @@
+"""
+Responsive image derivatives for uploaded photos.
+
+Originals (often multi-MB phone photos) stay as uploaded. Next to each one,
+the `generate_image_derivatives` worker writes resized copies at
+IMAGE_DERIVATIVE_WIDTHS in WebP and JPEG:
+
+    cms/pages/2026/10/shopfront.jpg
+    cms/pages/2026/10/shopfront.w640.webp
+    cms/pages/2026/10/shopfront.w640.jpg   ...
+
+It never upscales — widths at or above the original's are skipped. What was
+written goes in the model's `<field>_renditions` JSON column:
+
+    {"src": <original name>, "width": 4032, "height": 3024,
+     "variants": {"webp": {"640": <name>, ...}, "jpeg": {...}}}
+
+NULL means "not generated yet". Rows get it on creation and whenever the
+image is replaced (post_save notices `src` no longer matches). Existing rows
+start out NULL too, so the worker backfills them a batch at a time.
+Serializers call srcset(), which returns None until the derivatives exist —
+frontends keep using the original URL meanwhile. A file Pillow can't read
+records {"src", "error"} and isn't retried until it is replaced.
+
+The worker bumps the tenant's content version (core.content_version) after
+writing renditions, because update() sends no signals and the public JSON
+cache would otherwise keep serving the payload without srcsets.
+"""
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# (app label, model, image field, ORM path to the tenant id — None if not public content)
+IMAGE_FIELDS = [
+    ('cms', 'Page', 'hero_image', 'tenant_id'),
+    ('cms', 'PageImage', 'image', 'page__tenant_id'),
+    ('cms', 'BlogPost', 'featured_image', 'tenant_id'),
+    ('shop', 'ProductImage', 'image', 'product__tenant_id'),
+    ('compliance', 'IncidentPhoto', 'image', None),
+]
+
+FORMATS = {'webp': ('WEBP', 'webp'), 'jpeg': ('JPEG', 'jpg')}   # key → (Pillow format, extension)
+EXIF_ORIENTATION = 0x0112
+
+
+def renditions_field(field_name):
+    return f'{field_name}_renditions'
+
+
+def derivative_name(name, width, fmt):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.w{width}.{FORMATS[fmt][1]}'
+
+
+def _registered():
+    from django.apps import apps
+    for app_label, model_name, field_name, tenant_path in IMAGE_FIELDS:
+        try:
+            yield apps.get_model(app_label, model_name), field_name, tenant_path
+        except LookupError:
+            continue  # module disabled
+
+
+# ── Rendering ──
+
+def _flatten(image):
+    """RGB for JPEG — transparent areas on white."""
+    from PIL import Image
+    if image.mode != 'RGBA':
+        return image.convert('RGB')
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def render(storage, name, widths=None):
+    """Write every derivative of `name` and return its renditions dict."""
+    from PIL import Image, ImageOps
+
+    widths = sorted(widths or settings.IMAGE_DERIVATIVE_WIDTHS)
+    quality = settings.IMAGE_DERIVATIVE_QUALITY
+    try:
+        with storage.open(name, 'rb') as fh:
+            image = Image.open(fh)
+            width, height = image.size
+            if image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+                width, height = height, width
+            # JPEG decodes at 1/2–1/8 scale for free while staying ≥ the widest derivative
+            largest = max((w for w in widths if w < width), default=0)
+            if largest:
+                image.draft('RGB', (largest, largest))
+            image.load()
+        image = ImageOps.exif_transpose(image)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning('[IMAGES] Cannot read %s: %s', name, e)
+        return {'src': name, 'error': str(e)[:200]}
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    variants = {fmt: {} for fmt in FORMATS}
+    for target in widths:
+        if target >= width:
+            continue
+        resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+        for fmt, (pil_format, _) in FORMATS.items():
+            buffer = io.BytesIO()
+            if fmt == 'jpeg':
+                _flatten(resized).save(buffer, pil_format, quality=quality, optimize=True, progressive=True)
+            else:
+                resized.save(buffer, pil_format, quality=quality, method=4)
+            path = derivative_name(name, target, fmt)
+            storage.delete(path)   # same name on regeneration, not name_abc123.webp
+            variants[fmt][str(target)] = storage.save(path, ContentFile(buffer.getvalue()))
+    return {'src': name, 'width': width, 'height': height, 'variants': variants}
+
+
+def delete_derivatives(storage, renditions):
+    for names in (renditions or {}).get('variants', {}).values():
+        for path in names.values():
+            storage.delete(path)
+
+
+# ── Worker ──
+
+def process_pending(batch=50):
+    """Render up to `batch` images per registered field that have no renditions yet. Returns how many."""
+    from core import content_version
+
+    done = 0
+    tenants = set()
+    for model, field_name, tenant_path in _registered():
+        column = renditions_field(field_name)
+        storage = model._meta.get_field(field_name).storage
+        rows = (model.objects.filter(**{f'{column}__isnull': True})
+                .exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .order_by('pk').values_list('pk', field_name, *filter(None, [tenant_path]))[:batch])
+        for pk, name, *tenant_id in rows:
+            data = render(storage, name)
+            # Only if the image wasn't replaced meanwhile
+            if model.objects.filter(pk=pk, **{field_name: name}).update(**{column: data}):
+                done += 1
+                tenants.update(tenant_id)
+            else:
+                delete_derivatives(storage, data)
+    for tenant_id in tenants:
+        content_version.bump(tenant_id)
+    return done
+
+
+# ── Serializers ──
+
+def srcset(field_file, renditions, absolute=None):
+    """
+    {"width", "height", "webp", "jpeg"} for a <picture>: each of webp/jpeg
+    is a srcset string ("<url> 640w, <url> 1024w"). The original joins the
+    jpeg list only when it is no wider than the largest derivative width, so
+    big originals are never picked. None until the derivatives exist.
+    """
+    if not field_file or not renditions or renditions.get('src') != field_file.name or 'variants' not in renditions:
+        return None
+    storage = field_file.storage
+    absolute = absolute or (lambda url: url)
+
+    def candidates(names):
+        return [(int(w), absolute(storage.url(path))) for w, path in names.items()]
+
+    webp = sorted(candidates(renditions['variants'].get('webp', {})))
+    jpeg = sorted(candidates(renditions['variants'].get('jpeg', {})))
+    if not webp and not jpeg:
+        return None
+    if renditions['width'] <= max(settings.IMAGE_DERIVATIVE_WIDTHS):
+        jpeg.append((renditions['width'], absolute(field_file.url)))
+    return {
+        'width': renditions['width'],
+        'height': renditions['height'],
+        'webp': ', '.join(f'{url} {w}w' for w, url in webp),
+        'jpeg': ', '.join(f'{url} {w}w' for w, url in jpeg),
+    }
+
+
+# ── Signals ──
+
+_fields = {}   # model class → image field name, filled by connect_signals()
+
+
+def _image_saved(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    field_name = _fields[sender]
+    column = renditions_field(field_name)
+    data = getattr(instance, column)
+    name = getattr(instance, field_name).name or ''
+    if data is not None and data.get('src') != name:
+        delete_derivatives(getattr(instance, field_name).storage, data)
+        sender.objects.filter(pk=instance.pk).update(**{column: None})
+        setattr(instance, column, None)
+
+
+def _image_deleted(sender, instance, **kwargs):
+    field_name = _fields[sender]
+    delete_derivatives(getattr(instance, field_name).storage, getattr(instance, renditions_field(field_name)))
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+    for model, field_name, _ in _registered():
+        _fields[model] = field_name
+        uid = f'image-derivatives:{model._meta.label}'
+        post_save.connect(_image_saved, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_image_deleted, sender=model, dispatch_uid=f'{uid}:delete')
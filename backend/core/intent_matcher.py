@@ -0,0 +1,106 @@
+"""
+Intent Matcher — compiled keyword matching for the command parsers.
+
+The assistant parser (views_assistant.PARSE_RULES), the command bar
+(command_router.COMMAND_MAP) and the compliance parser each map keyword lists
+to intents. Instead of testing every keyword with `in` on every command, each
+rule set is compiled once at import into an Aho-Corasick automaton:
+
+- One pass over the text finds every keyword occurrence, so matching cost
+  depends on the text length (plus matches), not on the number of rules.
+- Matching semantics are unchanged: plain substring matches, and the winner
+  is the first rule in list order that has any keyword in the text, reporting
+  that rule's first listed keyword that matched.
+- `match()` also returns every other matching intent, ranked the same way,
+  with the character spans of each keyword hit.
+
+Micro-benchmark: `python manage.py bench_intent_matcher`.
+"""
+from collections import deque
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton over [(intent, keywords)] rules (case-insensitive)."""
+
+    def __init__(self, rules):
+        self.rules = [(intent, list(keywords)) for intent, keywords in rules]
+        self._goto = [{}]    # state → {char: state}
+        self._fail = [0]
+        self._out = [[]]     # state → [(rule index, keyword index, length)]
+
+        for r, (_, keywords) in enumerate(self.rules):
+            for k, keyword in enumerate(keywords):
+                state = 0
+                for ch in keyword.lower():
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                    state = nxt
+                self._out[state].append((r, k, len(keyword)))
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def hits(self, text):
+        """Every keyword occurrence: [(rule index, keyword index, start, end)] in text order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found = []
+        for i, ch in enumerate(text.lower()):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for r, k, n in out[state]:
+                found.append((r, k, i - n + 1, i + 1))
+        return found
+
+    def match(self, text):
+        """
+        Matching intents, best first:
+        [{'intent', 'rank', 'keyword', 'spans': [(start, end, keyword)]}]
+        `rank` is the rule's position in the rule list; `keyword` is the
+        rule's first listed keyword found in the text.
+        """
+        by_rule = {}
+        for r, k, start, end in self.hits(text):
+            by_rule.setdefault(r, []).append((k, start, end))
+
+        results = []
+        for r in sorted(by_rule):
+            intent, keywords = self.rules[r]
+            rule_hits = sorted(by_rule[r], key=lambda h: h[1])
+            results.append({
+                'intent': intent,
+                'rank': r,
+                'keyword': keywords[min(k for k, _, _ in rule_hits)],
+                'spans': [(start, end, keywords[k]) for k, start, end in rule_hits],
+            })
+        return results
+
+    def first(self, text):
+        """The best match (see match()) or None."""
+        results = self.match(text)
+        return results[0] if results else None
+
+
+def naive_first(rules, text):
+    """The original nested-loop scan — kept for the benchmark and equivalence tests."""
+    text = text.lower()
+    for intent, keywords in rules:
+        for kw in keywords:
+            if kw in text:
+                return intent, kw
+    return None
@@ -0,0 +1,392 @@
+"""
+LLM Gateway
+
+Every chat-completion call in the platform goes through `complete()`:
+the AI assistant chat panel, the RAMS safety review and the CRM email parser.
+
+- Content-addressed response cache: the key is a SHA-256 of the canonical
+  request (model, messages incl. tool results, tools, sampling params), so an
+  identical prompt + tool-result sequence is answered without a round trip.
+- Per-call accounting: latency and prompt/completion tokens are logged and
+  totalled per purpose in process (`stats()`).
+- Pluggable backends selected by settings.LLM_BACKEND:
+    'openai' — the real API (default)
+    'local'  — deterministic offline stand-in with latency injection, so
+               benchmarks and tests run without an API key.
+
+`stream()` is the token-by-token variant used by the streaming assistant.
+Responses are normalised to plain dicts, so assistant messages can be fed
+straight back into the next request (and hash the same every time).
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'llm'
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+
+
+class LLMUnavailable(Exception):
+    """No backend is configured (e.g. OPENAI_API_KEY missing)."""
+
+
+class Completion:
+    """One normalised chat completion."""
+
+    def __init__(self, message, prompt_tokens=0, completion_tokens=0, latency_ms=0.0,
+                 cached=False, backend='', model=''):
+        self.message = message
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.latency_ms = latency_ms
+        self.cached = cached
+        self.backend = backend
+        self.model = model
+
+    @property
+    def content(self):
+        return self.message.get('content') or ''
+
+    @property
+    def tool_calls(self):
+        return self.message.get('tool_calls') or []
+
+    def json(self):
+        """Content parsed as JSON (for response_format=json_object calls)."""
+        return json.loads(self.content)
+
+    def to_cache(self):
+        return {
+            'message': self.message,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'backend': self.backend,
+            'model': self.model,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════
+# BACKENDS
+# ═══════════════════════════════════════════════════════════════
+
+class OpenAIBackend:
+    name = 'openai'
+
+    def __init__(self, api_key=None):
+        import os
+        self.api_key = api_key or getattr(settings, 'OPENAI_API_KEY', '') or os.environ.get('OPENAI_API_KEY', '')
+        self._client = None
+
+    def available(self):
+        return bool(self.api_key)
+
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    def complete(self, request):
+        response = self.client().chat.completions.create(**request)
+        msg = response.choices[0].message
+        message = {'role': 'assistant', 'content': msg.content}
+        if msg.tool_calls:
+            message['tool_calls'] = [
+                {
+                    'id': tc.id,
+                    'type': 'function',
+                    'function': {'name': tc.function.name, 'arguments': tc.function.arguments},
+                }
+                for tc in msg.tool_calls
+            ]
+        usage = response.usage
+        return message, getattr(usage, 'prompt_tokens', 0) or 0, getattr(usage, 'completion_tokens', 0) or 0
+
+    def stream(self, request):
+        """Yield content deltas, then (message, prompt_tokens, completion_tokens)."""
+        response = self.client().chat.completions.create(
+            **request, stream=True, stream_options={'include_usage': True},
+        )
+        content, calls = [], {}
+        prompt_tokens = completion_tokens = 0
+        for chunk in response:
+            if chunk.usage:
+                prompt_tokens, completion_tokens = chunk.usage.prompt_tokens, chunk.usage.completion_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+                yield delta.content
+            # Tool calls arrive in fragments keyed by index
+            for tc in delta.tool_calls or []:
+                slot = calls.setdefault(tc.index, {'id': '', 'type': 'function', 'function': {'name': '', 'arguments': ''}})
+                if tc.id:
+                    slot['id'] = tc.id
+                if tc.function and tc.function.name:
+                    slot['function']['name'] += tc.function.name
+                if tc.function and tc.function.arguments:
+                    slot['function']['arguments'] += tc.function.arguments
+        message = {'role': 'assistant', 'content': ''.join(content) or None}
+        if calls:
+            message['tool_calls'] = [calls[i] for i in sorted(calls)]
+        yield message, prompt_tokens, completion_tokens
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class LocalBackend:
+    """
+    Deterministic offline stand-in. The same request always produces the same
+    response, after a simulated delay of
+        latency_ms + ms_per_token × completion tokens.
+
+    - With tools and no tool results yet: calls the tool whose name shares the
+      most words with the latest user message (or replies directly).
+    - After tool results: replies with a short summary of the tools called.
+    - response_format=json_object: returns a JSON object echoing the prompt.
+    """
+    name = 'local'
+
+    def __init__(self, latency_ms=None, ms_per_token=None):
+        self.latency_ms = latency_ms if latency_ms is not None else getattr(settings, 'LLM_LOCAL_LATENCY_MS', 0)
+        self.ms_per_token = ms_per_token if ms_per_token is not None else getattr(settings, 'LLM_LOCAL_MS_PER_TOKEN', 0)
+
+    def available(self):
+        return True
+
+    def _prompt_tokens(self, request):
+        tokens = sum(estimate_tokens(json.dumps(m, default=str)) for m in request.get('messages', []))
+        if request.get('tools'):
+            tokens += estimate_tokens(json.dumps(request['tools']))
+        return tokens
+
+    def complete(self, request):
+        message = self.respond(request)
+        completion_tokens = estimate_tokens(json.dumps(message))
+        delay = self.latency_ms + self.ms_per_token * completion_tokens
+        if delay:
+            time.sleep(delay / 1000.0)
+        return message, self._prompt_tokens(request), completion_tokens
+
+    def stream(self, request):
+        """Same response as complete(), content emitted word by word at ms_per_token."""
+        message = self.respond(request)
+        completion_tokens = estimate_tokens(json.dumps(message))
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)  # time to first token
+        for word in re.findall(r'\S+\s*', message.get('content') or ''):
+            if self.ms_per_token:
+                time.sleep(self.ms_per_token * estimate_tokens(word) / 1000.0)
+            yield word
+        yield message, self._prompt_tokens(request), completion_tokens
+
+    def respond(self, request):
+        messages = request.get('messages', [])
+        last_user = next((m.get('content') or '' for m in reversed(messages) if m.get('role') == 'user'), '')
+        digest = _digest(request)[:12]
+
+        if (request.get('response_format') or {}).get('type') == 'json_object':
+            summary = ' '.join(last_user.split())[:200]
+            return {'role': 'assistant', 'content': json.dumps({'summary': summary, 'source': 'local'})}
+
+        # Tool results since the last user message → summarise them
+        called = []
+        for m in reversed(messages):
+            if m.get('role') == 'user':
+                break
+            if m.get('role') == 'assistant':
+                called.extend(tc['function']['name'] for tc in m.get('tool_calls') or [])
+        if called:
+            return {'role': 'assistant', 'content': f"Done — checked {', '.join(reversed(called))}."}
+
+        tool = self._pick_tool(last_user, request.get('tools') or [])
+        if tool:
+            return {
+                'role': 'assistant',
+                'content': None,
+                'tool_calls': [{
+                    'id': f'call_{digest}',
+                    'type': 'function',
+                    'function': {'name': tool, 'arguments': '{}'},
+                }],
+            }
+        return {'role': 'assistant', 'content': 'Understood.'}
+
+    @staticmethod
+    def _pick_tool(text, tools):
+        words = set(re.findall(r'[a-z]+', text.lower()))
+        best, best_score = None, 0
+        for t in tools:
+            name = t.get('function', {}).get('name', '')
+            score = len(words & (set(name.split('_')) - {'get', 'tool'}))
+            if score > best_score:
+                best, best_score = name, score
+        return best
+
+
+BACKENDS = {
+    'openai': OpenAIBackend,
+    'local': LocalBackend,
+}
+
+_backend = None
+_override = None
+
+
+def get_backend():
+    """The configured backend (settings.LLM_BACKEND), created once per process."""
+    global _backend
+    if _override is not None:
+        return _override
+    name = getattr(settings, 'LLM_BACKEND', 'openai')
+    if _backend is None or _backend.name != name:
+        _backend = BACKENDS[name]()
+    return _backend
+
+
+def set_backend(backend):
+    """Swap in a backend instance (tests, benchmarks). None restores the configured one."""
+    global _override
+    _override = backend
+
+
+def is_configured():
+    return get_backend().available()
+
+
+# ═══════════════════════════════════════════════════════════════
+# ACCOUNTING
+# ═══════════════════════════════════════════════════════════════
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(purpose, completion):
+    with _stats_lock:
+        row = _stats.setdefault(purpose, {
+            'calls': 0, 'cache_hits': 0, 'latency_ms': 0.0,
+            'prompt_tokens': 0, 'completion_tokens': 0,
+        })
+        row['calls'] += 1
+        if completion.cached:
+            row['cache_hits'] += 1
+        else:
+            row['latency_ms'] += completion.latency_ms
+            row['prompt_tokens'] += completion.prompt_tokens
+            row['completion_tokens'] += completion.completion_tokens
+
+
+def stats():
+    """{purpose: {calls, cache_hits, latency_ms, prompt_tokens, completion_tokens}} for this process."""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+# ═══════════════════════════════════════════════════════════════
+# GATEWAY
+# ═══════════════════════════════════════════════════════════════
+
+def _digest(request):
+    canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _prepare(messages, model, tools, use_cache, params):
+    backend = get_backend()
+    if not backend.available():
+        raise LLMUnavailable('AI is not configured. Set OPENAI_API_KEY in environment.')
+
+    request = {'model': model or getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini'), 'messages': messages, **params}
+    if tools:
+        request['tools'] = tools
+
+    timeout = getattr(settings, 'LLM_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+    key = f'{CACHE_PREFIX}:{backend.name}:{_digest(request)}' if use_cache and timeout else None
+    return backend, request, key, timeout
+
+
+def _cached(purpose, key):
+    hit = cache.get(key) if key else None
+    if hit is None:
+        return None
+    completion = Completion(cached=True, **hit)
+    _record(purpose, completion)
+    return completion
+
+
+def _finish(purpose, backend, request, key, timeout, started, message, prompt_tokens, completion_tokens):
+    completion = Completion(
+        message,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        latency_ms=round((time.monotonic() - started) * 1000, 1),
+        backend=backend.name,
+        model=request['model'],
+    )
+    _record(purpose, completion)
+    logger.info(
+        '[LLM] %s via %s: %.0fms, %d prompt + %d completion tokens',
+        purpose, backend.name, completion.latency_ms, prompt_tokens, completion_tokens,
+    )
+    if key:
+        cache.set(key, completion.to_cache(), timeout)
+    return completion
+
+
+def complete(messages, purpose='default', model=None, tools=None, use_cache=True, **params):
+    """
+    Run one chat completion through the configured backend.
+
+    `params` are passed through (temperature, max_tokens, tool_choice,
+    response_format). Returns a Completion; raises LLMUnavailable when no
+    backend is configured, and lets backend errors propagate.
+    """
+    backend, request, key, timeout = _prepare(messages, model, tools, use_cache, params)
+    completion = _cached(purpose, key)
+    if completion:
+        return completion
+
+    started = time.monotonic()
+    message, prompt_tokens, completion_tokens = backend.complete(request)
+    return _finish(purpose, backend, request, key, timeout, started, message, prompt_tokens, completion_tokens)
+
+
+def stream(messages, purpose='default', model=None, tools=None, use_cache=True, **params):
+    """
+    complete() as a generator: yields content chunks (str) as the backend
+    produces them, then the finished Completion as the last item. A cache
+    hit yields its whole content as one chunk.
+    """
+    backend, request, key, timeout = _prepare(messages, model, tools, use_cache, params)
+    completion = _cached(purpose, key)
+    if completion:
+        if completion.content:
+            yield completion.content
+        yield completion
+        return
+
+    started = time.monotonic()
+    for item in backend.stream(request):
+        if isinstance(item, str):
+            yield item
+        else:
+            message, prompt_tokens, completion_tokens = item
+    yield _finish(purpose, backend, request, key, timeout, started, message, prompt_tokens, completion_tokens)
@@ -0,0 +1,64 @@
+"""
+Management command to run the whole deploy start-up sequence in one process.
+
+Usage:
+    python manage.py bootstrap                      # Run the default phase graph
+    python manage.py bootstrap --jobs 6             # More concurrent phases
+    python manage.py bootstrap --force              # Ignore fingerprints, re-run every seed
+    python manage.py bootstrap --reseed salon-x     # Clear + reseed one demo tenant
+    python manage.py bootstrap --list               # Show phases and dependencies
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bootstrap import BootstrapError, default_phases, run_bootstrap
+
+
+class Command(BaseCommand):
+    help = 'Run migrate, collectstatic and all start-up seeds as one dependency-ordered pipeline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=4, help='Max phases to run concurrently (default: 4)')
+        parser.add_argument('--force', action='store_true', help='Re-run seeds even if their fingerprint is unchanged')
+        parser.add_argument('--reseed', type=str, default='', help='Delete and reseed demo data for this tenant slug')
+        parser.add_argument('--list', action='store_true', help='List phases and dependencies without running')
+        parser.add_argument('--verbose-phases', action='store_true', help='Print each phase\'s command output')
+
+    def handle(self, *args, **options):
+        phases = default_phases(reseed=options['reseed'] or None)
+
+        if options['list']:
+            for p in phases:
+                deps = ', '.join(p.deps) or '—'
+                flags = ' [always]' if p.always else (' [daily]' if p.daily else '')
+                self.stdout.write(f'  {p.name:<32} after: {deps}{flags}')
+            return
+
+        verbose = options['verbose_phases']
+
+        def log(result):
+            if result['status'] == 'skipped':
+                self.stdout.write(f"[BOOT] {result['phase']}: unchanged — skipped")
+                return
+            if result['status'] == 'failed':
+                self.stderr.write(self.style.ERROR(
+                    f"[BOOT] {result['phase']}: FAILED after {result['seconds']:.1f}s — {result['error']}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"[BOOT] {result['phase']}: done in {result['seconds']:.1f}s"))
+            if (verbose or result['status'] == 'failed') and result['output'].strip():
+                for line in result['output'].rstrip().splitlines():
+                    self.stdout.write(f"    {result['phase']} | {line}")
+
+        try:
+            results, wall = run_bootstrap(phases, jobs=options['jobs'], force=options['force'], log=log)
+        except BootstrapError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write('\n[BOOT] Phase timings:')
+        for r in sorted(results, key=lambda r: -r['seconds']):
+            self.stdout.write(f"  {r['phase']:<32} {r['status']:<8} {r['seconds']:7.2f}s")
+        serial = sum(r['seconds'] for r in results)
+        failed = sum(1 for r in results if r['status'] == 'failed')
+        skipped = sum(1 for r in results if r['status'] == 'skipped')
+        summary = f'[BOOT] {len(results)} phases ({skipped} skipped, {failed} failed) in {wall:.1f}s wall / {serial:.1f}s serial'
+        self.stdout.write(self.style.WARNING(summary) if failed else self.style.SUCCESS(summary))
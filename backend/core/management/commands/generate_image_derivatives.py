@@ -0,0 +1,51 @@
+"""
+Management command to write resized WebP/JPEG copies of uploaded images
+(see core.images). New uploads and images without derivatives yet — including
+everything uploaded before the pipeline existed — are picked up a batch at a time.
+
+Usage:
+    python manage.py generate_image_derivatives              # Run once
+    python manage.py generate_image_derivatives --loop       # Run continuously (for Railway)
+    python manage.py generate_image_derivatives --all        # Once, until nothing is left
+"""
+import time
+import logging
+from django.core.management.base import BaseCommand
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive image derivatives for CMS, shop and incident photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Run continuously (for Railway background worker)')
+        parser.add_argument('--all', action='store_true', help='Keep going until every image has derivatives')
+        parser.add_argument('--batch', type=int, default=50, help='Images per model per pass (default: 50)')
+        parser.add_argument('--interval', type=int, default=None,
+                            help='Seconds between passes with --loop (default: IMAGE_DERIVATIVE_INTERVAL)')
+
+    def handle(self, *args, **options):
+        from core.images import process_pending
+
+        batch = options['batch']
+        if not options['loop']:
+            total = done = process_pending(batch)
+            while options['all'] and done:
+                done = process_pending(batch)
+                total += done
+            self.stdout.write(self.style.SUCCESS(f'[IMAGES] Generated derivatives for {total} image(s)'))
+            return
+
+        interval = options['interval'] or settings.IMAGE_DERIVATIVE_INTERVAL
+        self.stdout.write(self.style.SUCCESS(f'[IMAGES] Starting derivative worker (every {interval}s)'))
+        while True:
+            try:
+                done = process_pending(batch)
+                if done:
+                    self.stdout.write(f'[IMAGES] Generated derivatives for {done} image(s)')
+                    continue  # backlog — go again straight away
+            except Exception:
+                logger.exception('[IMAGES] Derivative pass failed')
+            time.sleep(interval)
@@ -0,0 +1,55 @@
+"""
+Profiling middleware — per-endpoint latency and query instrumentation.
+
+Opt-in with PERF_PROFILING=True. When off, __init__ raises MiddlewareNotUsed
+so Django drops it from the stack and requests pay nothing.
+
+When on, every request is timed and its DB queries recorded (count, SQL
+time, duplicate fingerprints) via core.perf.QueryRecorder, then filed under
+the resolved URL name and tenant slug in the rolling store behind
+/api/_perf/. Responses carry a Server-Timing header:
+
+    Server-Timing: app;dur=41.2, db;dur=12.9;desc="14 queries"
+
+Sits near the top of MIDDLEWARE so tenant resolution, auth and audit logging
+are included in the measurement. For streaming responses only the time to
+the first byte is measured. PERF_CAPTURE_SITES=True also attributes
+duplicate queries to the project line that issued them (one stack walk per
+query, so leave it off unless hunting an N+1).
+"""
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from core import perf
+
+
+class PerfProfilingMiddleware:
+    # Reading or clearing the stats shouldn't show up in them
+    SKIP_URL_NAMES = {'perf-stats'}
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.capture_sites = getattr(settings, 'PERF_CAPTURE_SITES', False)
+
+    def __call__(self, request):
+        recorder = perf.QueryRecorder(capture_sites=self.capture_sites)
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.view_name if match else None) or 'unresolved'
+        if url_name not in self.SKIP_URL_NAMES:
+            tenant = getattr(request, 'tenant', None)
+            perf.record(url_name, getattr(tenant, 'slug', None), wall_ms, recorder, response.status_code)
+
+        response['Server-Timing'] = (
+            f'app;dur={wall_ms:.1f}, db;dur={recorder.sql_ms:.1f};desc="{recorder.count} queries"'
+        )
+        return response
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:21
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """Copy payload['cover_staff_id'] of existing COVER_ACCEPTED events into the new column."""
+    BusinessEvent = apps.get_model('core', 'BusinessEvent')
+    updates = []
+    for evt in BusinessEvent.objects.filter(event_type='COVER_ACCEPTED').only('id', 'payload'):
+        try:
+            evt.covering_staff_id = int(evt.payload['cover_staff_id'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        updates.append(evt)
+    BusinessEvent.objects.bulk_update(updates, ['covering_staff_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_backfill_tenant_nonnull'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessevent',
+            name='covering_staff_id',
+            field=models.IntegerField(blank=True, help_text='Booking staff who accepted the cover (COVER_ACCEPTED only)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='businessevent',
+            index=models.Index(fields=['covering_staff_id', 'tenant', 'created_at'], name='core_bizevt_cover_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+"""
+TenantContentVersion — per-tenant counter for public content.
+
+Bumped (core.content_version) whenever anything a public endpoint renders
+changes; the version feeds the ETag/Last-Modified of those endpoints.
+Kept out of TenantSettings so a stale TenantSettings.save() can't write an
+old version back.
+"""
+from django.db import models
+
+
+class TenantContentVersion(models.Model):
+    tenant = models.OneToOneField('tenants.TenantSettings', on_delete=models.CASCADE,
+                                  primary_key=True, related_name='content_version')
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.tenant_id} v{self.version}'
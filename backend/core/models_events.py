@@ -84,6 +84,12 @@ class BusinessEvent(models.Model):
         help_text='Structured data: entities, parameters, assistant parse result, etc.',
     )
 
+    # Denormalised from payload['cover_staff_id'] on COVER_ACCEPTED, for the cover rotation
+    covering_staff_id = models.IntegerField(
+        null=True, blank=True,
+        help_text='Booking staff who accepted the cover (COVER_ACCEPTED only)',
+    )
+
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     class Meta:
@@ -91,6 +97,7 @@ class BusinessEvent(models.Model):
         indexes = [
             models.Index(fields=['event_type', 'created_at']),
             models.Index(fields=['source_entity_type', 'source_entity_id']),
+            models.Index(fields=['covering_staff_id', 'tenant', 'created_at'], name='core_bizevt_cover_idx'),
         ]
         verbose_name = 'Business Event'
         verbose_name_plural = 'Business Events'
@@ -98,6 +105,21 @@ class BusinessEvent(models.Model):
     def __str__(self):
         return f'{self.get_event_type_display()} — {self.action_label} ({self.created_at:%H:%M})'
 
+    @staticmethod
+    def covering_staff_from(event_type, payload):
+        """The covering staff id carried by a COVER_ACCEPTED payload, else None."""
+        if event_type != 'COVER_ACCEPTED' or not isinstance(payload, dict):
+            return None
+        try:
+            return int(payload['cover_staff_id'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, *args, **kwargs):
+        if self.covering_staff_id is None:
+            self.covering_staff_id = self.covering_staff_from(self.event_type, self.payload)
+        super().save(*args, **kwargs)
+
     @classmethod
     def log(cls, event_type, action_label, user=None, source_event_type='',
             source_entity_type='', source_entity_id=None, action_detail='',
@@ -13,6 +13,10 @@ Event types:
   - compliance_expiry Compliance item due/overdue within threshold
   - incident_open     Open H&S incident requiring attention
 
+Every builder prefetches what its events need up front (suggested staff per
+service, affected-booking counts per sick staff member, one shared cover
+rotation), so the query count does not grow with the number of events.
+
 Each event returns:
   {
     'event_type': str,
@@ -133,18 +137,27 @@ def _booking_events(today_start, today_end, tomorrow_end, tenant=None):
         status__in=['confirmed', 'pending'],
     ).select_related('client', 'service')
 
+    unassigned = list(unassigned)
+
+    # Deterministic action: suggest up to 3 active staff per service (one query for all)
+    suggestions = {}
+    if unassigned:
+        links = BookingStaff.services.through.objects.filter(
+            service_id__in={b.service_id for b in unassigned},
+            staff__active=True,
+        ).order_by('staff__name').values_list('service_id', 'staff__name')
+        for service_id, name in links:
+            names = suggestions.setdefault(service_id, [])
+            if len(names) < 3:
+                names.append(name)
+
     for b in unassigned:
         client_name = b.client.name if b.client else 'Unknown client'
         is_today = b.start_time < today_end
         sev = 'critical' if is_today else 'high'
         when = 'today' if is_today else 'tomorrow'
 
-        # Deterministic action: suggest available staff for this service
-        available_staff = list(
-            BookingStaff.objects.filter(
-                services=b.service, active=True
-            ).values_list('name', flat=True)[:3]
-        )
+        available_staff = suggestions.get(b.service_id, [])
         actions = []
         for i, name in enumerate(available_staff):
             actions.append({
@@ -226,25 +239,33 @@ def _staff_leave_events(today_start, today_end, tomorrow_end, tenant=None):
         status__in=['APPROVED', 'REQUESTED'],
     ).select_related('staff_member')
 
-    for lv in sick_today:
-        staff_name = lv.staff_member.name
+    sick_today = list(sick_today)
 
-        # Count affected bookings
+    # Affected-booking counts for every sick staff member in one grouped query,
+    # and one shared cover-candidate computation
+    affected_counts = {}
+    cover_candidates = {}
+    if sick_today:
+        from django.db.models import Count
         from bookings.models import Booking
-        affected_count = Booking.objects.filter(
-            staff=lv.staff_member,
-            start_time__gte=today_start,
-            start_time__lt=today_end,
-            status__in=['confirmed', 'pending'],
-        ).count()
+        from core.cover_logic import rotation_candidates_for
+        sick_staff_ids = {lv.staff_member_id for lv in sick_today}
+        affected_counts = dict(
+            Booking.objects.filter(
+                staff_id__in=sick_staff_ids,
+                start_time__gte=today_start,
+                start_time__lt=today_end,
+                status__in=['confirmed', 'pending'],
+            ).values('staff_id').annotate(n=Count('id')).values_list('staff_id', 'n')
+        )
+        cover_candidates = rotation_candidates_for([lv.staff_member for lv in sick_today], max_candidates=3)
+
+    for lv in sick_today:
+        staff_name = lv.staff_member.name
+        affected_count = affected_counts.get(lv.staff_member_id, 0)
 
         # Deterministic cover suggestion via cover_logic
-        from core.cover_logic import get_cover_candidates
-        candidates = get_cover_candidates(
-            absent_staff_id=lv.staff_member_id,
-            strategy='rotation',
-            max_candidates=3,
-        )
+        candidates = cover_candidates[lv.staff_member_id]
 
         actions = []
         for c in candidates:
@@ -0,0 +1,186 @@
+"""
+Request performance instrumentation (opt-in, PERF_PROFILING=True).
+
+- QueryRecorder: a connection.execute_wrapper that counts queries, sums SQL
+  time and fingerprints each statement (literals and IN-lists collapsed), so
+  the same query shape run repeatedly in one request — the N+1 signature —
+  shows up as a duplicate fingerprint.
+- A process-local rolling store keyed by (URL name, tenant slug): the last
+  PERF_WINDOW requests per endpoint, summarised on read as latency
+  percentiles, a fixed-bucket histogram, query/SQL-time averages and the
+  most frequent duplicate fingerprints (with the issuing call site when
+  PERF_CAPTURE_SITES is on).
+
+Recorded by core.middleware_perf.PerfProfilingMiddleware, read by the
+staff-only /api/_perf/ endpoint. Each worker process keeps its own store.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+MAX_FINGERPRINTS = 50   # per endpoint
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def fingerprint(sql):
+    """Query shape: placeholders/literals → ?, IN-lists of any length → IN (...)."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return sql.replace('%s', '?')
+
+
+_INTERNAL_FILES = {__file__.replace('.pyc', '.py')}
+
+
+def register_internal(path):
+    """Exclude a module's frames from call-site capture (instrumentation wrappers)."""
+    _INTERNAL_FILES.add(path.replace('.pyc', '.py'))
+
+
+def call_site():
+    """'path.py:line in func' for the innermost project frame that isn't instrumentation."""
+    base = str(settings.BASE_DIR) + os.sep
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base) and filename not in _INTERNAL_FILES and os.sep + 'site-packages' + os.sep not in filename:
+            return f'{filename[len(base):]}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+class QueryRecorder:
+    """
+    execute_wrapper collecting count, SQL time and fingerprints for one unit
+    of work. With capture_sites=True it also notes the project call site of
+    every query shape (costs a stack walk per query — tests and debugging).
+    """
+
+    def __init__(self, capture_sites=False):
+        self.count = 0
+        self.sql_ms = 0.0
+        self.fingerprints = Counter()
+        self.capture_sites = capture_sites
+        self.sites = {}   # fingerprint → Counter(call site)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - started) * 1000
+            self.count += 1
+            fp = fingerprint(sql)
+            self.fingerprints[fp] += 1
+            if self.capture_sites:
+                self.sites.setdefault(fp, Counter())[call_site()] += 1
+
+    def duplicates(self):
+        """{fingerprint: times run} for query shapes run more than once."""
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    def repeated(self, threshold):
+        """
+        Likely N+1s: [(fingerprint, times run, [call sites, most frequent first])]
+        for shapes run at least `threshold` times, worst first.
+        """
+        rows = [
+            (fp, n, [site for site, _ in self.sites.get(fp, Counter()).most_common()])
+            for fp, n in self.fingerprints.items() if n >= threshold
+        ]
+        return sorted(rows, key=lambda r: -r[1])
+
+
+def _percentile(sorted_values, pct):
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class EndpointStats:
+    """Rolling window of request samples for one (URL name, tenant)."""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)   # (wall_ms, queries, sql_ms, status)
+        self.duplicates = {}                  # fingerprint → [requests, max repeats, call site]
+        self.total = 0
+
+    def add(self, wall_ms, queries, sql_ms, status, duplicates, sites):
+        self.total += 1
+        self.samples.append((wall_ms, queries, sql_ms, status))
+        for fp, repeats in duplicates.items():
+            entry = self.duplicates.get(fp)
+            if entry is None:
+                if len(self.duplicates) >= MAX_FINGERPRINTS:
+                    continue
+                entry = self.duplicates[fp] = [0, 0, None]
+            entry[0] += 1
+            entry[1] = max(entry[1], repeats)
+            entry[2] = sites.get(fp) or entry[2]
+
+    def summary(self):
+        walls = sorted(s[0] for s in self.samples)
+        n = len(walls)
+        histogram = {f'<={b}ms': 0 for b in BUCKETS_MS}
+        histogram[f'>{BUCKETS_MS[-1]}ms'] = 0
+        for ms in walls:
+            key = next((f'<={b}ms' for b in BUCKETS_MS if ms <= b), f'>{BUCKETS_MS[-1]}ms')
+            histogram[key] += 1
+        top = sorted(self.duplicates.items(), key=lambda kv: (-kv[1][0], -kv[1][1]))[:10]
+        return {
+            'requests': self.total,
+            'window': n,
+            'p50_ms': round(_percentile(walls, 50), 2),
+            'p95_ms': round(_percentile(walls, 95), 2),
+            'p99_ms': round(_percentile(walls, 99), 2),
+            'max_ms': round(walls[-1], 2),
+            'queries_mean': round(sum(s[1] for s in self.samples) / n, 1),
+            'queries_max': max(s[1] for s in self.samples),
+            'sql_ms_mean': round(sum(s[2] for s in self.samples) / n, 2),
+            'errors': sum(1 for s in self.samples if s[3] >= 500),
+            'histogram': histogram,
+            'duplicate_queries': [
+                {'fingerprint': fp, 'requests': hits, 'max_repeats': repeats, 'call_site': site}
+                for fp, (hits, repeats, site) in top
+            ],
+        }
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(url_name, tenant_slug, wall_ms, recorder, status):
+    window = getattr(settings, 'PERF_WINDOW', 500)
+    with _lock:
+        stats = _stats.get((url_name, tenant_slug))
+        if stats is None:
+            stats = _stats[(url_name, tenant_slug)] = EndpointStats(window)
+        duplicates = recorder.duplicates()
+        sites = {fp: recorder.sites[fp].most_common(1)[0][0] for fp in duplicates if fp in recorder.sites}
+        stats.add(wall_ms, recorder.count, recorder.sql_ms, status, duplicates, sites)
+
+
+def snapshot(url_name=None):
+    """Summaries for every recorded endpoint, slowest p95 first."""
+    with _lock:
+        rows = [
+            {'url_name': name, 'tenant': tenant, **stats.summary()}
+            for (name, tenant), stats in _stats.items()
+            if url_name is None or name == url_name
+        ]
+    return sorted(rows, key=lambda r: -r['p95_ms'])
+
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,70 @@
+"""
+Query budgets — fail fast when a code path starts issuing more SQL.
+
+    from core.query_budget import query_budget
+
+    with query_budget(8):                      # context manager
+        client.get('/api/gym-timetable/')
+
+    @query_budget(12, label='dashboard')       # or decorator
+    def test_dashboard(self): ...
+
+On exit the block must have run at most `max_queries` queries. The N+1
+detector also fails the block when any one query shape (see
+core.perf.fingerprint) ran `repeat_threshold` times or more — the
+signature of a query inside a loop — whatever the total. Failures raise
+QueryBudgetExceeded (an AssertionError, so tests fail rather than error)
+listing the repeated shapes and the project call sites that issued them.
+
+Budgets for the hot endpoints live next to their tests (e.g.
+bookings/tests_query_budgets.py); raise a budget deliberately, in the same
+change that needs it.
+"""
+from contextlib import ContextDecorator
+
+from django.db import connections
+
+from core import perf
+
+DEFAULT_REPEAT_THRESHOLD = 5
+
+perf.register_internal(__file__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget(ContextDecorator):
+    def __init__(self, max_queries, repeat_threshold=DEFAULT_REPEAT_THRESHOLD, label='', using='default'):
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+        self.label = label
+        self.using = using
+
+    def __enter__(self):
+        self.recorder = perf.QueryRecorder(capture_sites=True)
+        self._wrapper = connections[self.using].execute_wrapper(self.recorder)
+        self._wrapper.__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            return False
+        problems = []
+        if self.recorder.count > self.max_queries:
+            problems.append(f'{self.recorder.count} queries, budget {self.max_queries}')
+        repeated = self.recorder.repeated(self.repeat_threshold) if self.repeat_threshold else []
+        if repeated:
+            problems.append(f'{len(repeated)} query shape(s) repeated {self.repeat_threshold}+ times (likely N+1)')
+        if problems:
+            raise QueryBudgetExceeded(self.report(problems, repeated))
+        return False
+
+    def report(self, problems, repeated):
+        lines = [f"Query budget{f' [{self.label}]' if self.label else ''}: " + '; '.join(problems)]
+        for fp, n, sites in repeated:
+            lines.append(f'  {n}x  {fp[:200]}')
+            lines.extend(f'        at {site}' for site in sites[:3])
+        return '\n'.join(lines)
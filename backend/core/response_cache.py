@@ -0,0 +1,120 @@
+"""
+Rendered-response cache for the public catalogue endpoints.
+
+@cached_json sits under @conditional_content (core.content_version) on views
+whose JSON is the same for every visitor of a tenant — the public menu and
+product list. The rendered bytes are cached under the request's ETag (tenant,
+content version, URL, media type), so a content change simply moves every
+reader to a new key and nothing has to be deleted. Hits return the stored
+bytes as-is: one cache read beyond the version row, no serializer, no DRF
+render.
+
+The cache is the `public_render` alias (settings.CACHES): a DatabaseCache
+table shared by every Gunicorn worker, created by `createcachetable` in the
+bootstrap pipeline. Django's default LocMemCache is per process, so with it
+each worker would rebuild and keep its own copy.
+
+A miss is rebuilt by one worker at a time (single-flight): the first request
+takes a short lock in the cache (cache.add — an INSERT that only one worker
+wins) and renders; requests for the same key meanwhile serve the previous
+version's bytes (stale-while-revalidate) if there are any, otherwise wait up
+to PUBLIC_RENDER_WAIT_MS for the rebuild before rendering themselves. A
+stale copy keeps its own ETag and is marked no-cache, so browsers and CDNs
+revalidate it rather than keep it.
+
+Only 200 responses negotiated to JSON are cached; the browsable API and
+errors go through the view as normal. Responses carry X-Render-Cache:
+hit / miss / stale.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from django.http import HttpResponse
+from django.utils.http import http_date, quote_etag
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core import content_version
+
+CACHE_ALIAS = 'public_render'
+CACHE_PREFIX = 'public-json'
+LOCK_TIMEOUT = 30          # seconds — a crashed renderer can't hold the key longer
+WAIT_STEP = 0.025          # seconds between polls while another worker renders
+
+cache = ConnectionProxy(caches, CACHE_ALIAS)
+
+
+def _entry_response(entry, state):
+    response = HttpResponse(entry['body'], content_type=entry['content_type'])
+    response['X-Render-Cache'] = state
+    if state == 'stale':
+        response['ETag'] = quote_etag(entry['etag'])
+        response['Last-Modified'] = http_date(entry['updated_at'].timestamp())
+        response.serves_stale_content = True
+    return response
+
+
+def _render(view, request, args, kwargs, etag, row, keys):
+    """Run the view and cache its rendered 200 response under `keys` (versioned key, latest key)."""
+    response = view(request, *args, **kwargs)
+    if not isinstance(response, Response) or response.status_code != 200:
+        return response
+    renderer = request.accepted_renderer
+    body = renderer.render(response.data, request.accepted_media_type, {'request': request, 'response': response})
+    entry = {
+        'body': body,
+        'content_type': renderer.media_type if not renderer.charset else f'{renderer.media_type}; charset={renderer.charset}',
+        'etag': etag,
+        'version': row.version,
+        'updated_at': row.updated_at,
+    }
+    key, latest_key = keys
+    timeout = settings.PUBLIC_RENDER_CACHE_TIMEOUT
+    cache.set(key, entry, timeout)
+    latest = cache.get(latest_key)
+    if latest is None or latest['version'] <= row.version:  # a slow old render mustn't replace a newer copy
+        cache.set(latest_key, entry, timeout)
+    return _entry_response(entry, 'miss')
+
+
+def cached_json(view):
+    """Decorator: serve the view's JSON from the per-tenant bytes cache (see module docstring)."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        etag = content_version.request_etag(request)
+        if etag is None or not isinstance(getattr(request, 'accepted_renderer', None), JSONRenderer):
+            return view(request, *args, **kwargs)
+        row = content_version.request_version(request)
+        key = f'{CACHE_PREFIX}:{etag}'
+        url_hash = hashlib.sha256(f'{request.build_absolute_uri()}:{request.accepted_media_type}'.encode()).hexdigest()[:32]
+        latest_key = f'{CACHE_PREFIX}:latest:{row.tenant_id}:{url_hash}'
+
+        entry = cache.get(key)
+        if entry is not None:
+            return _entry_response(entry, 'hit')
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            try:
+                return _render(view, request, args, kwargs, etag, row, (key, latest_key))
+            finally:
+                cache.delete(lock_key)
+
+        stale = cache.get(latest_key)
+        if stale is not None and stale['version'] < row.version:
+            return _entry_response(stale, 'stale')
+
+        deadline = time.monotonic() + settings.PUBLIC_RENDER_WAIT_MS / 1000
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_STEP)
+            entry = cache.get(key)
+            if entry is not None:
+                return _entry_response(entry, 'hit')
+        return _render(view, request, args, kwargs, etag, row, (key, latest_key))
+
+    return wrapper
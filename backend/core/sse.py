@@ -0,0 +1,101 @@
+"""
+Server-Sent Events helpers.
+
+`sse_response()` turns a plain (sync) generator of (event, data) pairs into a
+text/event-stream StreamingHttpResponse that streams under both servers:
+
+- WSGI: the generator is iterated directly by the worker.
+- ASGI (config/asgi.py): Django would otherwise drain a sync iterator into a
+  list before sending anything, so the generator is run on its own thread and
+  its events handed to the event loop through a queue. Nothing is buffered and
+  the shared sync thread is never held for the life of the stream. If the
+  client disconnects the generator is closed at its next event.
+
+GET streams that browsers open with EventSource also need
+@renderer_classes([EventStreamRenderer, JSONRenderer]) so DRF's content
+negotiation accepts `Accept: text/event-stream`.
+"""
+import asyncio
+import json
+import threading
+
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+_DONE = object()
+
+
+def format_event(event, data, event_id=None):
+    """One SSE frame. `data` is JSON-encoded."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _frames(events):
+    for item in events:
+        if isinstance(item, str):
+            yield item  # pre-formatted (comments / keep-alives)
+        else:
+            yield format_event(*item)
+
+
+async def _frames_in_thread(events):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce():
+        frames = _frames(events)
+        try:
+            for frame in frames:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, frame)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, format_event('error', {'error': str(e)}))
+        finally:
+            frames.close()
+            connections.close_all()  # this thread's connections only
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    threading.Thread(target=produce, name='sse-producer', daemon=True).start()
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is _DONE:
+                break
+            yield frame
+    finally:
+        stop.set()
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets DRF accept `Accept: text/event-stream` (EventSource) on GET stream
+    views. Only errors raised before the stream starts are rendered by it —
+    as a single 'error' event.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event('error', data).encode()
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def sse_response(request, events):
+    """StreamingHttpResponse for a generator yielding (event, data) or (event, data, id)."""
+    content = _frames_in_thread(events) if is_asgi(request) else _frames(events)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx/Railway buffer the stream
+    return response
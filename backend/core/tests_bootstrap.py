@@ -0,0 +1,113 @@
+"""
+Tests for the deploy bootstrap pipeline: dependency ordering, concurrency,
+fatal failures and fingerprint-based skipping.
+"""
+import time
+
+from django.test import TestCase
+
+from core.bootstrap import (
+    BootstrapError, Phase, _execute, default_phases, fingerprint, migration_state, run_bootstrap,
+)
+
+
+class FakePhase(Phase):
+    """Phase that records its run instead of calling a management command."""
+
+    def __init__(self, name, deps=(), duration=0.0, fail=False, fatal=False, journal=None):
+        super().__init__(name, 'noop', deps=deps, fatal=fatal, uses_db=False)
+        self.duration = duration
+        self.fail = fail
+        self.journal = journal if journal is not None else []
+
+    def run(self, stdout):
+        self.journal.append(('start', self.name, time.monotonic()))
+        time.sleep(self.duration)
+        if self.fail:
+            raise RuntimeError(f'{self.name} broke')
+        stdout.write(f'{self.name} ran')
+        self.journal.append(('end', self.name, time.monotonic()))
+
+
+class BootstrapSchedulerTests(TestCase):
+
+    def test_dependencies_run_first(self):
+        journal = []
+        phases = [
+            FakePhase('c', deps=['b'], journal=journal),
+            FakePhase('b', deps=['a'], journal=journal),
+            FakePhase('a', journal=journal),
+        ]
+        results, _ = run_bootstrap(phases, jobs=4)
+        starts = [name for kind, name, _ in journal if kind == 'start']
+        self.assertEqual(starts, ['a', 'b', 'c'])
+        self.assertTrue(all(r['status'] == 'ok' for r in results))
+
+    def test_independent_phases_overlap(self):
+        phases = [FakePhase(f'p{i}', duration=0.2) for i in range(4)]
+        results, wall = run_bootstrap(phases, jobs=4)
+        self.assertEqual(len(results), 4)
+        self.assertLess(wall, 0.6)
+
+    def test_non_fatal_failure_still_runs_dependents(self):
+        phases = [FakePhase('seed', fail=True), FakePhase('sync', deps=['seed'])]
+        results, _ = run_bootstrap(phases)
+        by_name = {r['phase']: r for r in results}
+        self.assertEqual(by_name['seed']['status'], 'failed')
+        self.assertIn('seed broke', by_name['seed']['error'])
+        self.assertEqual(by_name['sync']['status'], 'ok')
+
+    def test_fatal_failure_aborts(self):
+        journal = []
+        phases = [FakePhase('migrate', fail=True, fatal=True), FakePhase('seed', deps=['migrate'], journal=journal)]
+        with self.assertRaises(BootstrapError):
+            run_bootstrap(phases)
+        self.assertEqual(journal, [])
+
+    def test_cycle_and_unknown_dependency_rejected(self):
+        with self.assertRaises(BootstrapError):
+            run_bootstrap([FakePhase('a', deps=['b']), FakePhase('b', deps=['a'])])
+        with self.assertRaises(BootstrapError):
+            run_bootstrap([FakePhase('a', deps=['missing'])])
+
+    def test_default_graph_is_valid(self):
+        names = {p.name for p in default_phases()}
+        self.assertIn('seed_demo:salon-x', names)
+        self.assertNotIn('seed_demo:nbne', names)
+        reseed = {p.name: p for p in default_phases(reseed='salon-x')}
+        self.assertEqual(reseed['seed_demo:salon-x'].deps, ('clear_demo:salon-x',))
+        self.assertTrue(reseed['seed_demo:salon-x'].always)
+
+
+class BootstrapFingerprintTests(TestCase):
+
+    def test_unchanged_seed_is_skipped(self):
+        calls = []
+
+        class Recording(Phase):
+            def run(self, stdout):
+                calls.append(self.name)
+
+        phase = Recording('ensure_tenant:nbne', 'ensure_tenant', ['nbne'])
+        self.assertEqual(_execute(phase, force=False, log=lambda r: None)['status'], 'ok')
+        self.assertEqual(_execute(phase, force=False, log=lambda r: None)['status'], 'skipped')
+        self.assertEqual(_execute(phase, force=True, log=lambda r: None)['status'], 'ok')
+        self.assertEqual(len(calls), 2)
+
+    def test_fingerprint_covers_args(self):
+        schema = migration_state()
+        a = fingerprint(Phase('x', 'ensure_tenant', ['nbne']), schema)
+        b = fingerprint(Phase('x', 'ensure_tenant', ['mind-department']), schema)
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, fingerprint(Phase('x', 'ensure_tenant', ['nbne']), schema))
+
+    def test_new_tenant_reruns_all_tenant_seeds(self):
+        from tenants.models import TenantSettings
+        schema = migration_state()
+        phases = {p.name: p for p in default_phases()}
+        vault, pizza = phases['seed_document_vault'], phases['seed_pizza_shack']
+        before = fingerprint(vault, schema), fingerprint(pizza, schema)
+        TenantSettings.objects.create(slug='late-signup', business_name='Late Signup')
+        self.assertNotEqual(fingerprint(vault, schema), before[0])
+        self.assertEqual(fingerprint(pizza, schema), before[1])
+        self.assertTrue(phases['seed_compliance'].all_tenants)
@@ -0,0 +1,80 @@
+"""
+Tests for the bulk seeding helpers used by seed_demo / seed_compliance.
+"""
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from core.bulk_seed import bulk_get_or_create, compliance_score_signals, muted_signals
+from core.models import Config
+
+
+class BulkGetOrCreateTests(TestCase):
+
+    def test_creates_missing_and_updates_listed_fields(self):
+        Config.objects.create(key='a', value='old', category='system')
+        rows = [
+            {'key': 'a', 'defaults': {'value': 'new', 'category': 'other'}},
+            {'key': 'b', 'defaults': {'value': 'two', 'category': 'system'}},
+        ]
+        with self.assertNumQueries(3):  # select, insert, update
+            objects, created = bulk_get_or_create(Config, rows, keys=('key',), update=('value',))
+        self.assertEqual([c.key for c in created], ['b'])
+        a = Config.objects.get(key='a')
+        self.assertEqual((a.value, a.category), ('new', 'system'))
+        self.assertEqual(objects[('b',)].value, 'two')
+
+    def test_second_run_is_a_single_select(self):
+        rows = [{'key': f'k{i}', 'defaults': {'value': str(i)}} for i in range(20)]
+        bulk_get_or_create(Config, rows, keys=('key',), update=('value',))
+        with self.assertNumQueries(1):
+            _, created = bulk_get_or_create(Config, rows, keys=('key',), update=('value',))
+        self.assertEqual(created, [])
+        self.assertEqual(Config.objects.count(), 20)
+
+
+    def test_content_rows_bump_the_tenant_content_version(self):
+        from decimal import Decimal
+        from core import content_version
+        from shop.models import Product
+        from tenants.models import TenantSettings
+        tenant = TenantSettings.objects.create(slug='bulk-shop', business_name='Bulk Shop')
+        start = content_version.current(tenant).version
+
+        def seed(price):
+            return bulk_get_or_create(Product, [
+                {'tenant': tenant, 'name': name, 'defaults': {'price': Decimal(price)}} for name in ('Mug', 'Tee')
+            ], keys=('tenant', 'name'), update=('price',))
+
+        def version():
+            return content_version.current(tenant).version
+
+        seed('5.00')
+        self.assertEqual(version(), start + 1)
+        seed('5.00')   # nothing written
+        self.assertEqual(version(), start + 1)
+        seed('6.00')
+        self.assertEqual(version(), start + 2)
+
+
+class MutedSignalsTests(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        from compliance.models import ComplianceCategory
+        self.tenant = TenantSettings.objects.create(slug='bulk-seed', business_name='Bulk Seed')
+        self.category = ComplianceCategory.objects.create(tenant=self.tenant, name='Fire Safety')
+
+    def _add_item(self, title):
+        from compliance.models import ComplianceItem
+        return ComplianceItem.objects.create(
+            category=self.category, title=title, next_due_date=date.today() + timedelta(days=90),
+        )
+
+    def test_score_receivers_are_muted_then_restored(self):
+        from compliance.models import PeaceOfMindScore
+        with muted_signals(*compliance_score_signals()):
+            self._add_item('Fire risk assessment')
+        self.assertFalse(PeaceOfMindScore.objects.filter(tenant=self.tenant).exists())
+        self._add_item('Extinguisher service')
+        self.assertTrue(PeaceOfMindScore.objects.filter(tenant=self.tenant).exists())
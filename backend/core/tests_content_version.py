@@ -0,0 +1,167 @@
+"""
+Per-tenant content versions, conditional GET and the rendered-JSON cache on the
+public endpoints.
+"""
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import content_version
+from core.query_budget import query_budget
+
+
+class ConditionalContentTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        from orders.models import MenuCategory, MenuItem
+        self.tenant = TenantSettings.objects.create(slug='etag', business_name='ETag Cafe')
+        self.other = TenantSettings.objects.create(slug='other', business_name='Other')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='etag')
+        category = MenuCategory.objects.create(tenant=self.tenant, name='Drinks')
+        self.item = MenuItem.objects.create(tenant=self.tenant, category=category, name='Tea', price_pence=250)
+
+    def _revalidate(self, url, response, **extra):
+        return self.api.get(url, HTTP_IF_NONE_MATCH=response['ETag'], **extra)
+
+    def test_menu_304_skips_the_view_until_an_item_changes(self):
+        url = '/api/orders/menu/'
+        first = self.api.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertRegex(first['ETag'], r'^"[0-9a-f]{32}"$')
+        self.assertIn('Last-Modified', first)
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn('s-maxage=60', first['Cache-Control'])
+        self.assertIn('X-Tenant-Slug', first['Vary'])
+
+        # Tenant lookup + version row only — no menu queries
+        with query_budget(2, label='menu 304'):
+            cached = self._revalidate(url, first)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], first['ETag'])
+        self.assertIn('s-maxage=60', cached['Cache-Control'])
+
+        self.item.price_pence = 300
+        self.item.save()
+        fresh = self._revalidate(url, first)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], first['ETag'])
+        self.assertEqual(fresh.json()[0]['items'][0]['price_pence'], 300)
+
+    def test_versions_are_per_tenant_and_per_url(self):
+        from cms.models import Page
+        pages = self.api.get('/api/cms/public/pages/')
+        menu = self.api.get('/api/orders/menu/')
+        self.assertNotEqual(pages['ETag'], menu['ETag'])
+
+        Page.objects.create(tenant=self.other, title='Elsewhere', slug='elsewhere', is_published=True)
+        self.assertEqual(self._revalidate('/api/cms/public/pages/', pages).status_code, 304)
+
+        Page.objects.create(tenant=self.tenant, title='About', slug='about', is_published=True)
+        response = self._revalidate('/api/cms/public/pages/', pages)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['slug'] for p in response.json()], ['about'])
+
+    def test_models_that_bump_the_version(self):
+        from bookings.models_gym import ClassType
+        from cms.models import BlogPost
+        from shop.models import Product
+        version = lambda: content_version.current(self.tenant).version  # noqa: E731
+        start = version()
+        product = Product.objects.create(tenant=self.tenant, name='Mug', price=Decimal('8.00'))
+        BlogPost.objects.create(tenant=self.tenant, title='News', slug='news', status='published')
+        ClassType.objects.create(tenant=self.tenant, name='Spin')
+        self.tenant.tagline = 'New tagline'
+        self.tenant.save()
+        product.delete()
+        self.assertEqual(version(), start + 5)
+
+    def test_branding_and_cache_scope(self):
+        url = '/api/tenant/branding/'
+        first = self.api.get(url)
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+        self.tenant.colour_primary = '#000000'
+        self.tenant.save()
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+        # ?tenant= is part of the URL, so still shareable
+        by_param = APIClient().get(url, {'tenant': 'etag'})
+        self.assertIn('public', by_param['Cache-Control'])
+        # Tenant not named by the request (fallback) — never shared
+        fallback = APIClient().get(url)
+        self.assertIn('private', fallback['Cache-Control'])
+        self.assertNotIn('s-maxage', fallback['Cache-Control'])
+
+    def test_missing_page_is_not_cached_publicly(self):
+        response = self.api.get('/api/cms/public/pages/nope/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('Cache-Control', response)
+
+
+class RenderedResponseCacheTest(TestCase):
+
+    def setUp(self):
+        from core.response_cache import cache
+        from tenants.models import TenantSettings
+        from orders.models import MenuCategory, MenuItem
+        from shop.models import Product
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.tenant = TenantSettings.objects.create(slug='bytes', business_name='Bytes Diner')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='bytes')
+        category = MenuCategory.objects.create(tenant=self.tenant, name='Mains')
+        self.item = MenuItem.objects.create(tenant=self.tenant, category=category, name='Pie', price_pence=900)
+        Product.objects.create(tenant=self.tenant, name='Apron', category='Kit', price=Decimal('12.00'))
+        Product.objects.create(tenant=self.tenant, name='Gift card', category='Gifts', price=Decimal('25.00'))
+
+    def test_hit_serves_stored_bytes_without_rendering(self):
+        first = self.api.get('/api/orders/menu/')
+        self.assertEqual(first['X-Render-Cache'], 'miss')
+        with query_budget(3, label='menu hit'):   # tenant, version row, cache read
+            second = self.api.get('/api/orders/menu/')
+        self.assertEqual(second['X-Render-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        self.item.name = 'Steak pie'
+        self.item.save()
+        third = self.api.get('/api/orders/menu/')
+        self.assertEqual(third['X-Render-Cache'], 'miss')
+        self.assertEqual(third.json()[0]['items'][0]['name'], 'Steak pie')
+
+    def test_products_cached_per_query_string(self):
+        kit = self.api.get('/api/shop/public/products/', {'category': 'kit'})
+        gifts = self.api.get('/api/shop/public/products/', {'category': 'gifts'})
+        self.assertEqual([p['name'] for p in kit.json()], ['Apron'])
+        self.assertEqual([p['name'] for p in gifts.json()], ['Gift card'])
+        again = self.api.get('/api/shop/public/products/', {'category': 'kit'})
+        self.assertEqual((again['X-Render-Cache'], again.content), ('hit', kit.content))
+
+    def test_concurrent_rebuild_serves_previous_version(self):
+        from unittest import mock
+        old = self.api.get('/api/orders/menu/')
+        self.item.price_pence = 950
+        self.item.save()
+
+        # Another worker holds the rebuild lock
+        with mock.patch('core.response_cache.cache.add', return_value=False):
+            stale = self.api.get('/api/orders/menu/')
+        self.assertEqual(stale['X-Render-Cache'], 'stale')
+        self.assertEqual(stale.content, old.content)
+        self.assertEqual(stale['ETag'], old['ETag'])
+        self.assertIn('no-cache', stale['Cache-Control'])
+        self.assertNotIn('s-maxage', stale['Cache-Control'])
+
+        fresh = self.api.get('/api/orders/menu/')
+        self.assertEqual(fresh['X-Render-Cache'], 'miss')
+        self.assertEqual(fresh.json()[0]['items'][0]['price_pence'], 950)
+
+    @override_settings(PUBLIC_RENDER_WAIT_MS=0)
+    def test_no_previous_copy_renders_after_waiting(self):
+        from unittest import mock
+        with mock.patch('core.response_cache.cache.add', return_value=False):
+            response = self.api.get('/api/orders/menu/')
+        self.assertEqual(response['X-Render-Cache'], 'miss')
+        self.assertEqual(response.json()[0]['items'][0]['name'], 'Pie')
@@ -0,0 +1,108 @@
+"""
+Responsive image derivatives: the worker, srcsets in the public serializers,
+and invalidation when an image is replaced.
+"""
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import images
+
+
+def photo(name='photo.jpg', size=(1200, 800), fmt='JPEG', mode='RGB'):
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 80, 40) if mode == 'RGB' else (200, 80, 40, 128)).save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(IMAGE_DERIVATIVE_WIDTHS=[320, 640, 1600], IMAGE_DERIVATIVE_QUALITY=70)
+class ImageDerivativeTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.tenant = TenantSettings.objects.create(slug='pics', business_name='Pics')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='pics')
+
+    def test_worker_writes_smaller_variants_only(self):
+        from PIL import Image
+        from cms.models import Page, PageImage
+        page = Page.objects.create(tenant=self.tenant, title='Gallery', slug='gallery', is_published=True)
+        image = PageImage.objects.create(page=page, image=photo())
+        self.assertIsNone(image.image_renditions)
+
+        self.assertEqual(images.process_pending(), 1)
+        self.assertEqual(images.process_pending(), 0)
+        image.refresh_from_db()
+        data = image.image_renditions
+        self.assertEqual((data['src'], data['width'], data['height']), (image.image.name, 1200, 800))
+        self.assertEqual(sorted(data['variants']['webp']), ['320', '640'])    # never upscaled to 1600
+        storage = image.image.storage
+        with storage.open(data['variants']['webp']['640']) as fh:
+            derived = Image.open(fh)
+            self.assertEqual((derived.format, derived.size), ('WEBP', (640, 427)))
+        self.assertTrue(data['variants']['jpeg']['320'].endswith('.w320.jpg'))
+
+    def test_srcsets_in_public_payloads(self):
+        from cms.models import Page, PageImage
+        from shop.models import Product, ProductImage
+        page = Page.objects.create(tenant=self.tenant, title='Home', slug='home', is_published=True,
+                                   hero_image=photo('hero.jpg', size=(900, 600)))
+        PageImage.objects.create(page=page, image=photo('inline.png', size=(700, 700), fmt='PNG', mode='RGBA'))
+        product = Product.objects.create(tenant=self.tenant, name='Mug', price=Decimal('8.00'))
+        ProductImage.objects.create(product=product, image=photo('mug.jpg', size=(2400, 1600)))
+
+        before = self.api.get('/api/cms/public/pages/home/').json()
+        self.assertIsNone(before['hero_image_srcset'])
+        self.assertIsNone(before['images'][0]['srcset'])
+
+        images.process_pending()
+        after = self.api.get('/api/cms/public/pages/home/').json()   # content version bumped by the worker
+        hero = after['hero_image_srcset']
+        self.assertEqual((hero['width'], hero['height']), (900, 600))
+        self.assertRegex(hero['webp'], r'^http://testserver/media/cms/heroes/.+\.w320\.webp 320w, .+\.w640\.webp 640w$')
+        self.assertTrue(hero['jpeg'].endswith(f"{after['hero_image_url']} 900w"))   # small original tops the ladder
+        self.assertEqual(after['images'][0]['srcset']['webp'].count('w, '), 1)
+
+        [mug] = self.api.get('/api/shop/public/products/').json()
+        self.assertEqual(mug['primary_image_srcset'], mug['images'][0]['srcset'])
+        self.assertEqual(mug['primary_image_srcset']['jpeg'].count('https://testserver/media/shop/'), 3)
+        self.assertNotIn(mug['primary_image_url'], mug['primary_image_srcset']['jpeg'])   # 2400px original left out
+
+    def test_replacing_an_image_regenerates_it(self):
+        from cms.models import BlogPost
+        post = BlogPost.objects.create(tenant=self.tenant, title='News', slug='news',
+                                       featured_image=photo('old.jpg'))
+        images.process_pending()
+        post.refresh_from_db()
+        old = post.featured_image_renditions['variants']['webp']['640']
+        storage = post.featured_image.storage
+        self.assertTrue(storage.exists(old))
+
+        post.featured_image = photo('new.jpg', size=(500, 400))
+        post.save()
+        self.assertIsNone(BlogPost.objects.get(pk=post.pk).featured_image_renditions)
+        self.assertFalse(storage.exists(old))
+        images.process_pending()
+        post.refresh_from_db()
+        self.assertEqual(sorted(post.featured_image_renditions['variants']['jpeg']), ['320'])
+
+    def test_unreadable_file_is_recorded_not_retried(self):
+        from compliance.models import IncidentPhoto, IncidentReport
+        incident = IncidentReport.objects.create(tenant=self.tenant, title='Spill', incident_date=timezone.now())
+        IncidentPhoto.objects.create(incident=incident, image=SimpleUploadedFile('spill.jpg', b'not an image'))
+        with self.assertLogs('core.images', 'WARNING'):
+            self.assertEqual(images.process_pending(), 1)
+        self.assertIn('error', IncidentPhoto.objects.get().image_renditions)
+        self.assertEqual(images.process_pending(), 0)
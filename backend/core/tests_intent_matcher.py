@@ -0,0 +1,60 @@
+"""
+Tests for the compiled intent matcher: agreement with the original
+first-match keyword scan on every rule set, ranking and spans.
+"""
+import random
+
+from django.test import TestCase
+
+from core.intent_matcher import IntentMatcher, naive_first
+
+
+class IntentMatcherTests(TestCase):
+
+    def _rule_sets(self):
+        from core.command_router import COMMAND_MAP
+        from core.views_assistant import PARSE_RULES
+        from compliance.views import PARSE_ACTION_RULES
+        return [
+            [(r['event_type'], r['keywords']) for r in PARSE_RULES],
+            [(h.__name__, kws) for kws, h in COMMAND_MAP],
+            PARSE_ACTION_RULES,
+        ]
+
+    def test_agrees_with_naive_scan(self):
+        rng = random.Random(7)
+        for rules in self._rule_sets():
+            matcher = IntentMatcher(rules)
+            vocab = [kw for _, kws in rules for kw in kws] + ['jordan', 'today', 'the', 'please', 'x']
+            for _ in range(300):
+                text = ' '.join(rng.choice(vocab) for _ in range(rng.randint(1, 6)))
+                best = matcher.first(text)
+                self.assertEqual(best and (best['intent'], best['keyword']), naive_first(rules, text), text)
+
+    def test_overlapping_keywords_and_spans(self):
+        matcher = IntentMatcher([('a', ['hers']), ('b', ['he', 'she']), ('c', ['his'])])
+        text = 'ushers'
+        results = matcher.match(text)
+        self.assertEqual([r['intent'] for r in results], ['a', 'b'])
+        self.assertEqual(results[0]['spans'], [(2, 6, 'hers')])
+        # Spans in text order; keyword is the rule's first listed keyword that matched
+        self.assertEqual(results[1]['spans'], [(1, 4, 'she'), (2, 4, 'he')])
+        self.assertEqual(results[1]['keyword'], 'he')
+        self.assertIsNone(matcher.first('no match at all'))
+
+    def test_case_insensitive(self):
+        matcher = IntentMatcher([('sick', ['Off Sick'])])
+        self.assertEqual(matcher.first('Chloe is OFF SICK')['spans'], [(9, 17, 'Off Sick')])
+
+    def test_parse_endpoint_reports_ranked_intents(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from core.views_assistant import parse_command
+        user = get_user_model().objects.create_user(username='owner', email='owner@test.local', password=None)
+        request = APIRequestFactory().post('/api/assistant/parse/', {'text': 'Chloe is off sick, need cover'}, format='json')
+        force_authenticate(request, user=user)
+        data = parse_command(request).data
+        self.assertEqual(data['intent']['event_type'], 'STAFF_SICK')
+        self.assertEqual(data['intent']['matched_keyword'], 'sick')
+        self.assertEqual(data['intent']['matched_spans'], [[9, 17], [13, 17]])
+        self.assertEqual([a['event_type'] for a in data['alternatives']], ['COVER_REQUESTED'])
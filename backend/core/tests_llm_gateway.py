@@ -0,0 +1,218 @@
+"""
+Tests for the LLM gateway: content-addressed cache, accounting, the local
+deterministic backend, and the AI assistant running on it offline — plus
+concurrent dispatch of the assistant's read-only tools and the SSE stream.
+"""
+import json
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from core import llm_gateway
+
+User = get_user_model()
+
+
+class LLMGatewayTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        llm_gateway.reset_stats()
+        llm_gateway.set_backend(llm_gateway.LocalBackend(latency_ms=0, ms_per_token=0))
+
+    def tearDown(self):
+        llm_gateway.set_backend(None)
+
+    def test_identical_requests_hit_cache(self):
+        messages = [{'role': 'user', 'content': 'Hello there'}]
+        first = llm_gateway.complete(messages, purpose='test', temperature=0.3)
+        second = llm_gateway.complete(messages, purpose='test', temperature=0.3)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(first.message, second.message)
+
+        # Any change to the request is a different address
+        third = llm_gateway.complete(messages, purpose='test', temperature=0.5)
+        self.assertFalse(third.cached)
+
+        row = llm_gateway.stats()['test']
+        self.assertEqual((row['calls'], row['cache_hits']), (3, 1))
+        self.assertEqual(row['prompt_tokens'], first.prompt_tokens * 2)
+
+    @override_settings(LLM_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        messages = [{'role': 'user', 'content': 'Hello there'}]
+        llm_gateway.complete(messages)
+        self.assertFalse(llm_gateway.complete(messages).cached)
+
+    def test_local_backend_is_deterministic_and_picks_tools(self):
+        from core.views_ai_assistant import TOOLS
+        messages = [{'role': 'user', 'content': 'Show me the staff list'}]
+        a = llm_gateway.complete(messages, tools=TOOLS, use_cache=False)
+        b = llm_gateway.complete(messages, tools=TOOLS, use_cache=False)
+        self.assertEqual(a.message, b.message)
+        self.assertEqual(a.tool_calls[0]['function']['name'], 'get_staff_list')
+
+        # Once the tool result is in, it summarises instead of calling again
+        messages += [a.message, {'role': 'tool', 'tool_call_id': a.tool_calls[0]['id'], 'content': '[]'}]
+        reply = llm_gateway.complete(messages, tools=TOOLS)
+        self.assertEqual(reply.tool_calls, [])
+        self.assertIn('get_staff_list', reply.content)
+
+    def test_latency_injection(self):
+        llm_gateway.set_backend(llm_gateway.LocalBackend(latency_ms=50, ms_per_token=0))
+        completion = llm_gateway.complete([{'role': 'user', 'content': 'hi'}], use_cache=False)
+        self.assertGreaterEqual(completion.latency_ms, 50)
+
+    def test_json_response_format(self):
+        completion = llm_gateway.complete(
+            [{'role': 'user', 'content': 'Jane Smith wants a quote'}],
+            response_format={'type': 'json_object'},
+        )
+        self.assertEqual(completion.json()['summary'], 'Jane Smith wants a quote')
+
+    def test_ai_chat_runs_offline(self):
+        from rest_framework.test import force_authenticate
+        from core.views_ai_assistant import ai_chat
+        user = User.objects.create_user(username='owner', email='owner@test.local', password='test1234')
+        request = RequestFactory().post(
+            '/api/assistant/chat/',
+            data=json.dumps({'messages': [{'role': 'user', 'content': 'Show me the staff list'}]}),
+            content_type='application/json',
+        )
+        force_authenticate(request, user=user)
+        response = ai_chat(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tool_calls'], [{'tool': 'get_staff_list', 'args': {}}])
+        self.assertEqual(llm_gateway.stats()['assistant']['calls'], 2)
+
+
+class ToolDispatchTests(TransactionTestCase):
+    """Outside a transaction, read-only tools in one turn run concurrently."""
+
+    def _fake_tools(self, journal, delay=0.2):
+        def make(name):
+            def tool(tenant, args):
+                journal.append(('start', name))
+                time.sleep(delay)
+                journal.append(('end', name))
+                return {'tool': name}
+            return tool
+        return {name: make(name) for name in ('get_staff_list', 'get_todays_overview', 'mark_staff_sick')}
+
+    def test_read_only_tools_overlap(self):
+        from core.views_ai_assistant import TOOL_DISPATCH, dispatch_tools
+        journal = []
+        with mock.patch.dict(TOOL_DISPATCH, self._fake_tools(journal)):
+            started = time.monotonic()
+            outcomes = dispatch_tools(None, [('get_staff_list', {}), ('get_todays_overview', {})])
+            elapsed = time.monotonic() - started
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual([r for r, _, _ in outcomes], [{'tool': 'get_staff_list'}, {'tool': 'get_todays_overview'}])
+        self.assertTrue(all(parallel for _, _, parallel in outcomes))
+        self.assertTrue(all(ms >= 200 for _, ms, _ in outcomes))
+
+    def test_mutating_tool_is_a_barrier(self):
+        from core.views_ai_assistant import TOOL_DISPATCH, dispatch_tools
+        journal = []
+        with mock.patch.dict(TOOL_DISPATCH, self._fake_tools(journal, delay=0.05)):
+            outcomes = dispatch_tools(None, [
+                ('get_staff_list', {}), ('get_todays_overview', {}),
+                ('mark_staff_sick', {'staff_name': 'Sam'}),
+                ('get_staff_list', {}),
+            ])
+        write_start = journal.index(('start', 'mark_staff_sick'))
+        write_end = journal.index(('end', 'mark_staff_sick'))
+        # Both reads before the write finished first; the read after it started after
+        self.assertEqual(journal[write_start + 1], ('end', 'mark_staff_sick'))
+        self.assertEqual(sorted(journal[:write_start]), sorted([
+            ('start', 'get_staff_list'), ('end', 'get_staff_list'),
+            ('start', 'get_todays_overview'), ('end', 'get_todays_overview'),
+        ]))
+        self.assertEqual(journal[write_end + 1], ('start', 'get_staff_list'))
+        self.assertEqual([p for _, _, p in outcomes], [True, True, False, False])
+
+    def test_real_tools_match_serial_results(self):
+        from tenants.models import TenantSettings
+        from bookings.models import Staff
+        from core.views_ai_assistant import _run_tool, dispatch_tools
+        tenant = TenantSettings.objects.create(slug='tools', business_name='Tools')
+        Staff.objects.create(tenant=tenant, name='Sam Smith', email='sam@tools.test', active=True)
+        calls = [('get_staff_list', {}), ('get_available_staff', {}), ('get_who_is_off', {})]
+        outcomes = dispatch_tools(tenant, calls)
+        self.assertEqual([r for r, _, _ in outcomes], [_run_tool(tenant, *c)[0] for c in calls])
+
+
+class ToolDispatchInTransactionTests(TestCase):
+
+    def test_serial_inside_transaction(self):
+        from core.views_ai_assistant import dispatch_tools
+        outcomes = dispatch_tools(None, [('navigate_user', {'page': '/admin'}), ('get_staff_list', {})])
+        self.assertEqual(outcomes[0][0]['navigate'], '/admin')
+        self.assertEqual([p for _, _, p in outcomes], [False, False])
+
+
+def parse_sse(body):
+    """[(event, data)] from a text/event-stream body."""
+    events = []
+    for frame in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in frame.splitlines())
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class AssistantStreamTests(TransactionTestCase):
+    """POST /api/assistant/chat/stream/ under WSGI and ASGI, on the local backend."""
+
+    def setUp(self):
+        cache.clear()
+        llm_gateway.set_backend(llm_gateway.LocalBackend(latency_ms=0, ms_per_token=0))
+        self.user = User.objects.create_user(username='owner', email='owner@test.local', password='test1234')
+        self.body = {'messages': [{'role': 'user', 'content': 'Show me the staff list'}]}
+
+    def tearDown(self):
+        llm_gateway.set_backend(None)
+
+    def assert_stream(self, events):
+        names = [e for e, _ in events]
+        self.assertEqual(names[:2], ['tool_call', 'tool_result'])
+        self.assertEqual(events[0][1]['tool'], 'get_staff_list')
+        self.assertIn('token', names)
+        self.assertEqual(names[-1], 'done')
+        done = events[-1][1]
+        self.assertEqual(done['tool_calls'], [{'tool': 'get_staff_list', 'args': {}}])
+        # Streamed tokens add up to the final reply
+        self.assertEqual(''.join(d['text'] for e, d in events if e == 'token'), done['reply'])
+
+    def test_stream_under_wsgi(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/assistant/chat/stream/', self.body, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertFalse(response.is_async)
+        self.assert_stream(parse_sse(b''.join(response.streaming_content).decode()))
+
+    def test_stream_under_asgi(self):
+        from asgiref.sync import async_to_sync
+        self.async_client.force_login(self.user)
+
+        async def fetch():
+            response = await self.async_client.post(
+                '/api/assistant/chat/stream/', self.body, content_type='application/json',
+            )
+            chunks = [chunk async for chunk in response.streaming_content]
+            return response, b''.join(c if isinstance(c, bytes) else c.encode() for c in chunks)
+
+        response, body = async_to_sync(fetch)()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assert_stream(parse_sse(body.decode()))
+
+    def test_validation_errors_are_plain_json(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/assistant/chat/stream/', {'messages': []}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'messages array is required.')
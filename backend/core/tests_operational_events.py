@@ -250,3 +250,81 @@ class OperationalEventsDisabledModulesTest(TestCase):
         self.assertEqual(len(events), 0)
         state = get_dashboard_state(events)
         self.assertEqual(state['state'], 'sorted')
+
+
+@override_settings(
+    BOOKINGS_MODULE_ENABLED=True,
+    STAFF_MODULE_ENABLED=True,
+    COMPLIANCE_MODULE_ENABLED=True,
+)
+class OperationalEventsQueryCountTest(TestCase):
+    """Event builders prefetch up front — query count is independent of event volume."""
+
+    def setUp(self):
+        from bookings.models import Client, Service, Staff
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='ops', business_name='Ops')
+        self.services = [
+            Service.objects.create(tenant=self.tenant, name=f'Service {i}', duration_minutes=60, price=Decimal('30.00'))
+            for i in range(3)
+        ]
+        self.staff = []
+        for i, name in enumerate(['Alice', 'Ben', 'Cara', 'Dev', 'Eve']):
+            s = Staff.objects.create(tenant=self.tenant, name=name, email=f'{name.lower()}@ops.test', active=True)
+            s.services.set(self.services[: 1 + i % 3])
+            self.staff.append(s)
+        self.client_obj = Client.objects.create(tenant=self.tenant, name='Bob', email='bob@ops.test', phone='0700')
+        self.now = timezone.now()
+
+    def _add_events(self, n):
+        """n cancelled + n unpaid bookings, and n-1 sick staff each with a booking today."""
+        from bookings.models import Booking
+        from bookings.models_availability import LeaveRequest
+        from core.models_events import BusinessEvent
+        start = self.now.replace(hour=10, minute=0, second=0, microsecond=0)
+        for i in range(n):
+            for status, payment in (('cancelled', 'paid'), ('confirmed', 'pending')):
+                Booking.objects.create(
+                    tenant=self.tenant, client=self.client_obj, service=self.services[i % 3], staff=self.staff[4],
+                    start_time=start, end_time=start + timedelta(hours=1), status=status, payment_status=payment,
+                )
+        for s in self.staff[:n - 1]:
+            Booking.objects.create(
+                tenant=self.tenant, client=self.client_obj, service=self.services[0], staff=s,
+                start_time=start, end_time=start + timedelta(hours=1), status='confirmed', payment_status='paid',
+            )
+            LeaveRequest.objects.create(
+                staff_member=s, leave_type='SICK', status='APPROVED',
+                start_datetime=self.now.replace(hour=0, minute=0), end_datetime=self.now.replace(hour=23, minute=59),
+            )
+        BusinessEvent.log('COVER_ACCEPTED', 'Ask Eve to cover', tenant=self.tenant,
+                          payload={'cover_staff_id': self.staff[4].id})
+
+    def _count_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from core.operational_events import get_operational_events
+        with CaptureQueriesContext(connection) as ctx:
+            events = get_operational_events(tenant=self.tenant)
+        return len(ctx.captured_queries), events
+
+    def test_query_count_is_constant(self):
+        self._add_events(2)
+        small, events = self._count_queries()
+        self.assertEqual(len([e for e in events if e['event_type'] == 'staff_sick']), 1)
+
+        self._add_events(5)
+        large, events = self._count_queries()
+        self.assertEqual(len([e for e in events if e['event_type'] == 'staff_sick']), 5)
+        self.assertEqual(len([e for e in events if e['event_type'] == 'deposit_missing']), 7)
+        self.assertEqual(small, large)
+
+    def test_prefetched_details(self):
+        self._add_events(3)
+        _, events = self._count_queries()
+        sick = {e['summary']: e for e in events if e['event_type'] == 'staff_sick'}
+        alice = sick['Alice off sick today']
+        self.assertIn('1 booking affected', alice['detail'])
+        # Rotation: Eve covered recently, so she is ranked after the others
+        self.assertEqual([a['label'] for a in alice['actions']],
+                         ['Ask Ben to cover', 'Ask Cara to cover', 'Ask Dev to cover', 'Owner cover'])
@@ -0,0 +1,80 @@
+"""
+Profiling middleware, query recorder and the /api/_perf/ read-out.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import perf
+
+
+class QueryRecorderTest(TestCase):
+
+    def test_fingerprints_collapse_literals_and_in_lists(self):
+        self.assertEqual(
+            perf.fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = \'x\' LIMIT 21'),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?',
+        )
+        self.assertEqual(perf.fingerprint('SELECT 1 FROM t WHERE a = %s'), perf.fingerprint('SELECT 2 FROM t WHERE a = %s'))
+
+    def test_repeated_query_shape_is_a_duplicate(self):
+        from tenants.models import TenantSettings
+        tenants = [TenantSettings.objects.create(slug=f'p{i}', business_name=f'P{i}') for i in range(3)]
+        recorder = perf.QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for t in tenants:
+                TenantSettings.objects.filter(pk=t.pk).first()
+            TenantSettings.objects.count()
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(list(recorder.duplicates().values()), [3])
+        self.assertGreater(recorder.sql_ms, 0)
+
+
+class PerfMiddlewareTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        perf.reset()
+        self.tenant = TenantSettings.objects.create(slug='perf', business_name='Perf')
+        self.addCleanup(perf.reset)
+
+    def test_disabled_by_default(self):
+        response = APIClient().get('/api/tenant/branding/', HTTP_X_TENANT_SLUG='perf')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(perf.snapshot(), [])
+
+    @override_settings(PERF_PROFILING=True, PERF_WINDOW=3)
+    def test_records_per_url_name_and_tenant(self):
+        client = APIClient(HTTP_X_TENANT_SLUG='perf')
+        for _ in range(5):
+            response = client.get('/api/tenant/branding/')
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"$')
+
+        [row] = perf.snapshot()
+        self.assertEqual(row['tenant'], 'perf')
+        self.assertEqual((row['requests'], row['window']), (5, 3))
+        self.assertGreaterEqual(row['queries_mean'], 1)
+        self.assertEqual(sum(row['histogram'].values()), 3)
+
+        client.get('/api/no-such-endpoint/')
+        self.assertIn('unresolved', [r['url_name'] for r in perf.snapshot()])
+
+    @override_settings(PERF_PROFILING=True)
+    def test_read_out_is_staff_only(self):
+        User = get_user_model()
+        APIClient(HTTP_X_TENANT_SLUG='perf').get('/api/tenant/branding/')
+        client = APIClient()
+        self.assertIn(client.get('/api/_perf/').status_code, (401, 403))
+
+        client.force_authenticate(User.objects.create_user(username='cust', email='c@perf.test', password=None))
+        self.assertEqual(client.get('/api/_perf/').status_code, 403)
+
+        client.force_authenticate(User.objects.create_user(username='boss', email='b@perf.test', password=None,
+                                                           is_staff=True))
+        data = client.get('/api/_perf/').json()
+        self.assertTrue(data['enabled'])
+        self.assertIn('perf', [r['tenant'] for r in data['endpoints']])
+        self.assertEqual(client.delete('/api/_perf/').status_code, 200)
+        self.assertEqual(perf.snapshot(), [])
@@ -193,6 +193,60 @@ class CoverLogicTests(TestCase):
             self.assertTrue(len(c['reason']) > 0)
 
 
+class CoverRotationIndexTests(TestCase):
+    """Rotation reads the indexed covering_staff_id, scoped to the absent member's tenant."""
+
+    def setUp(self):
+        from bookings.models import Staff as BookingStaff
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='cover', business_name='Cover')
+        self.other = TenantSettings.objects.create(slug='cover-other', business_name='Other')
+        self.absent, self.alex, self.jordan, self.sam = [
+            BookingStaff.objects.create(tenant=self.tenant, name=name, email=f'{name.lower()}@cover.test', active=True)
+            for name in ('Chloe', 'Alex', 'Jordan', 'Sam')
+        ]
+        self.outsider = BookingStaff.objects.create(tenant=self.other, name='Aaron', email='aaron@other.test', active=True)
+
+    def _covered(self, staff, tenant=None, days_ago=0):
+        evt = BusinessEvent.log('COVER_ACCEPTED', f'{staff.name} covered', tenant=tenant or self.tenant,
+                                payload={'cover_staff_id': staff.id})
+        if days_ago:
+            BusinessEvent.objects.filter(pk=evt.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return evt
+
+    def test_covering_staff_id_populated_from_payload(self):
+        self.assertEqual(self._covered(self.jordan).covering_staff_id, self.jordan.id)
+        evt = BusinessEvent.log('COVER_REQUESTED', 'Ask Sam', tenant=self.tenant, payload={'cover_staff_id': self.sam.id})
+        self.assertIsNone(evt.covering_staff_id)
+
+    def test_rotation_order_and_tenant_scope(self):
+        from core.cover_logic import get_cover_candidates
+        self._covered(self.alex)
+        self._covered(self.sam, days_ago=10)
+        # A cover logged against another tenant does not count here
+        self._covered(self.jordan, tenant=self.other)
+        with self.assertNumQueries(1):
+            candidates = get_cover_candidates(self.absent.id, strategy='rotation', max_candidates=5)
+        self.assertEqual([c['name'] for c in candidates], ['Jordan', 'Sam', 'Alex'])
+        self.assertEqual([c['rank'] for c in candidates], [1, 2, 3])
+        self.assertIn('covered recently', candidates[2]['reason'])
+
+    def test_batch_matches_single_lookup(self):
+        from core.cover_logic import get_cover_candidates, rotation_candidates_for
+        self._covered(self.alex)
+        with self.assertNumQueries(1):
+            batch = rotation_candidates_for([self.absent, self.jordan, self.outsider])
+        self.assertEqual(batch[self.absent.id], get_cover_candidates(self.absent.id))
+        self.assertEqual(batch[self.jordan.id], get_cover_candidates(self.jordan.id))
+        self.assertEqual(batch[self.outsider.id], [])
+
+    def test_next_candidate_skips_declined(self):
+        from core.cover_logic import get_next_candidate
+        self._covered(self.alex)
+        self.assertEqual(get_next_candidate(self.absent.id, [self.jordan.id])['name'], 'Sam')
+        self.assertEqual(get_next_candidate(self.absent.id, [self.jordan.id, self.sam.id])['name'], 'Alex')
+
+
 # ---------------------------------------------------------------------------
 # Event logging API tests
 # ---------------------------------------------------------------------------
@@ -4,28 +4,38 @@ AI Assistant Chat Panel — OpenAI function-calling powered admin assistant.
 POST /api/assistant/chat/
 Body: { "messages": [...], "conversation_id": "optional-uuid" }
 
+POST /api/assistant/chat/stream/ — same, as server-sent events (tool progress + reply tokens)
+
 The assistant can:
 - Read business state (bookings, staff, compliance, CRM, documents)
 - Execute actions (mark sick, request cover, approve leave, add leads, etc.)
 - Provide explanations and recommendations
 - Navigate the user to relevant pages
 
-Uses OpenAI function calling so the LLM decides which tools to invoke.
+Uses OpenAI function calling (via core.llm_gateway) so the LLM decides which tools to invoke.
 All tool calls are executed server-side and results fed back to the LLM
-for a natural language summary.
+for a natural language summary. Read-only tools requested in the same turn
+run concurrently; mutating tools (MUTATING_TOOLS) run alone, in order.
 """
 import json
 import logging
+import threading
+import time as time_mod
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, time, timedelta, datetime
 
 from django.conf import settings
+from django.db import connection, connections
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from core import llm_gateway
+from core.sse import sse_response
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════
@@ -263,25 +273,15 @@ TOOLS = [
 # ═══════════════════════════════════════════════════════════════
 
 def _resolve_staff(tenant, name):
-    """Find staff member by name (first name or full name match)."""
+    """
+    Find staff member by name (display, full or first name) via the staff name index.
+    Returns (StaffProfile or None, [names]) — names lists the candidates when ambiguous.
+    """
     try:
-        from staff.models import StaffProfile
-        name_lower = name.lower().strip()
-        profiles = StaffProfile.objects.filter(tenant=tenant, is_active=True).select_related('user')
-        for p in profiles:
-            first = p.user.first_name.strip().lower()
-            full = f"{p.user.first_name} {p.user.last_name}".strip().lower()
-            display = (p.display_name or '').strip().lower()
-            if display == name_lower or full == name_lower or first == name_lower:
-                return p
-        # Partial match
-        for p in profiles:
-            first = p.user.first_name.strip().lower()
-            if first and name_lower.startswith(first):
-                return p
+        from staff.name_index import resolve_staff
+        return resolve_staff(tenant, name)
     except Exception:
-        pass
-    return None
+        return None, []
 
 
 def _resolve_booking_staff(tenant, name):
@@ -299,7 +299,13 @@ def _resolve_booking_staff(tenant, name):
 
 def tool_mark_staff_sick(tenant, args):
     staff_name = args.get('staff_name', '')
-    staff = _resolve_staff(tenant, staff_name)
+    staff, ambiguous = _resolve_staff(tenant, staff_name)
+    if ambiguous:
+        return {
+            "success": False,
+            "ambiguous": ambiguous,
+            "message": f"'{staff_name}' matches more than one staff member: {', '.join(ambiguous)}. Which one?",
+        }
     today = date.today()
     display = staff_name
     created = False
@@ -691,50 +697,110 @@ TOOL_DISPATCH = {
 }
 
 
-# ═══════════════════════════════════════════════════════════════
-# MAIN CHAT ENDPOINT
-# ═══════════════════════════════════════════════════════════════
+# Tools that write — always run alone, in the order the LLM asked for them
+MUTATING_TOOLS = {"mark_staff_sick", "add_crm_lead"}
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def ai_chat(request):
+_tool_pool = None
+_tool_pool_lock = threading.Lock()
+
+
+def _get_tool_pool():
+    """Process-wide bounded pool for read-only tools (settings.AI_TOOL_WORKERS)."""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            workers = getattr(settings, 'AI_TOOL_WORKERS', 4)
+            _tool_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-tool')
+        return _tool_pool
+
+
+def _run_tool(tenant, fn_name, fn_args):
+    """Run one tool, returning (result, elapsed ms)."""
+    started = time_mod.monotonic()
+    handler = TOOL_DISPATCH.get(fn_name)
+    if handler:
+        result = handler(tenant, fn_args)
+    else:
+        result = {"error": f"Unknown tool: {fn_name}"}
+    return result, round((time_mod.monotonic() - started) * 1000, 1)
+
+
+def _run_tool_in_thread(tenant, fn_name, fn_args):
+    try:
+        return _run_tool(tenant, fn_name, fn_args)
+    finally:
+        connections.close_all()  # thread-local — only closes this worker's connections
+
+
+def iter_tools(tenant, calls):
     """
-    POST /api/assistant/chat/
-    Body: {
-        "messages": [
-            {"role": "user", "content": "Sam has called in sick today"}
-        ]
-    }
+    Execute one turn's tool calls [(fn_name, fn_args)], yielding
+    (index, result, ms, parallel) as each tool finishes.
 
-    Returns: {
-        "reply": "I've marked Sam as sick for today. He had 2 bookings...",
-        "tool_calls": [...],
-        "navigate": "/admin/staff" (optional)
-    }
+    Runs of consecutive read-only tools execute concurrently on the tool pool,
+    each worker on its own DB connection; a mutating tool is a barrier and runs
+    alone on the request thread, so reads after a write still see it. Inside a
+    transaction (other connections can't see its writes) everything is serial.
     """
+    parallel_ok = getattr(settings, 'AI_TOOL_WORKERS', 4) > 1 and not connection.in_atomic_block
+
+    # A mutating tool is always a segment of its own
+    segments = []
+    previous_mutating = True
+    for i, (fn_name, _) in enumerate(calls):
+        mutating = fn_name in MUTATING_TOOLS
+        if mutating or previous_mutating:
+            segments.append([i])
+        else:
+            segments[-1].append(i)
+        previous_mutating = mutating
+
+    for indexes in segments:
+        if len(indexes) > 1 and parallel_ok:
+            pool = _get_tool_pool()
+            futures = {pool.submit(_run_tool_in_thread, tenant, *calls[i]): i for i in indexes}
+            for future in as_completed(futures):
+                yield (futures[future], *future.result(), True)
+        else:
+            for i in indexes:
+                yield (i, *_run_tool(tenant, *calls[i]), False)
+
+
+def dispatch_tools(tenant, calls):
+    """iter_tools() collected in call order: [(result, ms, parallel)]."""
+    results = [None] * len(calls)
+    for i, result, elapsed_ms, parallel in iter_tools(tenant, calls):
+        results[i] = (result, elapsed_ms, parallel)
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN CHAT ENDPOINT
+# ═══════════════════════════════════════════════════════════════
+
+def _prepare_chat(request):
+    """Validate an assistant request → (tenant, openai_messages, error Response or None)."""
     tenant = getattr(request, 'tenant', None)
 
     # Module gate — ai_assistant must be enabled for this tenant
     if tenant:
         enabled = tenant.enabled_modules or []
         if enabled and 'ai_assistant' not in enabled:
-            return Response(
+            return tenant, None, Response(
                 {'error': 'AI Assistant is a paid add-on. Contact support to enable it.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-    import os
-    api_key = getattr(settings, 'OPENAI_API_KEY', '') or os.environ.get('OPENAI_API_KEY', '')
-    if not api_key:
+    if not llm_gateway.is_configured():
         logger.error('[AI] OPENAI_API_KEY not found in settings or os.environ')
-        return Response(
+        return tenant, None, Response(
             {'error': 'AI assistant is not configured. Set OPENAI_API_KEY in environment.'},
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
     messages = request.data.get('messages', [])
     if not messages:
-        return Response(
+        return tenant, None, Response(
             {'error': 'messages array is required.'},
             status=status.HTTP_400_BAD_REQUEST,
         )
@@ -747,92 +813,171 @@ def ai_chat(request):
         role = msg.get('role', 'user')
         if role in ('user', 'assistant'):
             openai_messages.append({"role": role, "content": msg.get('content', '')})
+    return tenant, openai_messages, None
 
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        model = getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini')
-
-        # First call — LLM decides what tools to use
-        response = client.chat.completions.create(
-            model=model,
-            messages=openai_messages,
-            tools=TOOLS,
-            tool_choice="auto",
-            temperature=0.3,
-            max_tokens=1000,
-        )
 
-        assistant_message = response.choices[0].message
-        tool_calls_made = []
-        navigate_to = None
-
-        # Process tool calls in a loop (LLM may chain multiple)
-        max_iterations = 5
-        iteration = 0
-
-        while assistant_message.tool_calls and iteration < max_iterations:
-            iteration += 1
-
-            # Add the assistant's message with tool calls
-            openai_messages.append(assistant_message.model_dump())
-
-            # Execute each tool call
-            for tc in assistant_message.tool_calls:
-                fn_name = tc.function.name
-                try:
-                    fn_args = json.loads(tc.function.arguments)
-                except json.JSONDecodeError:
-                    fn_args = {}
-
-                handler = TOOL_DISPATCH.get(fn_name)
-                if handler:
-                    result = handler(tenant, fn_args)
-                    # Check for navigation
-                    if fn_name == 'navigate_user' or (isinstance(result, dict) and 'navigate' in result):
-                        navigate_to = result.get('navigate')
-                else:
-                    result = {"error": f"Unknown tool: {fn_name}"}
-
-                tool_calls_made.append({
-                    "tool": fn_name,
-                    "args": fn_args,
-                    "result": result,
-                })
+def _ask_llm(openai_messages, streaming):
+    """One LLM round trip. Yields ('token', ...) events when streaming; returns the Completion."""
+    params = dict(purpose='assistant', tools=TOOLS, tool_choice="auto", temperature=0.3, max_tokens=1000)
+    if not streaming:
+        return llm_gateway.complete(openai_messages, **params)
+    for item in llm_gateway.stream(openai_messages, **params):
+        if isinstance(item, str):
+            yield 'token', {"text": item}
+        else:
+            completion = item
+    return completion
 
-                # Feed result back to OpenAI
-                openai_messages.append({
-                    "role": "tool",
-                    "tool_call_id": tc.id,
-                    "content": json.dumps(result, default=str),
-                })
 
-            # Ask LLM to summarise the results (may trigger more tool calls)
-            response = client.chat.completions.create(
-                model=model,
-                messages=openai_messages,
-                tools=TOOLS,
-                tool_choice="auto",
-                temperature=0.3,
-                max_tokens=1000,
-            )
-            assistant_message = response.choices[0].message
+def run_chat(tenant, openai_messages, streaming=False):
+    """
+    The assistant's tool loop as a generator of (event, data) pairs:
+        token        — reply text as it arrives (streaming only)
+        tool_call    — a tool the LLM asked for
+        tool_result  — that tool finished (in completion order)
+        done         — the full ai_chat response body (always last)
+    """
+    # First call — LLM decides what tools to use
+    completion = yield from _ask_llm(openai_messages, streaming)
+
+    tool_calls_made = []
+    turn_timings = []
+    navigate_to = None
+
+    # Process tool calls in a loop (LLM may chain multiple)
+    max_iterations = 5
+    iteration = 0
+
+    while completion.tool_calls and iteration < max_iterations:
+        iteration += 1
+
+        # Add the assistant's message with tool calls
+        openai_messages.append(completion.message)
+
+        calls = []
+        for tc in completion.tool_calls:
+            try:
+                fn_args = json.loads(tc['function']['arguments'])
+            except json.JSONDecodeError:
+                fn_args = {}
+            calls.append((tc['function']['name'], fn_args))
+            yield 'tool_call', {"tool": calls[-1][0], "args": fn_args, "turn": iteration}
+
+        # Execute this turn's tool calls (read-only ones concurrently)
+        outcomes = [None] * len(calls)
+        turn_started = time_mod.monotonic()
+        for i, result, elapsed_ms, parallel in iter_tools(tenant, calls):
+            outcomes[i] = (result, elapsed_ms, parallel)
+            progress = {"tool": calls[i][0], "turn": iteration, "ms": elapsed_ms}
+            if isinstance(result, dict) and result.get('message'):
+                progress["message"] = result['message']
+            yield 'tool_result', progress
+        turn_ms = round((time_mod.monotonic() - turn_started) * 1000, 1)
+
+        for tc, (fn_name, fn_args), (result, elapsed_ms, parallel) in zip(completion.tool_calls, calls, outcomes):
+            # Check for navigation
+            if fn_name in TOOL_DISPATCH and (
+                fn_name == 'navigate_user' or (isinstance(result, dict) and 'navigate' in result)
+            ):
+                navigate_to = result.get('navigate')
+
+            tool_calls_made.append({
+                "tool": fn_name,
+                "args": fn_args,
+                "result": result,
+                "ms": elapsed_ms,
+                "parallel": parallel,
+                "turn": iteration,
+            })
+
+            # Feed result back to OpenAI
+            openai_messages.append({
+                "role": "tool",
+                "tool_call_id": tc['id'],
+                "content": json.dumps(result, default=str),
+            })
+        turn_timings.append({"turn": iteration, "tools": len(calls), "ms": turn_ms})
 
-        # Final reply text
-        reply = assistant_message.content or "Done."
+        # Ask LLM to summarise the results (may trigger more tool calls)
+        completion = yield from _ask_llm(openai_messages, streaming)
 
-        result = {
-            "reply": reply,
-            "tool_calls": [{"tool": tc["tool"], "args": tc["args"]} for tc in tool_calls_made],
+    # Final reply text
+    reply = completion.content or "Done."
+
+    result = {
+        "reply": reply,
+        "tool_calls": [{"tool": tc["tool"], "args": tc["args"]} for tc in tool_calls_made],
+    }
+    if navigate_to:
+        result["navigate"] = navigate_to
+    if settings.DEBUG:
+        result["debug"] = {
+            "tool_timings": [
+                {k: tc[k] for k in ("tool", "turn", "ms", "parallel")} for tc in tool_calls_made
+            ],
+            "turns": turn_timings,
         }
-        if navigate_to:
-            result["navigate"] = navigate_to
+    yield 'done', result
 
-        return Response(result)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ai_chat(request):
+    """
+    POST /api/assistant/chat/
+    Body: {
+        "messages": [
+            {"role": "user", "content": "Sam has called in sick today"}
+        ]
+    }
+
+    Returns: {
+        "reply": "I've marked Sam as sick for today. He had 2 bookings...",
+        "tool_calls": [...],
+        "navigate": "/admin/staff" (optional),
+        "debug": {"tool_timings": [...], "turns": [...]} (DEBUG only)
+    }
+    """
+    tenant, openai_messages, error = _prepare_chat(request)
+    if error:
+        return error
+
+    try:
+        for event, data in run_chat(tenant, openai_messages):
+            if event == 'done':
+                return Response(data)
     except Exception as e:
         logger.error(f"[AI] Chat error: {e}", exc_info=True)
         return Response(
             {'error': f'AI assistant error: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ai_chat_stream(request):
+    """
+    POST /api/assistant/chat/stream/
+    Same body as ai_chat. Responds with text/event-stream:
+
+        event: tool_call     data: {"tool", "args", "turn"}
+        event: tool_result   data: {"tool", "turn", "ms", "message"?}
+        event: token         data: {"text"}
+        event: done          data: <the ai_chat response body>
+        event: error         data: {"error"}
+
+    Validation errors (403/503/400) are returned as plain JSON before the stream starts.
+    """
+    tenant, openai_messages, error = _prepare_chat(request)
+    if error:
+        return error
+
+    def events():
+        try:
+            yield from run_chat(tenant, openai_messages, streaming=True)
+        except Exception as e:
+            logger.error(f"[AI] Chat stream error: {e}", exc_info=True)
+            yield 'error', {'error': f'AI assistant error: {str(e)}'}
+
+    return sse_response(request, events())
@@ -20,6 +20,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from core.intent_matcher import IntentMatcher
+
 
 # Keyword-to-event-type mapping for deterministic parsing
 PARSE_RULES = [
@@ -139,6 +141,9 @@ PARSE_RULES = [
     },
 ]
 
+# Compiled once at import — one pass over the text whatever the number of rules
+PARSE_MATCHER = IntentMatcher((rule, rule['keywords']) for rule in PARSE_RULES)
+
 # Common staff name patterns to extract
 ENTITY_EXTRACTORS = {
     'staff_name': None,  # Extracted dynamically from DB
@@ -162,8 +167,11 @@ def parse_command(request):
             "description": "Mark staff member as sick",
             "entities": { "staff_name": "Chloe" },
             "confidence": "keyword_match",
+            "matched_keyword": "off sick",
+            "matched_spans": [[10, 18]],
             "original_text": "Chloe is off sick today"
         },
+        "alternatives": [...],  # other matching intents, best first
         "confirmation_required": true,
         "confirmation_message": "Mark Chloe as sick today?"
     }
@@ -178,25 +186,19 @@ def parse_command(request):
 
     text_lower = text.lower()
 
-    # 1. Match intent by keywords
-    matched_rule = None
-    matched_keyword = None
-    for rule in PARSE_RULES:
-        for kw in rule['keywords']:
-            if kw in text_lower:
-                matched_rule = rule
-                matched_keyword = kw
-                break
-        if matched_rule:
-            break
+    # 1. Match intent by keywords (first rule in PARSE_RULES order wins)
+    matches = PARSE_MATCHER.match(text_lower)
 
-    if not matched_rule:
+    if not matches:
         return Response({
             'parsed': False,
             'intent': None,
             'message': 'Could not understand that command. Try something like: "Chloe is off sick" or "Assign Sam to the 11:00 booking".',
         })
 
+    matched_rule = matches[0]['intent']
+    matched_keyword = matches[0]['keyword']
+
     # 2. Extract entities (staff names from DB)
     entities = _extract_entities(text)
 
@@ -212,8 +214,13 @@ def parse_command(request):
             'entities': entities,
             'confidence': 'keyword_match',
             'matched_keyword': matched_keyword,
+            'matched_spans': [[start, end] for start, end, _ in matches[0]['spans']],
             'original_text': text,
         },
+        'alternatives': [
+            {'event_type': m['intent']['event_type'], 'action': m['intent']['action'], 'matched_keyword': m['keyword']}
+            for m in matches[1:]
+        ],
         'confirmation_required': True,
         'confirmation_message': confirmation,
     })
@@ -0,0 +1,28 @@
+"""
+Profiling read-out — rolling per-endpoint stats from PerfProfilingMiddleware.
+
+GET    /api/_perf/              every (URL name, tenant), slowest p95 first
+GET    /api/_perf/?name=<url>   one URL name
+DELETE /api/_perf/              clear this worker's window
+
+Stats are per worker process; `enabled` is false when PERF_PROFILING is off.
+"""
+from django.conf import settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from core import perf
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def perf_stats(request):
+    if request.method == 'DELETE':
+        perf.reset()
+        return Response({'cleared': True})
+    return Response({
+        'enabled': getattr(settings, 'PERF_PROFILING', False),
+        'window': getattr(settings, 'PERF_WINDOW', 500),
+        'endpoints': perf.snapshot(request.query_params.get('name') or None),
+    })
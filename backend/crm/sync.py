@@ -0,0 +1,98 @@
+"""
+Set-based CRM lead sync from booking clients.
+
+Runs in a fixed number of queries per batch regardless of client count:
+1. Anti-join: clients with no Lead pointing at them (NOT EXISTS)
+2. One grouped conditional aggregate over their bookings for value + status
+3. bulk_create the Lead rows
+4. bulk_create the matching LeadHistory rows
+
+Idempotent — a second run finds no unlinked clients and creates nothing.
+Used by POST /api/crm/sync/ and the sync_crm_leads management command.
+"""
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+
+from .models import Lead, LeadHistory
+
+LIVE_STATUSES = ('confirmed', 'completed')
+BATCH_SIZE = 1000
+
+
+def _lead_status(completed, confirmed):
+    """Same rules as the per-client sync: completed → CONVERTED, confirmed → QUALIFIED."""
+    if completed:
+        return 'CONVERTED'
+    if confirmed:
+        return 'QUALIFIED'
+    return 'NEW'
+
+
+def unlinked_client_rows(tenant=None):
+    """
+    Values queryset of clients without a lead, annotated with booking aggregates.
+    One query; the aggregate is computed per client in the database.
+    """
+    from bookings.models import Client
+
+    has_lead = Lead.objects.filter(tenant_id=OuterRef('tenant_id'), client_id=OuterRef('pk'))
+    qs = Client.objects.all()
+    if tenant is not None:
+        qs = qs.filter(tenant=tenant)
+    live = Q(bookings__status__in=LIVE_STATUSES)
+    return (
+        qs.filter(~Exists(has_lead))
+        .values('id', 'tenant_id', 'name', 'email', 'phone')
+        .annotate(
+            booking_count=Count('bookings', filter=live),
+            completed_count=Count('bookings', filter=Q(bookings__status='completed')),
+            confirmed_count=Count('bookings', filter=Q(bookings__status='confirmed')),
+            value=Sum('bookings__service__price', filter=live),
+        )
+        .order_by('id')
+    )
+
+
+def _flush(rows):
+    leads = []
+    for row in rows:
+        total_pence = int((row['value'] or 0) * 100)
+        leads.append(Lead(
+            tenant_id=row['tenant_id'],
+            name=row['name'],
+            email=row['email'],
+            phone=row['phone'],
+            source='booking',
+            status=_lead_status(row['completed_count'], row['confirmed_count']),
+            value_pence=total_pence,
+            notes=f"Auto-imported from bookings. {row['booking_count']} booking(s).",
+            client_id=row['id'],
+        ))
+    Lead.objects.bulk_create(leads)
+    LeadHistory.objects.bulk_create([
+        LeadHistory(
+            lead=lead,
+            action='Synced from bookings',
+            detail=f"{row['booking_count']} booking(s), £{lead.value_pence / 100:.2f}",
+        )
+        for lead, row in zip(leads, rows)
+    ])
+    return len(leads)
+
+
+def sync_leads_from_bookings(tenant=None, batch_size=BATCH_SIZE):
+    """
+    Create a Lead (plus a history entry) for every client that doesn't have one.
+    Scoped to `tenant` when given, otherwise all tenants. Returns the number created.
+    """
+    created = 0
+    rows = unlinked_client_rows(tenant)
+    last_id = 0
+    with transaction.atomic():
+        while True:
+            batch = list(rows.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            created += _flush(batch)
+            last_id = batch[-1]['id']
+    return created
@@ -0,0 +1,144 @@
+"""
+Tests for the set-based CRM lead sync.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from crm.models import Lead, LeadHistory
+from crm.sync import sync_leads_from_bookings
+
+
+class SyncLeadsFromBookingsTests(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        from bookings.models import Service, Staff, Client
+        self.tenant = TenantSettings.objects.create(slug='crm-test', business_name='CRM Test')
+        self.other = TenantSettings.objects.create(slug='crm-other', business_name='Other')
+        self.service = Service.objects.create(
+            tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('25.50'),
+        )
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@crm.test')
+        self.alice = Client.objects.create(tenant=self.tenant, name='Alice', email='a@crm.test', phone='1')
+        self.bob = Client.objects.create(tenant=self.tenant, name='Bob', email='b@crm.test', phone='2')
+        self.cara = Client.objects.create(tenant=self.tenant, name='Cara', email='c@crm.test', phone='3')
+        self.dave = Client.objects.create(tenant=self.other, name='Dave', email='d@crm.test', phone='4')
+
+    def _book(self, client, status):
+        from bookings.models import Booking
+        start = timezone.now() + timedelta(days=1)
+        return Booking.objects.create(
+            tenant=client.tenant, client=client, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(minutes=30), status=status,
+        )
+
+    def test_status_and_value_per_client(self):
+        self._book(self.alice, 'completed')
+        self._book(self.alice, 'confirmed')
+        self._book(self.alice, 'cancelled')
+        self._book(self.bob, 'confirmed')
+
+        created = sync_leads_from_bookings(tenant=self.tenant)
+
+        self.assertEqual(created, 3)
+        alice = Lead.objects.get(client_id=self.alice.id)
+        self.assertEqual(alice.status, 'CONVERTED')
+        self.assertEqual(alice.value_pence, 5100)
+        self.assertEqual(alice.tenant, self.tenant)
+        self.assertIn('2 booking(s)', alice.notes)
+        self.assertEqual(Lead.objects.get(client_id=self.bob.id).status, 'QUALIFIED')
+        cara = Lead.objects.get(client_id=self.cara.id)
+        self.assertEqual((cara.status, cara.value_pence), ('NEW', 0))
+        self.assertEqual(LeadHistory.objects.filter(lead__tenant=self.tenant).count(), 3)
+        self.assertFalse(Lead.objects.filter(client_id=self.dave.id).exists())
+
+    def test_idempotent(self):
+        self._book(self.alice, 'completed')
+        self.assertEqual(sync_leads_from_bookings(), 4)
+        self.assertEqual(sync_leads_from_bookings(), 0)
+        self.assertEqual(Lead.objects.count(), 4)
+        self.assertEqual(LeadHistory.objects.count(), 4)
+
+    def test_existing_lead_skipped(self):
+        Lead.objects.create(tenant=self.tenant, name='Alice', client_id=self.alice.id)
+        self.assertEqual(sync_leads_from_bookings(tenant=self.tenant), 2)
+        self.assertEqual(Lead.objects.filter(client_id=self.alice.id).count(), 1)
+
+    def test_query_count_independent_of_client_count(self):
+        from bookings.models import Client
+        Client.objects.bulk_create([
+            Client(tenant=self.tenant, name=f'Client {i}', email=f'c{i}@crm.test', phone=str(i))
+            for i in range(50)
+        ])
+        with CaptureQueriesContext(connection) as ctx:
+            sync_leads_from_bookings(tenant=self.tenant, batch_size=100)
+        # select batch, insert leads, insert history, empty select (+ savepoint bookkeeping)
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+
+
+class RevenueStatsTests(TestCase):
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.test import RequestFactory
+        from tenants.models import TenantSettings
+        from bookings.models import Service, Staff, Client, Booking
+        self.tenant = TenantSettings.objects.create(slug='crm-rev', business_name='CRM Revenue')
+        self.user = get_user_model().objects.create_user(
+            username='owner', email='owner@crm.test', password='test1234',
+        )
+        self.factory = RequestFactory()
+        service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('40.00'))
+        staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@crm-rev.test')
+        start = timezone.now()
+        for i, (source, lead_status, value, paid) in enumerate([
+            ('booking', 'CONVERTED', 1000, ['40.00', '12.50']),
+            ('booking', 'NEW', 2000, []),
+            ('website', 'QUALIFIED', 3000, []),
+            ('website', 'CONVERTED', 500, ['20.00']),
+            ('referral', 'LOST', 700, []),
+        ]):
+            client = Client.objects.create(tenant=self.tenant, name=f'C{i}', email=f'c{i}@crm-rev.test', phone='0')
+            for amount in paid:
+                Booking.objects.create(
+                    tenant=self.tenant, client=client, service=service, staff=staff,
+                    start_time=start, end_time=start + timedelta(minutes=30),
+                    status='completed', payment_amount=Decimal(amount),
+                )
+            Lead.objects.create(
+                tenant=self.tenant, name=f'Lead {i}', source=source, status=lead_status,
+                value_pence=value, client_id=client.id,
+            )
+
+    def _get(self):
+        from rest_framework.test import force_authenticate
+        from crm.views import revenue_stats
+        request = self.factory.get('/api/crm/revenue/')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        return revenue_stats(request)
+
+    def test_pipeline_sources_and_funnel(self):
+        data = self._get().data
+        self.assertEqual(data['total_leads'], 5)
+        self.assertEqual(data['pipeline_value_pence'], 5000)
+        self.assertEqual(data['converted_revenue_pence'], 7250)
+        self.assertEqual(data['overall_conversion_rate'], 40.0)
+        self.assertEqual(data['funnel']['CONVERTED'], {'count': 2, 'value_pence': 1500})
+        self.assertEqual(data['funnel']['CONTACTED'], {'count': 0, 'value_pence': 0})
+        sources = {s['source']: s for s in data['sources']}
+        self.assertEqual(data['sources'][0]['source'], 'booking')
+        self.assertEqual(sources['booking']['revenue_pence'], 5250)
+        self.assertEqual(sources['booking']['pipeline_pence'], 2000)
+        self.assertEqual(sources['website']['conversion_rate'], 50.0)
+        self.assertEqual(sources['referral']['pipeline_pence'], 0)
+
+    def test_query_count_constant(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._get()
+        self.assertLessEqual(len(ctx.captured_queries), 3)
@@ -348,54 +348,55 @@ def export_leads_csv(request):
 def revenue_stats(request):
     """GET /api/crm/revenue/ — Pipeline forecast, source attribution, conversion funnel."""
     from collections import defaultdict
-    from bookings.models import Client, Booking
+    from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum
+    from bookings.models import Booking
 
     tenant = getattr(request, 'tenant', None)
-    leads = Lead.objects.filter(tenant=tenant)
 
-    # --- Per-lead revenue enrichment ---
-    client_ids = [l.client_id for l in leads if l.client_id]
-    clients_by_id = {}
-    if client_ids:
-        clients_by_id = {c.id: c for c in Client.objects.filter(id__in=client_ids, tenant=tenant)}
-
-    # Booking aggregates per client
-    booking_stats = {}
-    if client_ids:
-        from django.db.models import Sum, Count, Max, Q
-        qs = Booking.objects.filter(
-            client_id__in=client_ids, tenant=tenant
-        ).values('client_id').annotate(
-            total_bookings=Count('id'),
-            completed_bookings=Count('id', filter=Q(status='completed')),
-            total_revenue=Sum('payment_amount', filter=Q(status__in=['completed', 'confirmed'])),
-            last_booking=Max('start_time'),
-        )
-        for row in qs:
-            booking_stats[row['client_id']] = row
+    # Booked revenue per linked client, correlated on Lead.client_id
+    client_revenue = Booking.objects.filter(
+        tenant=tenant, client_id=OuterRef('client_id'), status__in=['completed', 'confirmed'],
+    ).order_by().values('client_id').annotate(
+        total=Sum('payment_amount'),
+    ).values('total')
+
+    # One grouped query: a row per (source, status) cell with count, value and revenue
+    cells = Lead.objects.filter(tenant=tenant).annotate(
+        client_revenue=Subquery(client_revenue, output_field=DecimalField(max_digits=12, decimal_places=2)),
+    ).order_by().values('source', 'status').annotate(
+        count=Count('id'),
+        value_pence=Sum('value_pence'),
+        revenue=Sum('client_revenue'),
+    )
 
-    # --- Pipeline forecast ---
     pipeline_value = 0
     converted_revenue = 0
-    for l in leads:
-        if l.status in ('NEW', 'CONTACTED', 'QUALIFIED'):
-            pipeline_value += l.value_pence
-        if l.status == 'CONVERTED' and l.client_id and l.client_id in booking_stats:
-            rev = booking_stats[l.client_id].get('total_revenue') or 0
-            converted_revenue += int(float(rev) * 100)  # Decimal → pence
-
-    # --- Source attribution ---
+    total_leads = 0
+    funnel = {s: {'count': 0, 'value_pence': 0} for s in ['NEW', 'CONTACTED', 'QUALIFIED', 'CONVERTED', 'LOST']}
     source_stats = defaultdict(lambda: {'leads': 0, 'converted': 0, 'revenue_pence': 0, 'pipeline_pence': 0})
-    for l in leads:
-        s = source_stats[l.source]
-        s['leads'] += 1
-        if l.status == 'CONVERTED':
-            s['converted'] += 1
-            if l.client_id and l.client_id in booking_stats:
-                rev = booking_stats[l.client_id].get('total_revenue') or 0
-                s['revenue_pence'] += int(float(rev) * 100)
-        elif l.status != 'LOST':
-            s['pipeline_pence'] += l.value_pence
+
+    for cell in cells:
+        lead_status = cell['status']
+        value = cell['value_pence'] or 0
+        total_leads += cell['count']
+
+        # --- Conversion funnel ---
+        if lead_status in funnel:
+            funnel[lead_status]['count'] += cell['count']
+            funnel[lead_status]['value_pence'] += value
+
+        # --- Pipeline forecast + source attribution ---
+        s = source_stats[cell['source']]
+        s['leads'] += cell['count']
+        if lead_status in ('NEW', 'CONTACTED', 'QUALIFIED'):
+            pipeline_value += value
+        if lead_status == 'CONVERTED':
+            revenue_pence = int((cell['revenue'] or 0) * 100)  # Decimal → pence
+            converted_revenue += revenue_pence
+            s['converted'] += cell['count']
+            s['revenue_pence'] += revenue_pence
+        elif lead_status != 'LOST':
+            s['pipeline_pence'] += value
 
     source_list = []
     for source, data in sorted(source_stats.items(), key=lambda x: -x[1]['revenue_pence']):
@@ -409,14 +410,6 @@ def revenue_stats(request):
             'pipeline_pence': data['pipeline_pence'],
         })
 
-    # --- Conversion funnel ---
-    funnel = {}
-    for s in ['NEW', 'CONTACTED', 'QUALIFIED', 'CONVERTED', 'LOST']:
-        stage_leads = [l for l in leads if l.status == s]
-        stage_value = sum(l.value_pence for l in stage_leads)
-        funnel[s] = {'count': len(stage_leads), 'value_pence': stage_value}
-
-    total_leads = leads.count()
     converted_count = funnel['CONVERTED']['count']
     overall_conversion_rate = round((converted_count / total_leads * 100) if total_leads > 0 else 0, 1)
 
@@ -489,38 +482,10 @@ def sync_from_bookings(request):
     """POST /api/crm/sync/ — Create leads from booking clients that don't already exist"""
     import traceback
     try:
-        from bookings.models import Client, Booking
+        from .sync import sync_leads_from_bookings
 
-        created_count = 0
         tenant = getattr(request, 'tenant', None)
-        for client in Client.objects.filter(tenant=tenant):
-            if Lead.objects.filter(tenant=tenant, client_id=client.id).exists():
-                continue
-            # Calculate total booking value for this client
-            total_pence = 0
-            bookings = Booking.objects.filter(client=client, status__in=['confirmed', 'completed'])
-            for b in bookings:
-                if b.service:
-                    total_pence += b.service.price_pence
-
-            lead_status = 'CONVERTED' if bookings.filter(status='completed').exists() else 'NEW'
-            if bookings.filter(status='confirmed').exists() and lead_status == 'NEW':
-                lead_status = 'QUALIFIED'
-
-            lead = Lead.objects.create(
-                tenant=tenant,
-                name=client.name,
-                email=client.email,
-                phone=client.phone,
-                source='booking',
-                status=lead_status,
-                value_pence=total_pence,
-                notes=f'Auto-imported from bookings. {bookings.count()} booking(s).',
-                client_id=client.id,
-            )
-            _log_history(lead, 'Synced from bookings', f'{bookings.count()} booking(s), £{total_pence/100:.2f}')
-            created_count += 1
-
+        created_count = sync_leads_from_bookings(tenant=tenant)
         return Response({'created': created_count, 'message': f'{created_count} leads synced from bookings'})
     except Exception as e:
         return Response({'error': str(e), 'traceback': traceback.format_exc()}, status=500)
@@ -685,19 +650,14 @@ def parse_email_extract(request):
 def _ai_parse_email(email_text):
     """Call OpenAI to extract structured data from a pasted email/enquiry.
     Uses gpt-4o-mini with JSON response — typically ~300-500 tokens total."""
-    import json
-    import openai
-    from django.conf import settings as django_settings
+    from core import llm_gateway
 
-    api_key = getattr(django_settings, 'OPENAI_API_KEY', '')
-    if not api_key:
+    if not llm_gateway.is_configured():
         return None
 
     try:
-        client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model='gpt-4o-mini',
-            messages=[{
+        completion = llm_gateway.complete(
+            [{
                 'role': 'system',
                 'content': (
                     'You extract structured data from business enquiry emails. '
@@ -724,11 +684,13 @@ def _ai_parse_email(email_text):
                     '}'
                 ),
             }],
+            purpose='crm_parse',
+            model='gpt-4o-mini',
             response_format={'type': 'json_object'},
             temperature=0.2,
             max_tokens=500,
         )
-        return json.loads(response.choices[0].message.content)
+        return completion.json()
     except Exception as e:
         print(f'[CRM AI PARSE ERROR] {e}')
         return None
@@ -0,0 +1,50 @@
+"""
+Live order events for the kitchen display and customers' order pages.
+
+Placing an order, Order.transition_status() and kitchen note/payment edits
+publish an 'order' delta on the tenant's 'orders' channel (core.broker) once
+the transaction commits:
+
+    event: order    data: {"action": "placed" | "status" | "updated", "order": <OrderSerializer>}
+
+Streams (text/event-stream, see core.sse):
+- GET /api/orders/kitchen/stream/ (authenticated) — a 'snapshot' of the
+  kitchen queue ({"orders": [...]}, same filter as /api/orders/kitchen/),
+  then every order delta. The display upserts by id and drops orders whose
+  status it doesn't show.
+- GET /api/orders/status/<ref>/stream/ (public) — a snapshot of one order,
+  then its deltas only.
+
+Reconnecting with Last-Event-ID replays only the deltas that were missed.
+"""
+from core import broker
+
+CHANNEL = 'orders'
+
+
+def publish_order(order, action):
+    from .serializers import OrderSerializer
+    broker.publish(CHANNEL, order.tenant_id, 'order', {'action': action, 'order': OrderSerializer(order).data})
+
+
+def kitchen_events(tenant, statuses, last_event_id=None):
+    from .views import kitchen_orders
+    from .serializers import OrderSerializer
+
+    def snapshot():
+        return {'orders': OrderSerializer(kitchen_orders(tenant, statuses), many=True).data}
+
+    return broker.event_stream(CHANNEL, tenant.pk, snapshot, last_event_id)
+
+
+def order_events(order, last_event_id=None):
+    from .models import Order
+    from .serializers import OrderSerializer
+
+    def snapshot():
+        return {'order': OrderSerializer(Order.objects.prefetch_related('items').get(pk=order.pk)).data}
+
+    def only_this_order(event, data):
+        return data if data['order']['id'] == order.pk else None
+
+    return broker.event_stream(CHANNEL, order.tenant_id, snapshot, last_event_id, transform=only_this_order)
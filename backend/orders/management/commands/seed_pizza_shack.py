@@ -188,6 +188,8 @@ class Command(BaseCommand):
             Order.objects.filter(tenant=tenant, data_origin='DEMO').delete()
             DailyOrderSummary.objects.filter(tenant=tenant, data_origin='DEMO').delete()
             ItemDailySales.objects.filter(tenant=tenant, data_origin='DEMO').delete()
+            # Queryset delete() bypasses the queue depth counter — recount on next read
+            OrderQueueSettings.objects.filter(tenant=tenant).update(active_orders_counted_at=None)
             self.stdout.write('  Cleared old demo data')
 
         # 4. Create menu categories and items
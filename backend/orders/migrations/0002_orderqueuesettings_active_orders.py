@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderqueuesettings',
+            name='active_orders',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='orderqueuesettings',
+            name='active_orders_counted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
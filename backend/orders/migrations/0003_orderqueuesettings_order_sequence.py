@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_orderqueuesettings_active_orders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderqueuesettings',
+            name='order_sequence',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
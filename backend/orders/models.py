@@ -1,5 +1,9 @@
+import hashlib
+import hmac
 import uuid
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 
@@ -9,6 +13,53 @@ DATA_ORIGIN_CHOICES = [
     ('DEMO', 'Demo'),
 ]
 
+# Orders the kitchen still has to get through — what the queue depth counts
+ACTIVE_ORDER_STATUSES = ('received', 'preparing')
+
+ORDER_REF_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+ORDER_REF_MIN_LENGTH = 5   # legacy random refs are 4 characters, so sequence refs never meet them
+
+
+ORDER_REF_ROUNDS = 4
+
+
+def _ref_round(key, round_no, half, modulus):
+    digest = hmac.new(key, f'{round_no}:{half}'.encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], 'big') % modulus
+
+
+def order_ref_for(tenant_id, number):
+    """
+    The public reference for the tenant's `number`th order, e.g. 'K7Q2M'.
+
+    A keyed Feistel permutation of the sequence over 36^k values: the number
+    is split into two halves mod 6^k (36^k = 6^k · 6^k, so the domain is
+    exactly the k-character refs and no cycle-walking is needed), and each of
+    ORDER_REF_ROUNDS rounds adds an HMAC-SHA256 of the other half. Being a
+    bijection, two numbers never share a ref; being non-linear, refs seen by
+    one customer (their own, a neighbour's) say nothing computable about
+    anyone else's without SECRET_KEY. That is all it promises: five base-36
+    characters can still be guessed by brute force, so a ref locates an
+    order, it doesn't authorise access to one. The key is derived from
+    SECRET_KEY, the tenant and k, which grows by one each time the sequence
+    outruns the current width.
+    """
+    width = ORDER_REF_MIN_LENGTH
+    while number >= 36 ** width:
+        width += 1
+    modulus = 6 ** width
+    key = hmac.new(settings.SECRET_KEY.encode(), f'order-ref:{tenant_id}:{width}'.encode(),
+                   hashlib.sha256).digest()
+    left, right = divmod(number, modulus)
+    for round_no in range(ORDER_REF_ROUNDS):
+        left, right = right, (left + _ref_round(key, round_no, right, modulus)) % modulus
+    value = left * modulus + right
+    ref = ''
+    for _ in range(width):
+        value, digit = divmod(value, 36)
+        ref = ORDER_REF_ALPHABET[digit] + ref
+    return ref
+
 
 class MenuCategory(models.Model):
     """Category grouping for menu items (e.g. Pizzas, Sides, Desserts, Drinks)."""
@@ -125,6 +176,33 @@ class Order(models.Model):
     def __str__(self):
         return f"Order #{self.order_ref} — {self.customer_name} ({self.get_status_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        order = super().from_db(db, field_names, values)
+        if 'status' in order.__dict__:
+            order._saved_status = order.status
+        return order
+
+    def save(self, *args, **kwargs):
+        """Save, moving the tenant's queue depth counter when the order enters or leaves the queue."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' not in update_fields:
+            return super().save(*args, **kwargs)
+        was_active = not self._state.adding and getattr(self, '_saved_status', None) in ACTIVE_ORDER_STATUSES
+        delta = (self.status in ACTIVE_ORDER_STATUSES) - was_active
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if delta:
+                OrderQueueSettings.adjust_active_orders(self.tenant_id, delta)
+        self._saved_status = self.status
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            if getattr(self, '_saved_status', None) in ACTIVE_ORDER_STATUSES:
+                OrderQueueSettings.adjust_active_orders(self.tenant_id, -1)
+        return result
+
     @property
     def total_display(self):
         return f"£{self.total_pence / 100:.2f}"
@@ -153,6 +231,8 @@ class Order(models.Model):
             self.cancelled_at = now
         self.status = new_status
         self.save()
+        from .events import publish_order
+        publish_order(self, 'status')
 
 
 class OrderItem(models.Model):
@@ -198,8 +278,15 @@ class OrderQueueSettings(models.Model):
     accept_card = models.BooleanField(default=True)
     accept_cash = models.BooleanField(default=True)
     accept_bank_transfer = models.BooleanField(default=True)
+    # Queue depth — moved by Order.save()/delete(), recounted every ORDER_QUEUE_RECONCILE_SECONDS
+    active_orders = models.IntegerField(default=0, editable=False)
+    active_orders_counted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Orders numbered so far — source of collision-free order refs
+    order_sequence = models.BigIntegerField(default=0, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ('active_orders', 'active_orders_counted_at', 'order_sequence')
+
     class Meta:
         verbose_name = 'Order Queue Settings'
         verbose_name_plural = 'Order Queue Settings'
@@ -207,14 +294,55 @@ class OrderQueueSettings(models.Model):
     def __str__(self):
         return f"Queue settings for {self.tenant}"
 
+    def save(self, *args, **kwargs):
+        # Counters are only written by update(); saving settings must not put back a stale copy
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def adjust_active_orders(cls, tenant_id, delta):
+        """Atomically move the tenant's queue depth (no-op until the settings row exists)."""
+        cls.objects.filter(tenant_id=tenant_id).update(active_orders=F('active_orders') + delta)
+
+    @classmethod
+    def next_order_ref(cls, tenant_id):
+        """
+        Take the tenant's next order number and return its ref. Call inside the
+        transaction that creates the order: the row stays locked until commit,
+        and a rollback hands the number back.
+        """
+        rows = cls.objects.filter(tenant_id=tenant_id)
+        rows.update(order_sequence=F('order_sequence') + 1)
+        return order_ref_for(tenant_id, rows.values_list('order_sequence', flat=True).get())
+
+    def reconcile_active_orders(self):
+        """
+        Recount the queue. Catches what the counter can't see — queryset
+        update()/delete(), bulk_create, two workers saving the same order
+        from stale copies.
+        """
+        count = Order.objects.filter(tenant_id=self.tenant_id, status__in=ACTIVE_ORDER_STATUSES).count()
+        now = timezone.now()
+        OrderQueueSettings.objects.filter(pk=self.pk).update(active_orders=count, active_orders_counted_at=now)
+        self.active_orders, self.active_orders_counted_at = count, now
+        return count
+
+    def active_order_count(self):
+        """Orders received or preparing, from the counter on this row — no query unless a recount is due."""
+        max_age = timezone.timedelta(seconds=settings.ORDER_QUEUE_RECONCILE_SECONDS)
+        if self.active_orders_counted_at is None or timezone.now() - self.active_orders_counted_at > max_age:
+            self.reconcile_active_orders()
+        return max(self.active_orders, 0)
+
     def calculate_wait_time(self):
         """Calculate estimated wait based on active orders."""
         if not self.auto_calculate_wait:
             return self.current_wait_minutes
-        active_orders = Order.objects.filter(
-            tenant=self.tenant,
-            status__in=['received', 'preparing'],
-        ).count()
+        active_orders = self.active_order_count()
         # Simple formula: orders in queue / concurrent capacity * avg prep time
         if self.max_concurrent_orders <= 0:
             return self.avg_prep_time_minutes
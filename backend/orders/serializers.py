@@ -135,10 +135,7 @@ class OrderQueueSettingsSerializer(serializers.ModelSerializer):
         return obj.calculate_wait_time()
 
     def get_active_order_count(self, obj):
-        return Order.objects.filter(
-            tenant=obj.tenant,
-            status__in=['received', 'preparing'],
-        ).count()
+        return obj.active_order_count()
 
 
 class DailyOrderSummarySerializer(serializers.ModelSerializer):
@@ -0,0 +1,297 @@
+"""
+Orders — query budgets for the kitchen display queue and order placement, the
+queue depth counter, order refs, and the live order event streams.
+"""
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import broker
+from core.query_budget import query_budget
+
+from .models import MenuCategory, MenuItem, Order, OrderItem, OrderQueueSettings, order_ref_for
+
+
+class KitchenQueueBudgetTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='kitchen', business_name='Kitchen')
+        user = get_user_model().objects.create_user(username='chef', email='chef@kitchen.test', password=None)
+        self.api = APIClient(HTTP_X_TENANT_SLUG='kitchen')
+        self.api.force_authenticate(user)
+
+        category = MenuCategory.objects.create(tenant=self.tenant, name='Mains')
+        items = [MenuItem.objects.create(tenant=self.tenant, category=category, name=f'Dish {i}', price_pence=500 + i)
+                 for i in range(5)]
+        for n in range(12):
+            order = Order.objects.create(tenant=self.tenant, order_ref=f'K{n:03d}', customer_name=f'Guest {n}',
+                                         status='preparing' if n % 3 == 0 else 'received')
+            for item in items[:n % 4 + 1]:
+                OrderItem.objects.create(order=order, menu_item=item, name=item.name, quantity=2,
+                                         unit_price_pence=item.price_pence)
+
+    def test_queue_query_count_is_flat(self):
+        with query_budget(6, label='kitchen_queue'):
+            response = self.api.get('/api/orders/kitchen/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data), 12)
+        self.assertEqual(data[0]['status'], 'preparing')
+        self.assertEqual(sum(o['item_count'] for o in data), 2 * sum(n % 4 + 1 for n in range(12)))
+
+
+class QueueDepthTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='queue', business_name='Queue Cafe')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='queue')
+        self.queue = OrderQueueSettings.objects.create(tenant=self.tenant, avg_prep_time_minutes=10,
+                                                       max_concurrent_orders=2)
+        self.queue.reconcile_active_orders()
+
+    def _order(self, n, status='received'):
+        return Order.objects.create(tenant=self.tenant, order_ref=f'Q{n:03d}', customer_name='Guest', status=status)
+
+    def _depth(self):
+        return OrderQueueSettings.objects.values_list('active_orders', flat=True).get(pk=self.queue.pk)
+
+    def test_counter_follows_creates_transitions_and_deletes(self):
+        orders = [self._order(n) for n in range(4)]
+        self._order(9, status='collected')
+        self.assertEqual(self._depth(), 4)
+
+        orders[0].transition_status('preparing')     # still in the queue
+        orders[1].transition_status('ready')
+        orders[2].transition_status('cancelled')
+        self.assertEqual(self._depth(), 2)
+
+        Order.objects.get(pk=orders[3].pk).delete()
+        orders[1].kitchen_notes = 'Extra napkins'
+        orders[1].save(update_fields=['kitchen_notes'])
+        self.assertEqual(self._depth(), 1)
+
+    def test_queue_status_reads_the_counter(self):
+        for n in range(5):
+            self._order(n)
+        with query_budget(2, label='public_queue_status'):
+            response = self.api.get('/api/orders/queue-status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['active_order_count'], 5)
+        self.assertEqual(response.json()['calculated_wait_minutes'], 30)
+
+    def test_stale_counter_is_recounted(self):
+        self._order(1)
+        Order.objects.bulk_create([Order(tenant=self.tenant, order_ref=f'B{n}', customer_name='Bulk') for n in range(3)])
+        self.assertEqual(self._depth(), 1)    # bulk_create is invisible to the counter
+
+        with override_settings(ORDER_QUEUE_RECONCILE_SECONDS=0):
+            queue = OrderQueueSettings.objects.get(pk=self.queue.pk)
+            queue.active_orders_counted_at = timezone.now() - timezone.timedelta(seconds=1)
+            self.assertEqual(queue.active_order_count(), 4)
+        self.assertEqual(self._depth(), 4)
+
+    def test_saving_settings_keeps_the_counter(self):
+        stale = OrderQueueSettings.objects.get(pk=self.queue.pk)
+        self._order(1)
+        stale.avg_prep_time_minutes = 8
+        stale.save()
+        self.assertEqual(self._depth(), 1)
+        self.assertEqual(OrderQueueSettings.objects.get(pk=self.queue.pk).avg_prep_time_minutes, 8)
+
+
+class PlaceOrderTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='pizza', business_name='Pizza')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='pizza')
+        category = MenuCategory.objects.create(tenant=self.tenant, name='Pizzas')
+        self.items = [MenuItem.objects.create(tenant=self.tenant, category=category, name=f'Pizza {i}',
+                                              price_pence=800 + 50 * i) for i in range(8)]
+        OrderQueueSettings.objects.create(tenant=self.tenant).reconcile_active_orders()
+
+    def _place(self, lines, **extra):
+        return self.api.post('/api/orders/place/', {'customer_name': 'Group', 'items': lines, **extra}, format='json')
+
+    def test_group_order_query_count_is_flat(self):
+        lines = [{'menu_item_id': self.items[n % 8].id, 'quantity': n % 3 + 1, 'notes': f'line {n}'}
+                 for n in range(24)]
+        # tenant, queue settings, menu items, ref sequence (2), order + queue depth, lines — plus the savepoint pair
+        with query_budget(10, label='place_order'):
+            response = self._place(lines)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        expected = sum((n % 3 + 1) * (800 + 50 * (n % 8)) for n in range(24))
+        self.assertEqual((data['subtotal_pence'], data['total_pence']), (expected, expected))
+        self.assertEqual(len(data['items']), 24)
+        self.assertEqual(data['item_count'], sum(n % 3 + 1 for n in range(24)))
+
+        order = Order.objects.get(pk=data['id'])
+        self.assertEqual(order.total_pence, expected)
+        self.assertEqual(order.items.count(), 24)
+        self.assertEqual(OrderQueueSettings.objects.get(tenant=self.tenant).active_orders, 1)
+
+    def test_refs_follow_the_tenant_sequence(self):
+        refs = [self._place([{'menu_item_id': self.items[0].id}]).json()['order_ref'] for _ in range(3)]
+        self.assertEqual(refs, [order_ref_for(self.tenant.pk, n) for n in (1, 2, 3)])
+        self.assertRegex(refs[0], r'^[0-9A-Z]{5}$')
+        self.assertEqual(self.api.get(f'/api/orders/status/{refs[1].lower()}/').json()['order_ref'], refs[1])
+
+    def test_order_refs_are_a_permutation(self):
+        refs = {order_ref_for(7, n) for n in range(20000)}
+        self.assertEqual(len(refs), 20000)
+        self.assertEqual(len(order_ref_for(7, 36 ** 5)), 6)
+        self.assertNotEqual(order_ref_for(7, 1), order_ref_for(8, 1))
+
+    def test_consecutive_refs_reveal_no_step(self):
+        # An affine map would give every consecutive pair the same difference mod 36^5
+        values = [int(order_ref_for(7, n), 36) for n in range(41, 61)]
+        steps = {(b - a) % 36 ** 5 for a, b in zip(values, values[1:])}
+        self.assertEqual(len(steps), len(values) - 1)
+
+    def test_bad_line_rejects_the_whole_order(self):
+        self.items[3].sold_out = True
+        self.items[3].save()
+        response = self._place([{'menu_item_id': self.items[0].id}, {'menu_item_id': self.items[3].id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sold out', response.json()['error'])
+        response = self._place([{'menu_item_id': self.items[0].id}, {'menu_item_id': 'nope'}])
+        self.assertEqual(response.json()['error'], 'Menu item nope not found or unavailable')
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(OrderQueueSettings.objects.get(tenant=self.tenant).order_sequence, 0)
+
+
+def read_events(stream, count):
+    """The next `count` (event, data, id) frames from an SSE stream, skipping retry/keep-alive lines."""
+    events = []
+    for chunk in stream:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith((':', 'retry:')):
+            continue
+        fields = dict(line.split(': ', 1) for line in text.strip().splitlines())
+        events.append((fields['event'], json.loads(fields['data']), fields.get('id')))
+        if len(events) == count:
+            break
+    return events
+
+
+@override_settings(EVENT_STREAM_SECONDS=2, EVENT_STREAM_KEEPALIVE=0.05)
+class OrderStreamTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        broker.reset()
+        self.tenant = TenantSettings.objects.create(slug='live', business_name='Live Kitchen')
+        user = get_user_model().objects.create_user(username='line', email='line@live.test', password=None)
+        self.api = APIClient(HTTP_X_TENANT_SLUG='live')
+        self.api.force_authenticate(user)
+        category = MenuCategory.objects.create(tenant=self.tenant, name='Mains')
+        self.dish = MenuItem.objects.create(tenant=self.tenant, category=category, name='Curry', price_pence=1100)
+        self.order = Order.objects.create(tenant=self.tenant, order_ref='L001', customer_name='Ada')
+        OrderItem.objects.create(order=self.order, menu_item=self.dish, name='Curry', quantity=1, unit_price_pence=1100)
+
+    def _transition(self, order, new_status):
+        with self.captureOnCommitCallbacks(execute=True):
+            order.transition_status(new_status)
+
+    def test_kitchen_stream_snapshot_then_deltas(self):
+        response = self.api.get('/api/orders/kitchen/stream/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        [(event, data, _)] = read_events(stream, 1)
+        self.assertEqual(event, 'snapshot')
+        self.assertEqual([o['order_ref'] for o in data['orders']], ['L001'])
+
+        self._transition(self.order, 'preparing')
+        with self.captureOnCommitCallbacks(execute=True):
+            placed = self.api.post('/api/orders/place/', {
+                'customer_name': 'Bo', 'items': [{'menu_item_id': self.dish.id, 'quantity': 2}],
+            }, format='json')
+        self.assertEqual(placed.status_code, 201)
+
+        (e1, d1, id1), (e2, d2, id2) = read_events(stream, 2)
+        self.assertEqual((e1, d1['action'], d1['order']['status']), ('order', 'status', 'preparing'))
+        self.assertEqual((e2, d2['action'], d2['order']['total_pence']), ('order', 'placed', 2200))
+        self.assertNotEqual(id1, id2)
+        response.close()
+
+    def test_reconnect_replays_only_missed_deltas(self):
+        self._transition(self.order, 'preparing')
+        first_id = broker._broker.recent(f'orders:{self.tenant.pk}')[-1][2]
+        self._transition(self.order, 'ready')
+
+        response = self.api.get('/api/orders/kitchen/stream/', HTTP_LAST_EVENT_ID=first_id)
+        [(event, data, _)] = read_events(iter(response.streaming_content), 1)
+        self.assertEqual((event, data['order']['status']), ('order', 'ready'))
+        response.close()
+
+        # An id that has aged out of the buffer gets a snapshot instead
+        response = self.api.get('/api/orders/kitchen/stream/', {'last_event_id': 'gone'})
+        [(event, data, _)] = read_events(iter(response.streaming_content), 1)
+        self.assertEqual((event, data['orders']), ('snapshot', []))
+        response.close()
+
+    def test_customer_stream_only_sees_their_order(self):
+        other = Order.objects.create(tenant=self.tenant, order_ref='L002', customer_name='Cy')
+        response = APIClient(HTTP_X_TENANT_SLUG='live').get('/api/orders/status/l001/stream/')
+        stream = iter(response.streaming_content)
+        [(event, data, _)] = read_events(stream, 1)
+        self.assertEqual((event, data['order']['order_ref']), ('snapshot', 'L001'))
+
+        self._transition(other, 'preparing')
+        self._transition(self.order, 'ready')
+        [(event, data, _)] = read_events(stream, 1)
+        self.assertEqual((data['order']['order_ref'], data['order']['status']), ('L001', 'ready'))
+        response.close()
+
+    def test_stream_thread_drops_its_connection_after_the_snapshot(self):
+        result = {}
+
+        def snapshot():
+            connections['default'].ensure_connection()   # what a snapshot query does on this thread
+            return {'orders': []}
+
+        def consume():   # as core.sse runs it under ASGI: on its own thread, outside any transaction
+            stream = broker.event_stream('orders', self.tenant.pk, snapshot)
+            try:
+                with mock.patch.object(type(connections['default']), 'close', autospec=True) as close:
+                    result['frames'] = [next(stream), next(stream)]   # retry, snapshot
+                result['closed'] = [call.args[0] for call in close.call_args_list]
+                result['own'] = connections['default']
+            finally:
+                stream.close()
+                connections.close_all()
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        thread.join()
+        self.assertEqual(result['frames'][1][0], 'snapshot')
+        self.assertEqual(result['closed'], [result['own']])
+
+    def test_rolled_back_change_is_not_published(self):
+        from django.db import transaction
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.order.transition_status('cancelled')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.order.transition_status('preparing')
+        self.assertEqual(len(callbacks), 1)
+        [(event, data, _)] = broker._broker.recent(f'orders:{self.tenant.pk}')
+        self.assertEqual(data['order']['status'], 'preparing')
+
+    def test_errors_before_the_stream_are_sse_frames(self):
+        response = APIClient(HTTP_X_TENANT_SLUG='live').get('/api/orders/kitchen/stream/',
+                                                            HTTP_ACCEPT='text/event-stream')
+        self.assertIn(response.status_code, (401, 403))
+        self.assertTrue(response.content.startswith(b'event: error\n'))
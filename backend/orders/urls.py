@@ -13,9 +13,11 @@ urlpatterns = [
     path('queue-status/', views.public_queue_status, name='orders-queue-status'),
     path('place/', views.place_order, name='orders-place'),
     path('status/<str:order_ref>/', views.order_status, name='orders-order-status'),
+    path('status/<str:order_ref>/stream/', views.order_status_stream, name='orders-order-status-stream'),
 
     # Kitchen display (authenticated)
     path('kitchen/', views.kitchen_queue, name='orders-kitchen-queue'),
+    path('kitchen/stream/', views.kitchen_stream, name='orders-kitchen-stream'),
     path('<int:pk>/status/', views.update_order_status, name='orders-update-status'),
     path('<int:pk>/notes/', views.update_order_notes, name='orders-update-notes'),
 
@@ -1,11 +1,16 @@
-import random
-import string
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, renderer_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from core.broker import last_event_id
+from core.content_version import conditional_content
+from core.response_cache import cached_json
+from core.sse import EventStreamRenderer, sse_response
 
+from . import events
 from .models import (
     MenuCategory, MenuItem, Order, OrderItem,
     OrderQueueSettings, DailyOrderSummary, ItemDailySales,
@@ -17,9 +22,11 @@ from .serializers import (
 )
 
 
-def _generate_order_ref():
-    """Generate a short, human-readable order reference like 'A7K3'."""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
+def _prime_items(order, items):
+    """Cache `items` as order.items.all(), as prefetch_related would, so serializing a new order doesn't re-read them."""
+    cached = order.items.all()
+    cached._result_cache, cached._prefetch_done = list(items), True
+    order._prefetched_objects_cache = {'items': cached}
 
 
 # =============================================================================
@@ -28,6 +35,8 @@ def _generate_order_ref():
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
+@cached_json
 def public_menu(request):
     """Return the full menu with categories and items for the customer order page."""
     tenant = getattr(request, 'tenant', None)
@@ -96,17 +105,22 @@ def place_order(request):
     data = serializer.validated_data
     items_data = data['items']
 
-    # Validate menu items exist and are available
+    # Validate menu items exist and are available — one query for every line
+    requested_ids = set()
+    for item_data in items_data:
+        try:
+            requested_ids.add(int(item_data.get('menu_item_id')))
+        except (TypeError, ValueError):
+            pass
+    menu = MenuItem.objects.filter(id__in=requested_ids, tenant=tenant, active=True).in_bulk()
     order_items = []
     for item_data in items_data:
         menu_item_id = item_data.get('menu_item_id')
         quantity = int(item_data.get('quantity', 1))
         notes = item_data.get('notes', '')
         try:
-            menu_item = MenuItem.objects.get(
-                id=menu_item_id, tenant=tenant, active=True
-            )
-        except MenuItem.DoesNotExist:
+            menu_item = menu[int(menu_item_id)]
+        except (KeyError, TypeError, ValueError):
             return Response(
                 {'error': f'Menu item {menu_item_id} not found or unavailable'},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -121,44 +135,39 @@ def place_order(request):
             'quantity': quantity,
             'notes': notes,
         })
-
-    # Generate unique order ref
-    for _ in range(10):
-        ref = _generate_order_ref()
-        if not Order.objects.filter(tenant=tenant, order_ref=ref).exists():
-            break
+    subtotal = sum(oi['quantity'] * oi['menu_item'].price_pence for oi in order_items)
 
     # Calculate wait time
     wait_minutes = queue_settings.calculate_wait_time()
 
-    # Create order
-    order = Order.objects.create(
-        tenant=tenant,
-        order_ref=ref,
-        customer_name=data['customer_name'],
-        customer_phone=data.get('customer_phone', ''),
-        customer_email=data.get('customer_email', ''),
-        source=data.get('source', 'online'),
-        payment_method=data.get('payment_method', 'cash'),
-        notes=data.get('notes', ''),
-        estimated_ready_minutes=wait_minutes,
-        estimated_ready_at=timezone.now() + timezone.timedelta(minutes=wait_minutes),
-    )
-
-    # Create order items
-    for oi in order_items:
-        OrderItem.objects.create(
-            order=order,
-            menu_item=oi['menu_item'],
-            name=oi['menu_item'].name,
-            quantity=oi['quantity'],
-            unit_price_pence=oi['menu_item'].price_pence,
-            notes=oi['notes'],
+    with transaction.atomic():
+        order = Order.objects.create(
+            tenant=tenant,
+            order_ref=OrderQueueSettings.next_order_ref(tenant.pk),
+            customer_name=data['customer_name'],
+            customer_phone=data.get('customer_phone', ''),
+            customer_email=data.get('customer_email', ''),
+            source=data.get('source', 'online'),
+            payment_method=data.get('payment_method', 'cash'),
+            notes=data.get('notes', ''),
+            subtotal_pence=subtotal,
+            total_pence=subtotal,  # No tax/discount for now
+            estimated_ready_minutes=wait_minutes,
+            estimated_ready_at=timezone.now() + timezone.timedelta(minutes=wait_minutes),
         )
-
-    # Calculate totals
-    order.calculate_totals()
-    order.save()
+        lines = OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                menu_item=oi['menu_item'],
+                name=oi['menu_item'].name,
+                quantity=oi['quantity'],
+                unit_price_pence=oi['menu_item'].price_pence,
+                notes=oi['notes'],
+            )
+            for oi in order_items
+        ])
+        _prime_items(order, lines)
+        events.publish_order(order, 'placed')
 
     # Stripe checkout for card payments
     if order.payment_method == 'card':
@@ -222,10 +231,45 @@ def order_status(request, order_ref):
     return Response(OrderSerializer(order).data)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def order_status_stream(request, order_ref):
+    """Public: one order's status as server-sent events, instead of polling order_status."""
+    tenant = getattr(request, 'tenant', None)
+    if not tenant:
+        return Response({'error': 'Tenant not found'}, status=404)
+
+    try:
+        order = Order.objects.get(tenant=tenant, order_ref=order_ref.upper())
+    except Order.DoesNotExist:
+        return Response({'error': 'Order not found'}, status=404)
+
+    return sse_response(request, events.order_events(order, last_event_id(request)))
+
+
 # =============================================================================
 # Kitchen display endpoints (authenticated — staff/owner)
 # =============================================================================
 
+def _kitchen_statuses(request):
+    status_filter = request.query_params.get('status', '')
+    if status_filter:
+        return [s.strip() for s in status_filter.split(',')]
+    # Default: show active orders (received + preparing)
+    return ['received', 'preparing']
+
+
+def kitchen_orders(tenant, statuses):
+    """The kitchen display's orders: preparing first, then received, oldest first within each."""
+    return Order.objects.filter(tenant=tenant, status__in=statuses).prefetch_related(
+        'items__menu_item',
+    ).order_by(
+        models_status_order(),
+        'placed_at',
+    )[:50]
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def kitchen_queue(request):
@@ -234,23 +278,22 @@ def kitchen_queue(request):
     if not tenant:
         return Response({'error': 'Tenant not found'}, status=404)
 
-    status_filter = request.query_params.get('status', '')
-    qs = Order.objects.filter(tenant=tenant).prefetch_related('items__menu_item')
+    return Response(OrderSerializer(kitchen_orders(tenant, _kitchen_statuses(request)), many=True).data)
 
-    if status_filter:
-        statuses = [s.strip() for s in status_filter.split(',')]
-        qs = qs.filter(status__in=statuses)
-    else:
-        # Default: show active orders (received + preparing)
-        qs = qs.filter(status__in=['received', 'preparing'])
-
-    # Order by: preparing first, then received, oldest first within each
-    qs = qs.order_by(
-        models_status_order(),
-        'placed_at',
-    )
 
-    return Response(OrderSerializer(qs[:50], many=True).data)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def kitchen_stream(request):
+    """
+    Kitchen queue as server-sent events: a snapshot, then order deltas
+    (see orders/events.py). Same ?status= filter as kitchen_queue.
+    """
+    tenant = getattr(request, 'tenant', None)
+    if not tenant:
+        return Response({'error': 'Tenant not found'}, status=404)
+
+    return sse_response(request, events.kitchen_events(tenant, _kitchen_statuses(request), last_event_id(request)))
 
 
 def models_status_order():
@@ -307,6 +350,7 @@ def update_order_notes(request, pk):
     if 'payment_method' in request.data:
         order.payment_method = request.data['payment_method']
     order.save()
+    events.publish_order(order, 'updated')
     return Response(OrderSerializer(order).data)
 
 
@@ -0,0 +1,31 @@
+"""
+Management command to give back stock held by shop checkouts that lapsed
+without a Stripe webhook (see shop.stock). Checkout also sweeps its own
+tenant first, so this only matters for products nobody is buying.
+
+Usage:
+    python manage.py release_expired_stock                   # All tenants
+    python manage.py release_expired_stock --tenant salon-x
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Cancel pending shop orders whose stock hold has lapsed and return their stock'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Only release holds for this tenant slug')
+
+    def handle(self, *args, **options):
+        from shop.stock import release_expired
+
+        tenant = None
+        if options.get('tenant'):
+            from tenants.models import TenantSettings
+            tenant = TenantSettings.objects.filter(slug=options['tenant']).first()
+            if not tenant:
+                self.stderr.write(f"Tenant '{options['tenant']}' not found")
+                return
+
+        released = release_expired(tenant=tenant)
+        self.stdout.write(self.style.SUCCESS(f'[SHOP-STOCK] Released {released} lapsed stock hold(s)'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0002_product_subtitle_compare_at_price_productimage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='reserved_until',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Stock is held for this checkout until then (shop.stock)', null=True),
+        ),
+    ]
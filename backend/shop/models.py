@@ -51,6 +51,7 @@ class ProductImage(models.Model):
     """An image attached to a product. Supports multiple images per product."""
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='shop/products/%Y/%m/')
+    image_renditions = models.JSONField(null=True, blank=True, editable=False, help_text='Resized copies (core.images)')
     alt_text = models.CharField(max_length=255, blank=True, default='')
     sort_order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -85,6 +86,8 @@ class Order(models.Model):
     total_pence = models.IntegerField(default=0)
     stripe_session_id = models.CharField(max_length=255, blank=True, default='')
     stripe_payment_intent = models.CharField(max_length=255, blank=True, default='')
+    reserved_until = models.DateTimeField(null=True, blank=True, db_index=True,
+                                          help_text='Stock is held for this checkout until then (shop.stock)')
     notes = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
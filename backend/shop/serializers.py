@@ -1,15 +1,30 @@
 from rest_framework import serializers
+from core.images import srcset
 from .models import Product, ProductImage, Order, OrderItem
 
 
+def _srcset(serializer, image):
+    request = serializer.context.get('request')
+
+    def absolute(url):
+        url = request.build_absolute_uri(url)
+        return url.replace('http://', 'https://', 1) if url.startswith('http://') else url
+
+    return srcset(image.image, image.image_renditions, absolute if request else None)
+
+
 class ProductImageSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = ProductImage
-        fields = ['id', 'url', 'alt_text', 'sort_order', 'created_at']
+        fields = ['id', 'url', 'srcset', 'alt_text', 'sort_order', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    def get_srcset(self, obj):
+        return _srcset(self, obj)
+
     def get_url(self, obj):
         if obj.image:
             request = self.context.get('request')
@@ -24,6 +39,7 @@ class ProductSerializer(serializers.ModelSerializer):
     price_pence = serializers.IntegerField(read_only=True)
     in_stock = serializers.BooleanField(read_only=True)
     primary_image_url = serializers.SerializerMethodField()
+    primary_image_srcset = serializers.SerializerMethodField()
     images = ProductImageSerializer(many=True, read_only=True)
 
     class Meta:
@@ -31,7 +47,7 @@ class ProductSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'subtitle', 'description', 'category',
             'price', 'compare_at_price', 'price_pence',
-            'image_url', 'primary_image_url', 'images',
+            'image_url', 'primary_image_url', 'primary_image_srcset', 'images',
             'stock_quantity', 'track_stock', 'in_stock',
             'sort_order', 'active', 'created_at', 'updated_at',
         ]
@@ -47,6 +63,10 @@ class ProductSerializer(serializers.ModelSerializer):
             return first.image.url
         return obj.image_url or ''
 
+    def get_primary_image_srcset(self, obj):
+        first = next(iter(obj.images.all()), None)   # prefetched, already in sort_order, id order
+        return _srcset(self, first) if first else None
+
 
 class OrderItemSerializer(serializers.ModelSerializer):
     line_total_pence = serializers.IntegerField(read_only=True)
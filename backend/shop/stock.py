@@ -0,0 +1,150 @@
+"""
+Stock reservation for shop checkout.
+
+    try:
+        with transaction.atomic():
+            stock.reserve(tenant, {product.id: quantity, ...})   # tracked products only
+            order = Order.objects.create(..., reserved_until=...)
+    except stock.OutOfStock:
+        ...
+
+reserve() takes stock for every product in a single conditional UPDATE —
+stock_quantity = stock_quantity - q WHERE stock_quantity >= q — instead of
+read-then-save. The database applies each decrement to the row's current
+value (a concurrent buyer waits on the row, then re-checks the condition), so
+buyers never overwrite each other and stock can't go below zero. If any
+product is short, OutOfStock rolls the caller's transaction back: an order
+takes all of its stock or none.
+
+A checkout holds its stock until Order.reserved_until — the Stripe session's
+expiry plus RESERVATION_GRACE, so a payment completing at the deadline still
+finds its hold. Payment turns the hold into a sale (confirm()). A session
+that expires or can't be created gives the stock back (release()), and
+release_expired() sweeps holds whose webhook never arrived — checkout runs it
+for the tenant first, and `release_expired_stock` runs it from cron. Moving
+the order out of 'pending' is the guard, so a hold is released at most once.
+
+Stripe retries webhooks for days, so a payment can arrive after its hold was
+swept. The customer has paid, so confirm() still records the payment and
+marks the order paid, then tries to take the stock again. If it's gone, the
+order is flagged in its notes (and logged) for manual fulfilment or refund.
+
+Both go through queryset .update(), which sends no post_save, so whenever
+stock actually moves they bump the tenant's content version on commit —
+otherwise /api/shop/public/products/ keeps serving the old stock_quantity
+and in_stock from its ETag and cached JSON (core.content_version).
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+
+from core import content_version
+
+from .models import Order, OrderItem, Product
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_GRACE = timedelta(minutes=5)
+
+
+class OutOfStock(Exception):
+    """At least one product couldn't cover its quantity; nothing was taken once the transaction rolls back."""
+
+
+def _stock_changed(tenant_id):
+    transaction.on_commit(lambda: content_version.bump(tenant_id))
+
+
+def _per_product(quantities):
+    return Case(*[When(pk=pk, then=Value(qty)) for pk, qty in quantities.items()], output_field=IntegerField())
+
+
+def reserve(tenant, quantities):
+    """Take {product_id: quantity} from stock in one statement. Call inside a transaction."""
+    if not quantities:
+        return
+    needed = _per_product(quantities)
+    taken = Product.objects.filter(tenant=tenant, pk__in=quantities, stock_quantity__gte=needed).update(
+        stock_quantity=F('stock_quantity') - needed,
+    )
+    if taken != len(quantities):
+        raise OutOfStock()
+    _stock_changed(tenant.pk)
+
+
+def first_short(tenant, quantities):
+    """After OutOfStock: the first product (in request order) that can't cover its quantity now, or None."""
+    products = Product.objects.filter(tenant=tenant, pk__in=quantities).in_bulk()
+    for pk, qty in quantities.items():
+        product = products.get(pk)
+        if product is None or product.stock_quantity < qty:
+            return product
+    return None
+
+
+def held_quantities(order):
+    """{product_id: quantity} the order took from tracked stock."""
+    rows = (OrderItem.objects.filter(order=order, product__track_stock=True)
+            .values('product_id').annotate(quantity=Sum('quantity')))
+    return {row['product_id']: row['quantity'] for row in rows}
+
+
+def release(order, status='cancelled'):
+    """Give a pending order's held stock back and mark it `status`. False if it held none."""
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order.pk, status='pending', reserved_until__isnull=False).update(
+            status=status, reserved_until=None,
+        ):
+            return False
+        quantities = held_quantities(order)
+        if quantities and Product.objects.filter(pk__in=quantities).update(
+            stock_quantity=F('stock_quantity') + _per_product(quantities),
+        ):
+            _stock_changed(order.tenant_id)
+    order.status, order.reserved_until = status, None
+    return True
+
+
+LATE_PAYMENT_NOTE = 'Paid after its stock hold lapsed and the stock has since gone — fulfil manually or refund.'
+
+
+def confirm(order, payment_intent=''):
+    """
+    Payment received: the hold becomes a sale. A payment for an order whose
+    hold was already released makes it paid and takes the stock again.
+    False only when that stock is no longer there and the order was flagged.
+    """
+    if Order.objects.filter(pk=order.pk, status='pending').update(
+        status='paid', reserved_until=None, stripe_payment_intent=payment_intent,
+    ):
+        order.status, order.reserved_until = 'paid', None
+        return True
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order.pk, status='cancelled').update(
+            status='paid', stripe_payment_intent=payment_intent,
+        ):
+            order.refresh_from_db(fields=['status'])
+            return True   # already paid — a redelivered webhook
+        order.refresh_from_db(fields=['status', 'stripe_payment_intent', 'notes'])
+        try:
+            with transaction.atomic():
+                reserve(order.tenant, held_quantities(order))
+        except OutOfStock:
+            order.notes = f'{order.notes}\n{LATE_PAYMENT_NOTE}'.strip()
+            order.save(update_fields=['notes', 'updated_at'])
+            logger.error('[SHOP] Order %s paid after its stock hold lapsed and is short of stock — '
+                         'fulfil manually or refund', order.pk)
+            return False
+    logger.warning('[SHOP] Order %s paid after its stock hold lapsed — stock taken again', order.pk)
+    return True
+
+
+def release_expired(tenant=None, now=None):
+    """Release every pending hold past its reserved_until. Returns how many were released."""
+    lapsed = Order.objects.filter(status='pending', reserved_until__lt=now or timezone.now())
+    if tenant is not None:
+        lapsed = lapsed.filter(tenant=tenant)
+    return sum(release(order) for order in lapsed.only('pk', 'tenant_id'))
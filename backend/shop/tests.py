@@ -0,0 +1,170 @@
+"""
+Shop — stock reservation at checkout: conditional decrements, all-or-nothing
+orders, and holds that lapse with the Stripe session.
+"""
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.query_budget import query_budget
+
+from . import stock
+from .models import Order, Product
+
+
+class StockReservationTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='kitshop', business_name='Kit Shop')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='kitshop')
+        self.kit = Product.objects.create(tenant=self.tenant, name='First aid kit', price=Decimal('20.00'),
+                                          stock_quantity=3, track_stock=True)
+        self.sign = Product.objects.create(tenant=self.tenant, name='Fire sign', price=Decimal('4.50'),
+                                           stock_quantity=10, track_stock=True)
+        self.ebook = Product.objects.create(tenant=self.tenant, name='Guide (PDF)', price=Decimal('9.99'))
+
+    def _checkout(self, *lines):
+        return self.api.post('/api/shop/checkout/', {
+            'customer_name': 'Buyer', 'customer_email': 'buyer@kit.test',
+            'items': [{'product_id': product.id, 'quantity': qty} for product, qty in lines],
+        }, format='json')
+
+    def _stock(self, product):
+        return Product.objects.values_list('stock_quantity', flat=True).get(pk=product.pk)
+
+    def test_never_sells_more_than_is_in_stock(self):
+        codes = [self._checkout((self.kit, 1)).status_code for _ in range(5)]
+        self.assertEqual(codes, [200, 200, 200, 400, 400])
+        self.assertEqual(self._stock(self.kit), 0)
+        response = self._checkout((self.kit, 1))
+        self.assertEqual(response.json()['error'], 'First aid kit — only 0 in stock')
+
+    def test_order_takes_all_its_stock_or_none(self):
+        response = self._checkout((self.sign, 4), (self.kit, 2), (self.kit, 2))   # 4 kits across two lines
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((self._stock(self.sign), self._stock(self.kit)), (10, 3))
+        self.assertFalse(Order.objects.exists())
+
+    def test_public_products_show_stock_after_checkout(self):
+        before = self.api.get('/api/shop/public/products/')
+        self.assertEqual({p['name']: p['stock_quantity'] for p in before.json()}['First aid kit'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._checkout((self.kit, 2)).status_code, 200)
+        self.assertEqual(self.api.get('/api/shop/public/products/', HTTP_IF_NONE_MATCH=before['ETag']).status_code, 200)
+        after = {p['name']: p for p in self.api.get('/api/shop/public/products/').json()}
+        self.assertEqual((after['First aid kit']['stock_quantity'], after['First aid kit']['in_stock']), (1, True))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._checkout((self.kit, 1)).status_code, 200)
+        after = {p['name']: p for p in self.api.get('/api/shop/public/products/').json()}
+        self.assertEqual((after['First aid kit']['stock_quantity'], after['First aid kit']['in_stock']), (0, False))
+
+    def test_checkout_query_count_is_flat(self):
+        lines = [(self.sign, 1), (self.kit, 1), (self.ebook, 2)] * 3
+        # tenant, lapsed holds, products, stock UPDATE, order, lines — plus the savepoint pair
+        with query_budget(8, label='shop_checkout'):
+            response = self._checkout(*lines)
+        self.assertEqual(response.status_code, 200)
+        order = Order.objects.get(pk=response.json()['order_id'])
+        self.assertEqual((order.status, order.items.count(), order.total_pence), ('paid', 9, 3 * (450 + 2000 + 1998)))
+        self.assertEqual((self._stock(self.sign), self._stock(self.kit), self._stock(self.ebook)), (7, 0, 0))
+
+
+@override_settings(STRIPE_SECRET_KEY='sk_test_shop', STRIPE_WEBHOOK_SECRET='')
+class StockHoldTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        self.tenant = TenantSettings.objects.create(slug='holdshop', business_name='Hold Shop')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='holdshop')
+        self.kit = Product.objects.create(tenant=self.tenant, name='First aid kit', price=Decimal('20.00'),
+                                          stock_quantity=2, track_stock=True)
+
+    def _checkout(self, quantity=1, session=None, error=None):
+        create = mock.patch('stripe.checkout.Session.create', side_effect=error,
+                            return_value=session or SimpleNamespace(id='cs_test_1', url='https://stripe.test/cs'))
+        with create as created:
+            response = self.api.post('/api/shop/checkout/', {
+                'customer_name': 'Buyer', 'customer_email': 'buyer@kit.test',
+                'items': [{'product_id': self.kit.id, 'quantity': quantity}],
+            }, format='json')
+        return response, created
+
+    def _stock(self):
+        return Product.objects.values_list('stock_quantity', flat=True).get(pk=self.kit.pk)
+
+    def _webhook(self, event_type, order):
+        payload = {'id': 'evt_1', 'object': 'event', 'type': event_type, 'data': {'object': {
+            'id': order.stripe_session_id, 'object': 'checkout.session', 'payment_intent': 'pi_1',
+            'metadata': {'shop_order_id': str(order.id)},
+        }}}
+        return APIClient().post('/api/checkout/webhook/', json.dumps(payload), content_type='application/json')
+
+    def test_hold_lasts_as_long_as_the_session(self):
+        response, created = self._checkout(2)
+        self.assertEqual(response.json()['checkout_url'], 'https://stripe.test/cs')
+        order = Order.objects.get()
+        self.assertEqual((order.status, self._stock()), ('pending', 0))
+        self.assertEqual(created.call_args.kwargs['expires_at'],
+                         int((order.reserved_until - stock.RESERVATION_GRACE).timestamp()))
+
+        self.assertEqual(stock.release_expired(self.tenant), 0)
+        later = order.reserved_until + timezone.timedelta(seconds=1)
+        self.assertEqual(stock.release_expired(self.tenant, now=later), 1)
+        self.assertEqual(stock.release_expired(self.tenant, now=later), 0)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.reserved_until, self._stock()), ('cancelled', None, 2))
+
+        # Paid after the hold was swept: still a sale, and the stock is taken again
+        with self.assertLogs('shop.stock', 'WARNING'):
+            self.assertTrue(stock.confirm(order, 'pi_late'))
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.stripe_payment_intent, self._stock()), ('paid', 'pi_late', 0))
+
+    def test_late_payment_after_the_stock_sold_is_flagged(self):
+        self._checkout(2)
+        order = Order.objects.get()
+        stock.release_expired(self.tenant, now=order.reserved_until + timezone.timedelta(seconds=1))
+        self._checkout(1, session=SimpleNamespace(id='cs_test_2', url='https://stripe.test/cs2'))
+
+        with self.assertLogs('shop.stock', 'ERROR'):
+            self.assertEqual(self._webhook('checkout.session.completed', order).status_code, 200)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.stripe_payment_intent), ('paid', 'pi_1'))
+        self.assertIn(stock.LATE_PAYMENT_NOTE, order.notes)
+        self.assertEqual(self._stock(), 1)   # the other buyer's hold is untouched
+
+        self._webhook('checkout.session.completed', order)   # redelivered: no second flag
+        order.refresh_from_db()
+        self.assertEqual(order.notes.count(stock.LATE_PAYMENT_NOTE), 1)
+
+    def test_webhooks_confirm_or_release_the_hold(self):
+        self._checkout(1)
+        paid = Order.objects.get()
+        self._checkout(1, session=SimpleNamespace(id='cs_test_2', url='https://stripe.test/cs2'))
+        lapsed = Order.objects.exclude(pk=paid.pk).get()
+        self.assertEqual(self._stock(), 0)
+
+        self.assertEqual(self._webhook('checkout.session.completed', paid).status_code, 200)
+        self.assertEqual(self._webhook('checkout.session.expired', lapsed).status_code, 200)
+        self._webhook('checkout.session.expired', lapsed)   # redelivered
+        paid.refresh_from_db()
+        lapsed.refresh_from_db()
+        self.assertEqual((paid.status, paid.stripe_payment_intent, paid.reserved_until), ('paid', 'pi_1', None))
+        self.assertEqual(lapsed.status, 'cancelled')
+        self.assertEqual(self._stock(), 1)
+        self.assertEqual(stock.release_expired(now=timezone.now() + timezone.timedelta(days=2)), 0)
+
+    def test_failed_session_gives_the_stock_back(self):
+        with self.assertLogs('shop.views', 'ERROR'):
+            response, _ = self._checkout(2, error=RuntimeError('stripe down'))
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(Order.objects.get().status, 'cancelled')
+        self.assertEqual(self._stock(), 2)
@@ -1,10 +1,17 @@
 import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, parser_classes, action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from accounts.permissions import IsManagerOrAbove
+from core import content_version
+from core.content_version import conditional_content
+from core.response_cache import cached_json
 from rest_framework.response import Response
+from . import stock
 from .models import Product, ProductImage, Order, OrderItem
 from .serializers import ProductSerializer, ProductImageSerializer, OrderSerializer
 
@@ -110,13 +117,14 @@ def reorder_product_images(request, product_id):
     order = request.data.get('order', [])
     for idx, img_id in enumerate(order):
         ProductImage.objects.filter(id=img_id, product_id=product_id).update(sort_order=idx)
+    content_version.bump(tenant)  # .update() sends no signals
     return Response({'status': 'ok'})
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def create_shop_checkout(request):
-    """Create a Stripe checkout session for a product order."""
+    """Create a Stripe checkout session for a product order, holding its stock (shop.stock) until the session lapses."""
     import stripe
     from django.conf import settings
 
@@ -132,24 +140,28 @@ def create_shop_checkout(request):
     if not items or not customer_email:
         return Response({'error': 'Items and customer_email are required'}, status=400)
 
-    line_items = []
-    order_items = []
-    total_pence = 0
-
+    lines = []
     for item in items:
         product_id = item.get('product_id')
         quantity = int(item.get('quantity', 1))
-
         if quantity <= 0:
             return Response({'error': f'Quantity must be at least 1 (got {quantity})'}, status=400)
+        lines.append((product_id, quantity))
 
-        try:
-            product = Product.objects.get(id=product_id, tenant=tenant, active=True)
-        except Product.DoesNotExist:
-            return Response({'error': f'Product {product_id} not found'}, status=400)
+    stock.release_expired(tenant)
+    products = Product.objects.filter(
+        id__in=[pid for pid, _ in lines if str(pid).isdigit()], tenant=tenant, active=True,
+    ).in_bulk()
 
-        if product.track_stock and product.stock_quantity < quantity:
-            return Response({'error': f'{product.name} — only {product.stock_quantity} in stock'}, status=400)
+    line_items = []
+    order_items = []
+    tracked = {}
+    total_pence = 0
+
+    for product_id, quantity in lines:
+        product = products.get(int(product_id)) if str(product_id).isdigit() else None
+        if product is None:
+            return Response({'error': f'Product {product_id} not found'}, status=400)
 
         line_items.append({
             'price_data': {
@@ -159,36 +171,43 @@ def create_shop_checkout(request):
             },
             'quantity': quantity,
         })
-        order_items.append({
-            'product': product,
-            'product_name': product.name,
-            'quantity': quantity,
-            'unit_price_pence': product.price_pence,
-        })
-        total_pence += product.price_pence * quantity
-
-    order = Order.objects.create(
-        tenant=tenant,
-        customer_name=customer_name,
-        customer_email=customer_email,
-        customer_phone=customer_phone,
-        total_pence=total_pence,
-        status='pending',
-    )
-    for oi in order_items:
-        OrderItem.objects.create(order=order, **oi)
-
-    # Deduct stock
-    for item in items:
-        product = Product.objects.get(id=item['product_id'])
+        order_items.append(OrderItem(
+            product=product,
+            product_name=product.name,
+            quantity=quantity,
+            unit_price_pence=product.price_pence,
+        ))
         if product.track_stock:
-            product.stock_quantity = max(0, product.stock_quantity - int(item.get('quantity', 1)))
-            product.save(update_fields=['stock_quantity'])
+            tracked[product.id] = tracked.get(product.id, 0) + quantity
+        total_pence += product.price_pence * quantity
 
     stripe_key = getattr(settings, 'STRIPE_SECRET_KEY', '')
+    hold_minutes = min(max(settings.SHOP_RESERVATION_MINUTES, 30), 24 * 60)  # Stripe's allowed session lifetime
+    expires_at = timezone.now() + timedelta(minutes=hold_minutes)
+
+    # Take the stock and record the order together — all lines or none
+    try:
+        with transaction.atomic():
+            stock.reserve(tenant, tracked)
+            order = Order.objects.create(
+                tenant=tenant,
+                customer_name=customer_name,
+                customer_email=customer_email,
+                customer_phone=customer_phone,
+                total_pence=total_pence,
+                status='pending' if stripe_key else 'paid',
+                reserved_until=expires_at + stock.RESERVATION_GRACE if stripe_key else None,
+            )
+            for oi in order_items:
+                oi.order = order
+            OrderItem.objects.bulk_create(order_items)
+    except stock.OutOfStock:
+        product = stock.first_short(tenant, tracked)
+        if product is None:
+            return Response({'error': 'Stock changed while checking out — please try again'}, status=409)
+        return Response({'error': f'{product.name} — only {product.stock_quantity} in stock'}, status=400)
+
     if not stripe_key:
-        order.status = 'paid'
-        order.save(update_fields=['status'])
         return Response({
             'order_id': order.id,
             'status': 'paid',
@@ -204,20 +223,24 @@ def create_shop_checkout(request):
             line_items=line_items,
             mode='payment',
             customer_email=customer_email,
+            expires_at=int(expires_at.timestamp()),
             success_url=f'{frontend_url}/shop/success?order={order.id}',
             cancel_url=f'{frontend_url}/shop?cancelled=true',
-            metadata={'order_id': str(order.id), 'tenant_slug': tenant.slug},
+            metadata={'order_id': str(order.id), 'shop_order_id': str(order.id), 'tenant_slug': tenant.slug},
         )
         order.stripe_session_id = session.id
         order.save(update_fields=['stripe_session_id'])
         return Response({'checkout_url': session.url, 'order_id': order.id})
     except Exception as e:
         logger.exception('Stripe checkout error')
+        stock.release(order)
         return Response({'error': str(e)}, status=500)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
+@cached_json
 def public_products(request):
     """Public endpoint — list active products for the shop page."""
     tenant = getattr(request, 'tenant', None)
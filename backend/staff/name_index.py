@@ -0,0 +1,114 @@
+"""
+Staff Name Index
+
+Resolves staff mentioned in free text ("Jordan is sick today") for the
+command bar and the AI assistant without loading the whole roster per command.
+
+- Per tenant, every active StaffProfile contributes its display name, full
+  name and first name as token phrases, keyed by their first token.
+- Matching tokenises the text once and only compares phrases that start with
+  each token, so a lookup is O(text length) regardless of roster size, and
+  matches are whole words ("Al" no longer matches "always").
+- The longest phrase wins ("Sam Smith" beats "Sam"); if several staff tie
+  for the best match the result is ambiguous and the candidates are reported.
+- The index is cached, keyed on the tenant's (latest StaffProfile.updated_at,
+  profile count). Profile saves and deletes change that key; name changes on
+  the linked User bump the profile's updated_at (staff/signals.py).
+"""
+import re
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+CACHE_PREFIX = 'staff-name-index'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    """[(token, start, end)] — lower-cased words, punctuation dropped."""
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_RE.finditer(text or '')]
+
+
+class StaffNameIndex:
+    """Token → phrase map over one tenant's active staff names."""
+
+    def __init__(self, phrases, names):
+        self.phrases = phrases  # {first token: [(phrase tokens, staff id)]}
+        self.names = names      # {staff id: display name}
+
+    @classmethod
+    def build(cls, profiles):
+        phrases, names, seen = {}, {}, set()
+        for p in profiles:
+            names[p.id] = p.display_name or f'{p.user.first_name} {p.user.last_name}'.strip()
+            first = p.user.first_name.strip()
+            candidates = [p.display_name, f'{p.user.first_name} {p.user.last_name}']
+            if len(first) >= 2:
+                candidates.append(first)
+            for text in candidates:
+                tokens = tuple(t for t, _, _ in tokenize(text))
+                if tokens and (tokens, p.id) not in seen:
+                    seen.add((tokens, p.id))
+                    phrases.setdefault(tokens[0], []).append((tokens, p.id))
+        return cls(phrases, names)
+
+    def find(self, text):
+        """Every name occurrence: [{'staff_id', 'name', 'start', 'end', 'length'}] in text order."""
+        tokens = tokenize(text)
+        words = [t for t, _, _ in tokens]
+        found = []
+        for i, word in enumerate(words):
+            for phrase, staff_id in self.phrases.get(word, ()):
+                n = len(phrase)
+                if tuple(words[i:i + n]) == phrase:
+                    found.append({
+                        'staff_id': staff_id,
+                        'name': self.names[staff_id],
+                        'start': tokens[i][1],
+                        'end': tokens[i + n - 1][2],
+                        'length': n,
+                    })
+        return found
+
+    def resolve(self, text):
+        """(staff id or None, [candidate ids]) — candidates has >1 entry when ambiguous."""
+        found = self.find(text)
+        if not found:
+            return None, []
+        best = max(m['length'] for m in found)
+        candidates = list(dict.fromkeys(m['staff_id'] for m in found if m['length'] == best))
+        return (candidates[0] if len(candidates) == 1 else None), candidates
+
+
+def _version(tenant):
+    from .models import StaffProfile
+    row = StaffProfile.objects.filter(tenant=tenant).aggregate(latest=Max('updated_at'), n=Count('id'))
+    latest = row['latest'].isoformat() if row['latest'] else '-'
+    return f"{latest}:{row['n']}"
+
+
+def get_index(tenant):
+    """The tenant's StaffNameIndex, rebuilt only when its staff have changed."""
+    from .models import StaffProfile
+    key = f'{CACHE_PREFIX}:{getattr(tenant, "pk", None)}:{_version(tenant)}'
+    index = cache.get(key)
+    if index is None:
+        profiles = StaffProfile.objects.filter(tenant=tenant, is_active=True).select_related('user')
+        index = StaffNameIndex.build(profiles)
+        cache.set(key, index, CACHE_TIMEOUT)
+    return index
+
+
+def resolve_staff(tenant, text):
+    """
+    (StaffProfile or None, [ambiguous display names]) for the staff member named in `text`.
+    The second item is non-empty only when several staff match equally well.
+    """
+    from .models import StaffProfile
+    index = get_index(tenant)
+    staff_id, candidates = index.resolve(text)
+    if staff_id is None:
+        return None, [index.names[c] for c in candidates]
+    return StaffProfile.objects.select_related('user').filter(id=staff_id).first(), []
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+NAME_FIELDS = {'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def touch_staff_profile_on_name_change(sender, instance, created=False, update_fields=None, **kwargs):
+    """A user's name feeds the staff name index, keyed on StaffProfile.updated_at."""
+    if created or (update_fields is not None and not NAME_FIELDS & set(update_fields)):
+        return  # no profile yet / e.g. last_login updates
+    from .models import StaffProfile
+    StaffProfile.objects.filter(user_id=instance.pk).update(updated_at=timezone.now())
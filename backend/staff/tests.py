@@ -0,0 +1,84 @@
+"""
+Staff name index — matching, ambiguity and cache invalidation.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from .models import AbsenceRecord, StaffProfile
+from .name_index import get_index, resolve_staff
+
+User = get_user_model()
+
+
+class StaffNameIndexTest(TestCase):
+
+    def setUp(self):
+        from tenants.models import TenantSettings
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='names', business_name='Names')
+        self.other = TenantSettings.objects.create(slug='other', business_name='Other')
+        self.sam_smith = self._staff('Sam', 'Smith')
+        self.sam_jones = self._staff('Sam', 'Jones')
+        self.jordan = self._staff('Jordan', 'Lee', display='Jordan L')
+        self._staff('Al', 'Green')
+        self._staff('Chris', 'Other', tenant=self.other)
+
+    def _staff(self, first, last, display=None, tenant=None):
+        user = User.objects.create_user(
+            username=f'{first}{last}'.lower(), email=f'{first}.{last}@names.test'.lower(),
+            password=None, first_name=first, last_name=last,
+        )
+        return StaffProfile.objects.create(
+            tenant=tenant or self.tenant, user=user, display_name=display or f'{first} {last}',
+        )
+
+    def test_first_name_and_display_name(self):
+        staff, ambiguous = resolve_staff(self.tenant, 'jordan is sick today')
+        self.assertEqual((staff, ambiguous), (self.jordan, []))
+        staff, _ = resolve_staff(self.tenant, 'Jordan L called in')
+        self.assertEqual(staff, self.jordan)
+
+    def test_longest_match_wins(self):
+        staff, ambiguous = resolve_staff(self.tenant, "Sam Smith's off sick")
+        self.assertEqual((staff, ambiguous), (self.sam_smith, []))
+
+    def test_ambiguous_first_name(self):
+        staff, ambiguous = resolve_staff(self.tenant, 'sam is sick')
+        self.assertIsNone(staff)
+        self.assertEqual(sorted(ambiguous), ['Sam Jones', 'Sam Smith'])
+
+    def test_whole_words_only_and_tenant_scoped(self):
+        self.assertEqual(resolve_staff(self.tenant, 'always samples'), (None, []))
+        self.assertEqual(resolve_staff(self.tenant, 'chris is sick'), (None, []))
+
+    def test_find_reports_spans(self):
+        text = 'Swap Jordan with Al'
+        found = get_index(self.tenant).find(text)
+        self.assertEqual([text[m['start']:m['end']] for m in found], ['Jordan', 'Al'])
+
+    def test_cached_and_invalidated(self):
+        get_index(self.tenant)
+        # Warm: version check + the resolved profile
+        with self.assertNumQueries(2):
+            resolve_staff(self.tenant, 'jordan')
+
+        self.jordan.is_active = False
+        self.jordan.save()
+        self.assertEqual(resolve_staff(self.tenant, 'jordan'), (None, []))
+
+        user = self.sam_jones.user
+        user.first_name = 'Samuel'
+        user.save()
+        staff, ambiguous = resolve_staff(self.tenant, 'sam')
+        self.assertEqual((staff, ambiguous), (self.sam_smith, []))
+        self.assertEqual(resolve_staff(self.tenant, 'samuel')[0], self.sam_jones)
+
+    def test_command_bar_reports_ambiguity(self):
+        from core.command_router import _cmd_mark_sick
+        result = _cmd_mark_sick(self.tenant, 'sam is sick today', 'Sam is sick today')
+        self.assertFalse(result['success'])
+        self.assertIn('Sam Jones', result['message'])
+        result = _cmd_mark_sick(self.tenant, 'jordan is sick today', 'Jordan is sick today')
+        self.assertTrue(result['success'])
+        self.assertTrue(AbsenceRecord.objects.filter(staff=self.jordan, record_type='ABSENCE').exists())
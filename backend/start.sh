@@ -1,65 +1,35 @@
 #!/bin/bash
 
-# Critical — must succeed
-echo "Running database migrations..."
-python manage.py migrate --noinput || { echo "FATAL: migrations failed"; exit 1; }
-
-echo "Collecting static files..."
-python manage.py collectstatic --noinput || echo "WARNING: collectstatic failed"
-
-# Seed demo data
+# Migrations, static files and all demo/live seeds run as one dependency-ordered
+# pipeline in a single Django process (see core/bootstrap.py). Unchanged seeds are
+# skipped via fingerprints; migrate failing is still fatal.
+# NEVER add live tenants (nbne, mind-department) to the demo seeds — they have real data.
+BOOTSTRAP_ARGS=""
 if [ -n "$SEED_TENANT" ]; then
-  echo "Clearing old demo data for tenant: $SEED_TENANT..."
-  (python manage.py seed_demo --tenant "$SEED_TENANT" --delete-demo) || echo "WARNING: delete-demo failed"
-  echo "Seeding fresh demo data for tenant: $SEED_TENANT..."
-  (python manage.py seed_demo --tenant "$SEED_TENANT") || echo "WARNING: seed_demo failed"
+  echo "Clearing and reseeding demo data for tenant: $SEED_TENANT..."
+  BOOTSTRAP_ARGS="--reseed $SEED_TENANT"
 elif [ "$SEED_ALL_TENANTS" = "true" ]; then
-  echo "Seeding ALL demo tenants..."
-  (python manage.py seed_demo) || echo "WARNING: seed_demo failed"
-else
-  echo "SEED_TENANT not set — skipping demo seed."
+  echo "Re-seeding ALL demo tenants..."
+  BOOTSTRAP_ARGS="--force"
 fi
 
-# Always ensure DEMO tenants are seeded (idempotent — uses get_or_create)
-# NEVER include live tenants (nbne, mind-department) here — they have real data
-echo "Ensuring demo tenants are seeded..."
-for t in salon-x restaurant-x health-club-x; do
-  echo "  Seeding $t..."
-  (python manage.py seed_demo --tenant "$t") || echo "WARNING: seed_demo ($t) failed"
-done
-
-echo "Seeding Pizza Shack X demo (orders module)..."
-(python manage.py seed_pizza_shack) || echo "WARNING: seed_pizza_shack failed"
-
-# Ensure live tenant settings exist (tenant record only, NO demo data)
-echo "Ensuring live tenant records exist..."
-(python manage.py ensure_tenant nbne) || echo "WARNING: ensure_tenant nbne failed"
-(python manage.py ensure_tenant mind-department) || echo "WARNING: ensure_tenant mind-department failed"
-
-# TMD-origin setup commands — non-fatal
-echo "Running production setup..."
-(python manage.py setup_production) || echo "WARNING: setup_production failed"
-
-echo "Seeding UK compliance baseline..."
-(python manage.py seed_compliance) || echo "WARNING: seed_compliance failed"
-
-echo "Seeding Document Vault..."
-(python manage.py seed_document_vault) || echo "WARNING: seed_document_vault failed"
-
-echo "Syncing CRM leads from bookings..."
-(python manage.py sync_crm_leads) || echo "WARNING: sync_crm_leads failed"
-
-echo "Updating service demand indices..."
-(python manage.py update_demand_index) || echo "WARNING: update_demand_index failed"
-
-echo "Backfilling Smart Booking Engine scores..."
-(python manage.py backfill_sbe_scores) || echo "WARNING: backfill_sbe_scores failed"
+echo "Running bootstrap pipeline..."
+python manage.py bootstrap $BOOTSTRAP_ARGS || { echo "FATAL: bootstrap failed"; exit 1; }
 
 echo "Starting booking reminder worker (background)..."
 python manage.py send_booking_reminders --loop &
 
+echo "Starting compliance status roll-forward worker (background, hourly)..."
+python manage.py roll_forward_compliance --loop &
+
+echo "Starting image derivative worker (background)..."
+python manage.py generate_image_derivatives --loop &
+
 # echo "Starting compliance reminder worker (background, daily)..."
 # python manage.py send_compliance_reminders --loop &
 
-echo "Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:$PORT --timeout 120
+# ASGI (uvicorn workers) so the SSE endpoints — order streams, assistant chat —
+# run on their own threads instead of each holding a sync worker for minutes.
+echo "Starting Gunicorn (ASGI)..."
+exec gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker \
+  --workers ${WEB_CONCURRENCY:-2} --bind 0.0.0.0:$PORT --timeout 120
@@ -1,6 +1,7 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from core.content_version import conditional_content
 from accounts.permissions import IsOwner
 from .models import TenantSettings
 from .serializers import TenantSettingsSerializer, TenantSettingsCSSVarsSerializer, TenantSettingsUpdateSerializer
@@ -28,6 +29,7 @@ def tenant_settings(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_content
 def tenant_branding(request):
     """Return minimal branding/CSS-variable data for the frontend."""
     obj = _get_tenant(request)
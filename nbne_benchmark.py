@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+NBNE Platform — Local Benchmark Harness
+=======================================
+Runs the stress-test scenarios against an in-process Django server instead
+of the Railway backend, so performance regressions can be measured locally
+and compared commit to commit.
+
+- A throwaway test database is created from the configured DATABASE_URL
+  (local Postgres, or SQLite — a temp file so server threads share it) and
+  seeded with `seed_demo` for each benchmark tenant.
+- The backend is served in this process by Django's threaded WSGI server.
+  Each response carries the number of DB queries it ran (X-Bench-Queries).
+- Requests go through the stress tests' own `api()` / `login()` helpers, with
+  their BASE_URL pointed at the local server. Optional `--stress` runs whole
+  stress-test modules first as a functional smoke check.
+- Every scenario is timed at each level of a concurrency ramp (1 → 64
+  clients by default, ThreadPoolExecutor as in the race tests), reporting
+  p50/p95/p99 latency, throughput and queries per request.
+
+Usage:
+    cd backend && pip install -r requirements.txt && cd ..
+    DATABASE_URL=sqlite:////tmp/nbne.db python nbne_benchmark.py --output bench.json
+
+    # Fewer scenarios / a shorter ramp:
+    python nbne_benchmark.py --scenarios dashboard_today bookings_list --concurrency 1 8 32
+
+    # Functional smoke run of stress-test modules before benchmarking:
+    python nbne_benchmark.py --stress v1.dashboard v2.public
+
+    # Compare against an earlier run (p95 per scenario and level):
+    python nbne_benchmark.py --output after.json --compare before.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+BACKEND_DIR = ROOT / "backend"
+
+# ─────────────────────────────────────────────
+# SCENARIOS
+# ─────────────────────────────────────────────
+
+BENCH_TENANTS = ["salon-x", "restaurant-x", "health-club-x"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    tenant: str = "salon-x"
+    role: str = None          # None = anonymous (public endpoint)
+    method: str = "GET"
+
+
+# Read paths exercised by nbne_stress_test.py / nbne_stress_test_v2.py.
+# `{tomorrow}` is filled in at run time.
+SCENARIOS = [
+    Scenario("tenant_branding", "/api/tenant/branding/"),
+    Scenario("services", "/api/services/"),
+    Scenario("cms_public_pages", "/api/cms/public/pages/"),
+    Scenario("cms_public_blog", "/api/cms/public/blog/"),
+    Scenario("shop_public_products", "/api/shop/public/products/"),
+    Scenario("auth_me", "/api/auth/me/", role="owner"),
+    Scenario("staff_list", "/api/staff/", role="owner"),
+    Scenario("bookings_list", "/api/bookings/?view=list", role="owner"),
+    Scenario("dashboard_today", "/api/dashboard/today/", role="owner"),
+    Scenario("dashboard_summary", "/api/dashboard-summary/", role="owner"),
+    Scenario("reports_overview", "/api/reports/overview/", role="owner"),
+    Scenario("compliance_categories", "/api/compliance/categories/", role="owner"),
+    Scenario("staff_leave", "/api/staff-module/leave/", role="owner"),
+    Scenario("shop_orders", "/api/shop/orders/", role="owner"),
+    Scenario("restaurant_availability", "/api/restaurant-availability/?date={tomorrow}&party_size=2",
+             tenant="restaurant-x"),
+    Scenario("restaurant_available_dates", "/api/restaurant-available-dates/?party_size=2",
+             tenant="restaurant-x"),
+    Scenario("orders_public_menu", "/api/orders/menu/", tenant="restaurant-x"),
+    Scenario("orders_kitchen_queue", "/api/orders/kitchen/", tenant="restaurant-x", role="owner"),
+    Scenario("gym_timetable", "/api/gym-timetable/", tenant="health-club-x"),
+    Scenario("gym_class_types", "/api/gym-class-types/", tenant="health-club-x"),
+]
+
+
+# ─────────────────────────────────────────────
+# IN-PROCESS SERVER
+# ─────────────────────────────────────────────
+
+def setup_django():
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+
+
+class QueryCountingApp:
+    """WSGI wrapper adding an X-Bench-Queries header with the request's DB query count."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        from django.db import connections
+        count = [0]
+
+        def counter(execute, sql, params, many, context):
+            count[0] += 1
+            return execute(sql, params, many, context)
+
+        def start(status, headers, exc_info=None):
+            return start_response(status, headers + [("X-Bench-Queries", str(count[0]))], exc_info)
+
+        with connections["default"].execute_wrapper(counter):
+            return self.app(environ, start)
+
+
+def start_server():
+    """Serve the project on an ephemeral port; returns (base_url, httpd)."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    class BenchServer(ThreadedWSGIServer):
+        request_queue_size = 256  # don't refuse connections at the top of the ramp
+
+    httpd = BenchServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+    httpd.set_app(QueryCountingApp(WSGIHandler()))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    return f"http://{host}:{port}", httpd
+
+
+def create_database(workdir, keepdb, tenants):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "127.0.0.1", "localhost"]
+    conn = connections["default"]
+    if conn.vendor == "sqlite":
+        # A file, not :memory:, so every server thread sees the same data
+        conn.settings_dict["TEST"]["NAME"] = str(Path(workdir) / "nbne_bench.sqlite3")
+    old_name = conn.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    for slug in tenants:
+        print(f"  Seeding {slug}…")
+        call_command("seed_demo", tenant=slug, stdout=io.StringIO())
+    conn.close()
+    return old_name
+
+
+def destroy_database(old_name, keepdb):
+    from django.db import connections
+    from django.test.utils import teardown_test_environment
+    connections["default"].creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+    teardown_test_environment()
+
+
+# ─────────────────────────────────────────────
+# MEASUREMENT
+# ─────────────────────────────────────────────
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def call(st, scenario, path, token):
+    t0 = time.perf_counter()
+    resp, _, err = st.api(scenario.method, path, scenario.tenant, token)
+    ms = (time.perf_counter() - t0) * 1000
+    if err or resp is None:
+        return ms, None, None
+    queries = resp.headers.get("X-Bench-Queries")
+    return ms, resp.status_code, int(queries) if queries is not None else None
+
+
+def run_level(st, scenario, path, token, clients, total):
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        t0 = time.perf_counter()
+        samples = list(ex.map(lambda _: call(st, scenario, path, token), range(total)))
+        wall = time.perf_counter() - t0
+
+    ok = sorted(ms for ms, code, _ in samples if code is not None and code < 400)
+    queries = [q for _, code, q in samples if q is not None and code is not None and code < 400]
+    codes = {}
+    for _, code, _ in samples:
+        codes[str(code)] = codes.get(str(code), 0) + 1
+    return {
+        "concurrency": clients,
+        "requests": total,
+        "errors": total - len(ok),
+        "status_codes": codes,
+        "p50_ms": round(percentile(ok, 50), 2) if ok else None,
+        "p95_ms": round(percentile(ok, 95), 2) if ok else None,
+        "p99_ms": round(percentile(ok, 99), 2) if ok else None,
+        "mean_ms": round(sum(ok) / len(ok), 2) if ok else None,
+        "max_ms": round(ok[-1], 2) if ok else None,
+        "throughput_rps": round(len(ok) / wall, 1) if wall else None,
+        "queries_mean": round(sum(queries) / len(queries), 1) if queries else None,
+        "queries_max": max(queries) if queries else None,
+    }
+
+
+def run_stress_modules(names):
+    """Run stress-test modules (e.g. 'v2.public') once against the local server."""
+    import nbne_stress_test as v1
+    import nbne_stress_test_v2 as v2
+    suites = {"v1": (v1, {"isolation", "concurrent"}), "v2": (v2, v2.CROSS_TENANT_MODULES)}
+    summary = {}
+    for name in names:
+        version, _, module = name.partition(".")
+        st, cross_tenant = suites[version]
+        before = len(st.results)
+        if module in cross_tenant:
+            st.MODULE_MAP[module](None)
+        else:
+            for tenant in BENCH_TENANTS:
+                st.MODULE_MAP[module](tenant)
+        ran = st.results[before:]
+        summary[name] = {
+            "passed": sum(1 for r in ran if r.passed),
+            "failed": [f"[{r.tenant}] {r.test}" for r in ran if not r.passed],
+        }
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fmt(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_table(report):
+    print("\n" + "═" * 96)
+    print(f"{'scenario':<28}{'clients':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'queries':>9}{'errors':>8}")
+    print("═" * 96)
+    for name, result in report["scenarios"].items():
+        if result.get("skipped"):
+            print(f"{name:<28}  skipped — {result['skipped']}")
+            continue
+        for level in result["levels"]:
+            print(f"{name:<28}{level['concurrency']:>8}{fmt(level['p50_ms']):>9}{fmt(level['p95_ms']):>9}"
+                  f"{fmt(level['p99_ms']):>9}{fmt(level['throughput_rps']):>9}"
+                  f"{fmt(level['queries_mean']):>9}{level['errors']:>8}")
+    print("═" * 96)
+
+
+def print_comparison(report, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCOMPARISON vs {baseline_path} ({baseline['meta'].get('commit')} → {report['meta'].get('commit')})")
+    for name, result in report["scenarios"].items():
+        before = {lv["concurrency"]: lv for lv in baseline["scenarios"].get(name, {}).get("levels", [])}
+        for level in result.get("levels", []):
+            old = before.get(level["concurrency"])
+            if not old or not old["p95_ms"] or not level["p95_ms"]:
+                continue
+            delta = (level["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            queries = ""
+            if old.get("queries_mean") is not None and level["queries_mean"] is not None:
+                queries = f"  queries {old['queries_mean']} → {level['queries_mean']}"
+            print(f"  {name:<28} x{level['concurrency']:<3} p95 {old['p95_ms']:>8.1f} → {level['p95_ms']:>8.1f}ms"
+                  f" ({delta:+.0f}%){queries}")
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="NBNE local benchmark harness")
+    parser.add_argument("--scenarios", nargs="+", choices=[s.name for s in SCENARIOS],
+                        help="Scenarios to run (default: all)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32, 64],
+                        help="Concurrency ramp (default: 1 2 4 8 16 32 64)")
+    parser.add_argument("--requests", type=int, default=50,
+                        help="Requests per scenario per level, at least one per client (default: 50)")
+    parser.add_argument("--stress", nargs="+", default=[], metavar="SUITE.MODULE",
+                        help="Stress-test modules to run first, e.g. v1.dashboard v2.public")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="Earlier JSON report to compare p95 latencies against")
+    parser.add_argument("--keepdb", action="store_true", help="Reuse/keep the benchmark database")
+    args = parser.parse_args()
+
+    setup_django()
+    import nbne_stress_test as v1
+    import nbne_stress_test_v2 as st
+
+    scenarios = [s for s in SCENARIOS if not args.scenarios or s.name in args.scenarios]
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    print("NBNE Local Benchmark")
+    with tempfile.TemporaryDirectory() as workdir:
+        old_name = create_database(workdir, args.keepdb, BENCH_TENANTS)
+        base_url, httpd = start_server()
+        v1.BASE_URL = st.BASE_URL = base_url
+        print(f"Backend: {base_url} (in-process)")
+
+        try:
+            from django.db import connection
+            report = {
+                "meta": {
+                    "commit": git_commit(),
+                    "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "database": connection.vendor,
+                    "python": platform.python_version(),
+                    "concurrency": args.concurrency,
+                    "requests_per_level": args.requests,
+                },
+                "stress": run_stress_modules(args.stress) if args.stress else {},
+                "scenarios": {},
+            }
+
+            tokens = {}
+            for scenario in scenarios:
+                path = scenario.path.format(tomorrow=tomorrow)
+                token = None
+                if scenario.role:
+                    key = (scenario.tenant, scenario.role)
+                    if key not in tokens:
+                        tokens[key] = st.login(scenario.tenant, scenario.role)
+                    token = tokens[key]
+
+                # Warm-up request doubles as a check that the scenario works here
+                _, code, _ = call(st, scenario, path, token)
+                if code is None or code >= 400:
+                    report["scenarios"][scenario.name] = {"path": path, "tenant": scenario.tenant,
+                                                          "skipped": f"warm-up returned {code}"}
+                    continue
+
+                print(f"  {scenario.name}…")
+                report["scenarios"][scenario.name] = {
+                    "method": scenario.method,
+                    "path": path,
+                    "tenant": scenario.tenant,
+                    "levels": [run_level(st, scenario, path, token, clients, max(args.requests, clients))
+                               for clients in args.concurrency],
+                }
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            destroy_database(old_name, args.keepdb)
+
+    print_table(report)
+    if args.compare:
+        print_comparison(report, args.compare)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -44,7 +44,7 @@ import requests
 # CONFIG
 # ─────────────────────────────────────────────
 
-BASE_URL = "https://nbneplatform-production.up.railway.app"
+BASE_URL = os.environ.get("NBNE_BASE_URL", "https://nbneplatform-production.up.railway.app")
 
 TENANTS = {
     "salon-x":       "salon",